@@ -1,7 +1,33 @@
-from datetime import datetime
+from datetime import date
 from collections import defaultdict
 
 
+# Streaks count consecutive periods of a habit: calendar days for 'daily' habits and ISO
+# weeks (Monday to Sunday) for 'weekly' ones, with any number of completions in a period
+# counting once. Missed logs (periods that passed their deadline) never count. Periods are
+# plain integers, so the streak scan compares ints, never datetimes.
+
+
+def _day_reader():
+    # Day ordinal of a completion: LogRecords are already parsed, and ISO strings are
+    # parsed once per distinct date prefix rather than once per log
+    days = {}
+
+    def day_of(completed_at):
+        if not isinstance(completed_at, str):
+            return completed_at.toordinal()
+        day = days.get(completed_at[:10])
+        if day is None:
+            day = days[completed_at[:10]] = date.fromisoformat(completed_at[:10]).toordinal()
+        return day
+    return day_of
+
+
+def _to_period(day, frequency):
+    # Ordinal 1 (0001-01-01) is a Monday, so whole weeks from there are ISO weeks
+    return (day - 1) // 7 if frequency == 'weekly' else day
+
+
 def get_most_missed_habits(habit_logs):
     """
     Analyze habit logs and return a sorted list of habits by how often they were missed.
@@ -16,43 +42,130 @@ def get_most_missed_habits(habit_logs):
     for log in habit_logs:
         if log.get('missed'):
             missed_counts[log['habit_id']] += 1
+    return _rank_missed(missed_counts)
+
+
+def _rank_missed(missed_counts):
     # Returning sorted list of (habit_id, count) by most missed
     return sorted(missed_counts.items(), key=lambda x: x[1], reverse=True)
 
 def get_longest_streak(habit_logs):
     """
-    Calculate the longest streak (consecutive days) for each habit and return the habit with the highest streak.
+    Calculate the longest streak (consecutive periods) for each habit and return the habit with the highest streak.
+    A habit's period follows the 'frequency' of its logs: calendar days for 'daily' (the default
+    when logs carry no frequency) and ISO weeks for 'weekly'. Several completions in one period count once,
+    missed logs not at all.
     Parameters:
-        habit_logs (list[dict]): A list of habit check-off logs. Each log must contain 'habit_id' and 'completed_at'.
+        habit_logs (list[dict]): A list of habit check-off logs. Each log must contain 'habit_id' and 'completed_at'
+                                 (an ISO string, or a datetime as in LogRecord).
     Returns:
-        tuple[int, int] or None: A tuple (habit_id, longest_streak_days) for the habit with the longest streak,
+        tuple[int, int] or None: A tuple (habit_id, longest_streak_periods) for the habit with the longest streak,
                                  or None if no streak data is available.
     """
-    streaks = defaultdict(int)
-    logs_by_habit = defaultdict(list)
-    # Grouping logs by habit and convert timestamps
-    for log in habit_logs:
-        habit_id = log['habit_id']
-        completed_at = datetime.fromisoformat(log['completed_at'])
-        logs_by_habit[habit_id].append(completed_at)
-    # Calculating max streak per habit
-    for habit_id, timestamps in logs_by_habit.items():
-        timestamps.sort()
-        streak = max_streak = 1
-        for i in range(1, len(timestamps)):
-            # Checking if current completion is exactly 1 day after previous
-            if (timestamps[i] - timestamps[i - 1]).days == 1:
-                streak += 1
-                max_streak = max(max_streak, streak)
-            else:
-                streak = 1
-        streaks[habit_id] = max_streak
-    # Returning the habit with the highest streak
+    return _longest_of(get_streaks_by_habit(habit_logs))
+
+
+def _longest_of(streaks):
+    # Returning the habit with the highest streak; ties go to the habit seen first
     if streaks:
-        return max(streaks.items(), key=lambda x: x[1])
+        habit_id, (_, longest) = max(streaks.items(), key=lambda x: x[1][1])
+        return habit_id, longest
     return None
 
 
+def period_number(completed_at, frequency='daily'):
+    """
+    Number the period a completion falls into, so that consecutive periods get consecutive numbers.
+    Parameters:
+        completed_at (datetime | date | str): The completion time; strings only need an ISO date prefix.
+        frequency (str): 'daily' for calendar days, 'weekly' for ISO weeks (Monday to Sunday).
+    Returns:
+        int: The day ordinal, or the week number counted from 0001-01-01 (a Monday).
+    """
+    return _to_period(_day_reader()(completed_at), frequency)
+
+
+def period_streaks(periods):
+    """
+    Compute the current and the longest streak from period numbers in a single pass.
+    Parameters:
+        periods (Iterable[int]): Period numbers in ascending order, as from period_number.
+                                 Repeats of a period (several completions in it) are ignored.
+    Returns:
+        tuple[int, int]: (current_streak, longest_streak); current_streak is the run that ends
+                         at the last period. (0, 0) without periods.
+    """
+    current = longest = 0
+    last = None
+    for period in periods:
+        if period == last:
+            continue
+        current = current + 1 if last is not None and period == last + 1 else 1
+        longest = max(longest, current)
+        last = period
+    return current, longest
+
+
+def get_streaks_by_habit(habit_logs, frequency='daily'):
+    """
+    Compute the current and the longest streak of every habit in one pass over its logs.
+    Each log's completion is bucketed into its habit's period once; logs already ordered by
+    completion time per habit (as the storage readers return them) need no sorting at all.
+    Logs of habits filtered with get_habits_by_period can be passed in directly.
+    Parameters:
+        habit_logs (Iterable[dict]): Logs with 'habit_id', 'completed_at' and optionally 'frequency'
+                                     and 'missed'. Missed logs are skipped.
+        frequency (str): Period of logs that carry no 'frequency' of their own ('daily' or 'weekly').
+    Returns:
+        dict[int, tuple[int, int]]: habit_id -> (current_streak, longest_streak), in order of
+                                    first completion, counted in the habit's periods.
+    """
+    periods_by_habit = defaultdict(list)
+    unordered = set()
+    day_of = _day_reader()
+    habit_id = periods = None
+    for log in habit_logs:
+        if log.get('missed'):
+            # A missed period is a gap, not a completion
+            continue
+        if log['habit_id'] != habit_id:
+            # Logs arrive grouped by habit, so the lookup is once per habit, not per log
+            habit_id = log['habit_id']
+            periods = periods_by_habit[habit_id]
+        period = day_of(log['completed_at'])
+        if (log.get('frequency') or frequency) == 'weekly':
+            period = (period - 1) // 7
+        if periods and period < periods[-1]:
+            unordered.add(habit_id)
+        periods.append(period)
+    # Out of order input only costs a sort of plain integers
+    return {habit_id: period_streaks(sorted(periods) if habit_id in unordered else periods)
+            for habit_id, periods in periods_by_habit.items()}
+
+
+def summarize_logs(habit_logs):
+    """
+    Compute the longest streak and the most missed habits in a single pass over the logs.
+    Unlike calling get_longest_streak and get_most_missed_habits separately, the input is
+    only iterated once, so it can be a stream straight from the database.
+    Parameters:
+        habit_logs (Iterable[dict]): Check-off logs with 'habit_id', 'completed_at' and 'missed'.
+    Returns:
+        tuple: (longest_streak, most_missed) with the same values get_longest_streak and
+               get_most_missed_habits return for the same logs.
+    """
+    missed_counts = defaultdict(int)
+
+    def count_missed(logs):
+        for log in logs:
+            if log.get('missed'):
+                missed_counts[log['habit_id']] += 1
+            yield log
+
+    streaks = get_streaks_by_habit(count_missed(habit_logs))
+    return _longest_of(streaks), _rank_missed(missed_counts)
+
+
 def get_habits_by_period(habits, period='daily'):
     """
     Filter a list of habits by their frequency period.
@@ -66,29 +179,18 @@ def get_habits_by_period(habits, period='daily'):
     return [habit for habit in habits if habit.get('frequency') == period]
 
 
-def calculate_streaks(logs):
+def calculate_streaks(logs, frequency='daily'):
     """
-    Calculate the current streak of consecutive daily completions based on check-off logs.
+    Calculate the current streak of consecutive periods based on check-off logs of one habit.
     Parameters:
-        logs (list[dict]): A list of log entries, each containing a 'completed_at' timestamp in '%Y-%m-%d %H:%M:%S' format.
+        logs (list[dict] | list[LogRecord]): A list of log entries, each containing a 'completed_at'
+                                             timestamp as an ISO string or an already parsed datetime.
+        frequency (str): The habit's period ('daily' or 'weekly'), used unless the logs carry a 'frequency'.
     Returns:
-        int: The number of consecutive days the habit was completed, starting from the most recent date.
-    """
-    if not logs:
-        return 0
-    # Sorting logs in reverse chronological order
-    logs = sorted(logs, key=lambda x: x['completed_at'], reverse=True)
-    # Starting with the most recent log
-    streak = 1
-    for i in range(1, len(logs)):
-        # Parsing datetime strings
-        d1 = datetime.strptime(logs[i - 1]['completed_at'], "%Y-%m-%d %H:%M:%S")
-        d2 = datetime.strptime(logs[i]['completed_at'], "%Y-%m-%d %H:%M:%S")
-        # Checking for exactly 1 day difference
-        if (d1 - d2).days == 1:
-            streak += 1
-        else:
-            # Streak is broken here
-            break
-
-    return streak
\ No newline at end of file
+        int: The number of consecutive periods the habit was completed in, ending with the most recent one.
+    """
+    day_of = _day_reader()
+    periods = [_to_period(day_of(log['completed_at']), log.get('frequency') or frequency)
+               for log in logs if not log.get('missed')]
+    # Storage readers return one habit's logs newest first: sorting a reversed run is linear
+    return period_streaks(sorted(periods))[0]
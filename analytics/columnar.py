@@ -0,0 +1,209 @@
+import io
+import json
+import os
+import tempfile
+from datetime import datetime
+
+import numpy as np
+
+from analytics import numpy_backend
+from config import db_config
+from config.db_config import acquire_connection
+
+# Columnar export of Habit_Logs for offline analytics. Every column is one .npy file that
+# numpy memory-maps, so a reader shares the operating system's page cache instead of loading
+# the history into Python objects; manifest.json records how many rows the files hold.
+#
+# Exports are append-only and incremental: each run copies the logs with a log_id above the
+# manifest's last_log_id, in keyset chunks so no read transaction stays open for long (a
+# long one would hold back WAL checkpoints of the live database). Logs deleted or edited after
+# they were exported stay as they were; export into an empty directory to start over.
+#
+# The readers reuse numpy_backend, so ties are broken by log order (log_id) like the other
+# in-memory engines, rather than by habit_id like sql_engine. Reads of the whole export work on
+# the memory maps directly; a per-user read scans the user_id column and copies that user's
+# rows of the columns it needs into memory (the rows are spread over the files in log order).
+
+FORMAT = "habit-logs-columnar/1"
+MANIFEST = "manifest.json"
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "100000"))
+# Column name -> dtype. completed_at is in epoch seconds (the stored time read as UTC, like
+# the other engines do); weekly snapshots the habit's frequency for period-aware streaks.
+COLUMNS = {
+    "log_id": np.dtype("<i8"),
+    "habit_id": np.dtype("<i8"),
+    "user_id": np.dtype("<i8"),
+    "completed_at": np.dtype("<i8"),
+    "missed": np.dtype("|b1"),
+    "weekly": np.dtype("|b1"),
+}
+_DAY_SECONDS = 86_400
+
+_EXPORT_CHUNK = """
+    SELECT l.log_id, l.habit_id, l.user_id,
+           CAST(strftime('%s', l.completed_at) AS INTEGER), COALESCE(l.missed, 0) != 0,
+           COALESCE(h.frequency = 'weekly', 0)
+    FROM Habit_Logs l
+    LEFT JOIN Habit h ON h.habit_id = l.habit_id
+    WHERE l.log_id > ? AND strftime('%s', l.completed_at) IS NOT NULL
+    ORDER BY l.log_id
+    LIMIT ?
+"""
+
+
+def _header(dtype, rows):
+    # Format 1.0 headers are padded for growth, so the header of a grown column has the same length
+    buffer = io.BytesIO()
+    np.lib.format.write_array_header_1_0(
+        buffer, {"descr": np.lib.format.dtype_to_descr(dtype), "fortran_order": False, "shape": (rows,)})
+    return buffer.getvalue()
+
+
+def _read_manifest(directory):
+    path = os.path.join(directory, MANIFEST)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as handle:
+        manifest = json.load(handle)
+    if manifest.get("format") != FORMAT:
+        raise ValueError(f"❌ {path} is not a {FORMAT} manifest")
+    return manifest
+
+
+def _write_manifest(directory, manifest):
+    # Replaced atomically: readers see either the old or the new row count, never half a file
+    handle, temp_path = tempfile.mkstemp(dir=directory, prefix=".manifest-", suffix=".json")
+    with os.fdopen(handle, "w", encoding="utf-8") as temp:
+        json.dump(manifest, temp, indent=2)
+    os.chmod(temp_path, 0o644)
+    os.replace(temp_path, os.path.join(directory, MANIFEST))
+
+
+def _open_for_append(path, dtype, rows):
+    # Drop anything past the rows the manifest covers (left by an interrupted export)
+    if rows and not os.path.exists(path):
+        raise FileNotFoundError(f"❌ {path} is missing; export into an empty directory to start over")
+    header = _header(dtype, rows)
+    column = open(path, "r+b" if os.path.exists(path) else "w+b")
+    column.write(header)
+    column.truncate(len(header) + rows * dtype.itemsize)
+    column.seek(0, os.SEEK_END)
+    return column, len(header)
+
+
+def _grow(column, header_length, dtype, rows):
+    header = _header(dtype, rows)
+    if len(header) != header_length:
+        raise ValueError(f"❌ The header of {column.name} cannot grow in place")
+    column.flush()
+    column.seek(0)
+    column.write(header)
+    column.seek(0, os.SEEK_END)
+
+
+def export_columnar(directory, chunk_size=EXPORT_CHUNK_SIZE, on_chunk=None):
+    """
+    Append the logs added since the last export to the column files in a directory.
+    Parameters:
+        directory (str): Target directory; created if missing.
+        chunk_size (int): Logs read per (short) read transaction and appended per write.
+        on_chunk (Optional[Callable[[int], None]]): Called with the running count of new logs after each chunk.
+    Returns:
+        dict: {"exported": new logs, "rows": logs in the files, "last_log_id": highest exported log_id}.
+    """
+    os.makedirs(directory, exist_ok=True)
+    manifest = _read_manifest(directory) or {"format": FORMAT, "rows": 0, "last_log_id": 0}
+    manifest["columns"] = {name: np.lib.format.dtype_to_descr(dtype) for name, dtype in COLUMNS.items()}
+    manifest["source"] = os.path.abspath(db_config.DB_PATH)
+    rows, last_log_id = manifest["rows"], manifest["last_log_id"]
+    files = {name: _open_for_append(os.path.join(directory, f"{name}.npy"), dtype, rows)
+             for name, dtype in COLUMNS.items()}
+    exported = 0
+    try:
+        conn = acquire_connection()
+        while True:
+            chunk = conn.execute(_EXPORT_CHUNK, (last_log_id, chunk_size)).fetchall()
+            if not chunk:
+                break
+            for values, (name, dtype) in zip(zip(*chunk), COLUMNS.items()):
+                files[name][0].write(np.fromiter(values, dtype=dtype, count=len(chunk)).tobytes())
+            rows += len(chunk)
+            exported += len(chunk)
+            last_log_id = chunk[-1][0]
+            for name, dtype in COLUMNS.items():
+                _grow(*files[name], dtype, rows)
+            # The column files are complete before the manifest points past them
+            manifest.update(rows=rows, last_log_id=last_log_id,
+                            updated_at=datetime.now().isoformat(sep=" ", timespec="seconds"))
+            _write_manifest(directory, manifest)
+            if on_chunk:
+                on_chunk(exported)
+            if len(chunk) < chunk_size:
+                break
+        if not exported:
+            _write_manifest(directory, manifest)
+    finally:
+        for column, _ in files.values():
+            column.close()
+    return {"exported": exported, "rows": rows, "last_log_id": last_log_id}
+
+
+def open_columnar(directory):
+    """
+    Memory-map the column files of an export read-only, without copying them.
+    Parameters:
+        directory (str): A directory written by export_columnar.
+    Returns:
+        dict[str, numpy.ndarray]: Column name -> array of the rows listed in the manifest.
+    Raises:
+        FileNotFoundError: If the directory holds no export.
+    """
+    manifest = _read_manifest(directory)
+    if manifest is None:
+        raise FileNotFoundError(f"❌ No columnar export in {directory}")
+    rows = manifest["rows"]
+    columns = {}
+    for name, descr in manifest["columns"].items():
+        dtype = np.dtype(np.lib.format.descr_to_dtype(descr))
+        if not rows:
+            columns[name] = np.empty(0, dtype=dtype)
+            continue
+        # The manifest, not the header, decides the length: a running export may be past it
+        columns[name] = np.memmap(os.path.join(directory, f"{name}.npy"), dtype=dtype, mode="r",
+                                  offset=len(_header(dtype, rows)), shape=(rows,))
+    return columns
+
+
+def _select(columns, user_id, *names):
+    # Whole columns stay memory-mapped; a user's rows are gathered into new arrays (see above)
+    if user_id is None:
+        return [columns[name] for name in names]
+    # Row positions are found once and shared by every column, instead of one mask pass per column
+    rows = np.flatnonzero(columns["user_id"] == user_id)
+    return [columns[name].take(rows) for name in names]
+
+
+def get_longest_streak(columns, user_id=None):
+    """
+    get_longest_streak over memory-mapped columns.
+    Parameters:
+        columns (dict[str, numpy.ndarray]): Columns from open_columnar.
+        user_id (Optional[int]): Only analyze this user's logs (copied into memory); all logs if omitted.
+    Returns:
+        tuple[int, int] or None: (habit_id, longest_streak_periods), or None without logs.
+    """
+    habit_ids, completed_at, weekly, missed = _select(columns, user_id, "habit_id", "completed_at", "weekly", "missed")
+    return numpy_backend.longest_streak_from_days(habit_ids, completed_at // _DAY_SECONDS, weekly, missed)
+
+
+def get_most_missed_habits(columns, user_id=None):
+    """
+    get_most_missed_habits over memory-mapped columns.
+    Parameters:
+        columns (dict[str, numpy.ndarray]): Columns from open_columnar.
+        user_id (Optional[int]): Only analyze this user's logs (copied into memory); all logs if omitted.
+    Returns:
+        list[tuple[int, int]]: (habit_id, missed_count) tuples, most missed first.
+    """
+    habit_ids, missed = _select(columns, user_id, "habit_id", "missed")
+    return numpy_backend.most_missed_from_columns(habit_ids, missed)
@@ -0,0 +1,190 @@
+import numpy as np
+from datetime import datetime, timedelta
+
+# Vectorized drop-in replacements for the analytics_module functions. Timestamps are
+# parsed once into an int64 array and every per-pair comparison becomes an array
+# operation, with groupings done by sorting on habit_id and reducing over segments.
+#
+# Streaks follow the Python rule exactly: missed logs are dropped, times are floored to
+# epoch days, bucketed into each habit's period (the day, or the ISO week for weekly
+# habits), deduplicated, and a streak is a run of consecutive period numbers.
+
+_DAY_US = 86_400_000_000
+# 1970-01-01 was a Thursday: shifting by 3 days makes whole weeks start on Mondays
+_WEEK_SHIFT_DAYS = 3
+_EPOCH = datetime(1970, 1, 1)
+_ONE_US = timedelta(microseconds=1)
+
+
+def _to_microseconds(stamps):
+    if stamps and isinstance(stamps[0], datetime):
+        # Pre-parsed datetimes (LogRecord): integer timedelta division is ~5x faster
+        # than letting numpy convert datetime objects itself
+        return np.fromiter(((stamp - _EPOCH) // _ONE_US for stamp in stamps), dtype=np.int64, count=len(stamps))
+    # numpy parses ISO strings (space or 'T' separator) in C
+    return np.asarray(stamps, dtype='datetime64[us]').astype(np.int64)
+
+
+def _to_columns(habit_logs, frequency='daily'):
+    # One pass over the logs into parallel habit_id / timestamp / missed / weekly arrays
+    habit_ids, stamps, missed, weekly = [], [], [], []
+    add_habit, add_stamp, add_missed, add_weekly = habit_ids.append, stamps.append, missed.append, weekly.append
+    for log in habit_logs:
+        add_habit(log['habit_id'])
+        add_stamp(log['completed_at'])
+        add_missed(bool(log.get('missed')))
+        add_weekly((log.get('frequency') or frequency) == 'weekly')
+    return (np.asarray(habit_ids, dtype=np.int64), _to_microseconds(stamps),
+            np.asarray(missed, dtype=bool), np.asarray(weekly, dtype=bool))
+
+
+def _to_periods(times, weekly):
+    # Epoch day of every time, or its Monday-based week for logs of weekly habits
+    return _day_periods(times // _DAY_US, weekly)
+
+
+def _day_periods(days, weekly):
+    return np.where(weekly, (days + _WEEK_SHIFT_DAYS) // 7, days)
+
+
+def _runs(sorted_habits, sorted_periods):
+    # Split periods sorted by (habit, period) into runs of consecutive, distinct periods.
+    # Returns the habit and the length of every run, grouped by habit.
+    distinct = np.concatenate(([True], (sorted_habits[1:] != sorted_habits[:-1])
+                               | (sorted_periods[1:] != sorted_periods[:-1])))
+    habits, periods = sorted_habits[distinct], sorted_periods[distinct]
+    breaks = ~((np.diff(periods) == 1) & (habits[1:] == habits[:-1]))
+    run_starts = np.concatenate(([0], np.flatnonzero(breaks) + 1))
+    run_lengths = np.diff(np.append(run_starts, periods.size))
+    return habits[run_starts], run_lengths
+
+
+def _rank_missed(missed_ids):
+    # missed_ids holds the habit_id of every missed log, in input order
+    if missed_ids.size == 0:
+        return []
+    habits, first_seen, counts = np.unique(missed_ids, return_index=True, return_counts=True)
+    # Most missed first; ties keep the order in which habits were first missed, like sorted()
+    order = np.lexsort((first_seen, -counts))
+    return [(int(habits[i]), int(counts[i])) for i in order]
+
+
+def _longest(habit_ids, periods):
+    if habit_ids.size == 0:
+        return None
+    order = np.lexsort((periods, habit_ids))
+    run_habits, run_lengths = _runs(habit_ids[order], periods[order])
+    # Runs are grouped by habit, so a segment max gives each habit's longest run
+    habit_starts = np.flatnonzero(np.concatenate(([True], run_habits[1:] != run_habits[:-1])))
+    longest = np.maximum.reduceat(run_lengths, habit_starts)
+    habits = run_habits[habit_starts]
+    # Ties go to the habit seen first in the input, matching max() over an insertion-ordered dict
+    _, first_seen = np.unique(habit_ids, return_index=True)
+    candidates = np.flatnonzero(longest == longest.max())
+    winner = candidates[np.argmin(first_seen[candidates])]
+    return int(habits[winner]), int(longest[winner])
+
+
+def longest_streak_from_columns(habit_ids, completed_us, weekly=None, missed=None):
+    """
+    get_longest_streak over columns that are already arrays, skipping per-log extraction.
+    Parameters:
+        habit_ids (array-like[int]): Habit ID of every log.
+        completed_us (array-like[int]): Completion time of every log in epoch microseconds.
+        weekly (Optional[array-like[bool]]): Whether each log belongs to a weekly habit; all daily if omitted.
+        missed (Optional[array-like[bool]]): Missed flag of every log; missed logs are left out.
+    Returns:
+        tuple[int, int] or None: (habit_id, longest_streak_periods), or None without logs.
+    """
+    return longest_streak_from_days(habit_ids, np.asarray(completed_us, dtype=np.int64) // _DAY_US, weekly, missed)
+
+
+def longest_streak_from_days(habit_ids, days, weekly=None, missed=None):
+    """
+    get_longest_streak over columns with completion days already computed.
+    Parameters:
+        habit_ids (array-like[int]): Habit ID of every log.
+        days (array-like[int]): Completion day of every log as days since 1970-01-01.
+        weekly (Optional[array-like[bool]]): Whether each log belongs to a weekly habit; all daily if omitted.
+        missed (Optional[array-like[bool]]): Missed flag of every log; missed logs are left out.
+    Returns:
+        tuple[int, int] or None: (habit_id, longest_streak_periods), or None without logs.
+    """
+    habit_ids = np.asarray(habit_ids, dtype=np.int64)
+    days = np.asarray(days, dtype=np.int64)
+    weekly = np.zeros(days.size, dtype=bool) if weekly is None else np.asarray(weekly, dtype=bool)
+    if missed is not None:
+        done = ~np.asarray(missed, dtype=bool)
+        habit_ids, days, weekly = habit_ids[done], days[done], weekly[done]
+    return _longest(habit_ids, _day_periods(days, weekly))
+
+
+def most_missed_from_columns(habit_ids, missed):
+    """
+    get_most_missed_habits over columns that are already arrays.
+    Parameters:
+        habit_ids (array-like[int]): Habit ID of every log.
+        missed (array-like[bool]): Missed flag of every log.
+    Returns:
+        list[tuple[int, int]]: (habit_id, missed_count) tuples, most missed first.
+    """
+    return _rank_missed(np.asarray(habit_ids, dtype=np.int64)[np.asarray(missed, dtype=bool)])
+
+
+def get_most_missed_habits(habit_logs):
+    """
+    Vectorized get_most_missed_habits: rank habits by how often they were missed.
+    Parameters:
+        habit_logs (Iterable[dict]): Logs with 'habit_id' and a 'missed' flag.
+    Returns:
+        list[tuple[int, int]]: (habit_id, missed_count) tuples, most missed first.
+    """
+    # Only missed logs matter here, so skip building the other columns entirely
+    missed_ids = np.fromiter((log['habit_id'] for log in habit_logs if log.get('missed')), dtype=np.int64)
+    return _rank_missed(missed_ids)
+
+
+def get_longest_streak(habit_logs):
+    """
+    Vectorized get_longest_streak: the habit with the longest run of consecutive periods.
+    Parameters:
+        habit_logs (Iterable[dict]): Logs with 'habit_id', 'completed_at' and optionally 'frequency'.
+    Returns:
+        tuple[int, int] or None: (habit_id, longest_streak_periods), or None without logs.
+    """
+    habit_ids, times, missed, weekly = _to_columns(habit_logs)
+    done = ~missed
+    return _longest(habit_ids[done], _to_periods(times[done], weekly[done]))
+
+
+def summarize_logs(habit_logs):
+    """
+    Vectorized summarize_logs: longest streak and most missed habits from one pass.
+    Parameters:
+        habit_logs (Iterable[dict]): Logs with 'habit_id', 'completed_at' and 'missed'.
+    Returns:
+        tuple: (longest_streak, most_missed), as in analytics_module.summarize_logs.
+    """
+    habit_ids, times, missed, weekly = _to_columns(habit_logs)
+    done = ~missed
+    return _longest(habit_ids[done], _to_periods(times[done], weekly[done])), _rank_missed(habit_ids[missed])
+
+
+def calculate_streaks(logs, frequency='daily'):
+    """
+    Vectorized calculate_streaks: the current run of consecutive periods of one habit.
+    Parameters:
+        logs (Iterable[dict]): Logs of a single habit with 'completed_at'.
+        frequency (str): The habit's period ('daily' or 'weekly'), used unless the logs carry a 'frequency'.
+    Returns:
+        int: The number of consecutive periods ending with the most recent completion.
+    """
+    _, times, missed, weekly = _to_columns(logs, frequency)
+    done = ~missed
+    if not done.any():
+        return 0
+    periods = np.unique(_to_periods(times[done], weekly[done]))
+    breaks = np.flatnonzero(np.diff(periods) != 1)
+    # The current run starts right after the last break (or at the first period)
+    start = breaks[-1] + 1 if breaks.size else 0
+    return int(periods.size - start)
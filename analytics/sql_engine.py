@@ -0,0 +1,90 @@
+from config.db_config import acquire_connection
+
+# SQL-pushdown versions of the analytics in analytics_module. The database does the
+# grouping and the streak detection, so only a handful of result rows reach Python
+# instead of a user's whole log history.
+#
+# Streaks follow the Python rule exactly: completed (not missed) logs are bucketed into
+# their habit's period (calendar day, or ISO week for weekly habits) and a streak is a run
+# of consecutive periods. Days are Julian day numbers; JDN 0 was a Monday, so dividing by 7
+# numbers ISO weeks.
+
+# Gaps-and-islands over each habit's distinct periods: consecutive periods share the same
+# (period - ROW_NUMBER()) value. One window over the deduplicated periods is much cheaper
+# than comparing every completion with the previous one.
+_ISLANDS = """
+    periods AS (
+        SELECT DISTINCT habit_id, CASE WHEN weekly THEN day / 7 ELSE day END AS period
+        FROM (
+            SELECT l.habit_id, h.frequency = 'weekly' AS weekly,
+                   CAST(julianday(substr(l.completed_at, 1, 10)) + 0.5 AS INTEGER) AS day
+            FROM Habit_Logs l
+            JOIN Habit h ON h.habit_id = l.habit_id
+            WHERE {where} AND NOT l.missed AND l.completed_at IS NOT NULL
+        )
+    ),
+    islands AS (
+        SELECT habit_id, period,
+               period - ROW_NUMBER() OVER (PARTITION BY habit_id ORDER BY period) AS island
+        FROM periods
+    )
+"""
+
+
+def get_most_missed_habits(user_id):
+    """
+    Rank a user's habits by how often they were missed, counted inside SQLite.
+    Parameters:
+        user_id (int): The ID of the user whose habits are analyzed.
+    Returns:
+        list[tuple[int, int]]: (habit_id, missed_count) tuples, most missed first.
+    """
+    rows = acquire_connection().execute("""
+        SELECT l.habit_id, COUNT(*) AS missed_count
+        FROM Habit_Logs l
+        JOIN Habit h ON h.habit_id = l.habit_id
+        WHERE h.user_id = ? AND l.missed
+        GROUP BY l.habit_id
+        ORDER BY missed_count DESC, l.habit_id
+    """, (user_id,)).fetchall()
+    return [(habit_id, count) for habit_id, count in rows]
+
+
+def get_longest_streak(user_id):
+    """
+    Find the user's habit with the longest streak of consecutive periods, computed inside SQLite.
+    Parameters:
+        user_id (int): The ID of the user whose habits are analyzed.
+    Returns:
+        tuple[int, int] or None: (habit_id, longest_streak_periods), or None if there are no logs.
+    """
+    islands = _ISLANDS.format(where="h.user_id = ?")
+    row = acquire_connection().execute(f"""
+        WITH {islands},
+        runs AS (
+            SELECT habit_id, COUNT(*) AS run FROM islands GROUP BY habit_id, island
+        )
+        SELECT habit_id, MAX(run) AS longest
+        FROM runs
+        GROUP BY habit_id
+        ORDER BY longest DESC, habit_id
+        LIMIT 1
+    """, (user_id,)).fetchone()
+    return (row[0], row[1]) if row else None
+
+
+def calculate_streaks(habit_id):
+    """
+    Calculate a habit's current streak, i.e. the run that ends at its latest completion.
+    Parameters:
+        habit_id (int): The ID of the habit.
+    Returns:
+        int: The number of consecutive periods in the current streak, or 0 without logs.
+    """
+    islands = _ISLANDS.format(where="l.habit_id = ?")
+    row = acquire_connection().execute(f"""
+        WITH {islands}
+        SELECT COUNT(*) FROM islands
+        WHERE island = (SELECT MAX(island) FROM islands)
+    """, (habit_id,)).fetchone()
+    return row[0]
@@ -0,0 +1,196 @@
+import json
+from datetime import date, datetime
+from functools import partial
+
+import falcon
+import falcon.media
+
+from services import habit_service
+
+# HTTP API over habit_service, served by gunicorn (see gunicorn.conf.py):
+#     gunicorn api.app:app
+# Every worker process, and every thread within it, uses its own pooled SQLite connection.
+# GET responses that depend only on one user's data carry an ETag built from that user's
+# data version (migration 0006), so clients polling with If-None-Match get a 304 after a
+# single indexed lookup instead of a recomputation.
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _not_modified(req, resp, etag):
+    """
+    Set the ETag of a response and tell whether the client already has this version.
+    Parameters:
+        req (falcon.Request): The request, possibly carrying If-None-Match.
+        resp (falcon.Response): The response being built.
+        etag (str): The opaque tag of the current representation.
+    Returns:
+        bool: True if the response was turned into a 304 and nothing else needs computing.
+    """
+    resp.etag = etag
+    if req.if_none_match and any(tag == "*" or tag == etag for tag in req.if_none_match):
+        resp.status = falcon.HTTP_304
+        return True
+    return False
+
+
+def _parse_cursor(value):
+    # Same 'completed_at|log_id' cursor as the CLI's logs command
+    completed_at, sep, log_id = value.rpartition("|")
+    if not sep or not completed_at or not log_id.isdigit():
+        raise falcon.HTTPBadRequest(title="Invalid cursor",
+                                    description="Expected the 'completed_at|log_id' cursor of the previous page.")
+    return completed_at, int(log_id)
+
+
+def _handle_value_error(req, resp, ex, params):
+    # Service-level validation (unknown engine, bad dates, ...) is the client's fault
+    raise falcon.HTTPBadRequest(title="Invalid request", description=str(ex))
+
+
+class HabitsResource:
+    """
+    /users/{user_id}/habits: list a user's habits, or create one.
+    """
+
+    def on_get(self, req, resp, user_id):
+        if _not_modified(req, resp, f"habits-{user_id}-{habit_service.get_data_version(user_id)}"):
+            return
+        resp.media = habit_service.get_user_habits(user_id)
+
+    def on_post(self, req, resp, user_id):
+        body = req.get_media()
+        if not isinstance(body, dict) or not body.get("name") or body.get("frequency") not in ("daily", "weekly"):
+            raise falcon.HTTPBadRequest(title="Invalid habit",
+                                        description="Expected a JSON object with 'name' and a 'frequency' "
+                                                    "of 'daily' or 'weekly'.")
+        deadline = body.get("deadline_time")
+        try:
+            deadline_time = datetime.fromisoformat(deadline) if deadline else None
+        except ValueError:
+            raise falcon.HTTPBadRequest(title="Invalid habit", description="deadline_time must be an ISO timestamp.")
+        habit = habit_service.create_habit(user_id, body["name"], body["frequency"],
+                                           body.get("description", ""), deadline_time)
+        resp.status = falcon.HTTP_201
+        resp.location = f"/habits/{habit.habit_id}"
+        resp.media = {"habit_id": habit.habit_id, "user_id": user_id, "name": habit.name,
+                      "frequency": habit.frequency, "description": habit.description,
+                      "deadline_time": habit.deadline_time}
+
+
+class HabitResource:
+    """
+    /habits/{habit_id}: delete a habit.
+    """
+
+    def on_delete(self, req, resp, habit_id):
+        if not habit_service.remove_habit(habit_id):
+            raise falcon.HTTPNotFound(title="Habit not found")
+        resp.status = falcon.HTTP_204
+
+
+class CheckoffsResource:
+    """
+    /habits/{habit_id}/checkoffs: page through a habit's check-offs (newest first), or add one.
+    Query parameters: limit, after (cursor of the previous page), since, until.
+    """
+
+    def on_get(self, req, resp, habit_id):
+        limit = req.get_param_as_int("limit", min_value=1, max_value=MAX_PAGE_SIZE, default=DEFAULT_PAGE_SIZE)
+        after = req.get_param("after")
+        logs, cursor = habit_service.get_checkoffs_page(
+            habit_id, limit=limit, after=_parse_cursor(after) if after else None,
+            since=req.get_param("since"), until=req.get_param("until"),
+        )
+        resp.media = {"checkoffs": logs, "next": f"{cursor[0]}|{cursor[1]}" if cursor else None}
+
+    def on_post(self, req, resp, habit_id):
+        body = req.get_media()
+        if not isinstance(body, dict) or not isinstance(body.get("user_id"), int):
+            raise falcon.HTTPBadRequest(title="Invalid check-off", description="Expected a JSON object with 'user_id'.")
+        try:
+            future = habit_service.checkoff_habit(habit_id, body["user_id"])
+        except ValueError as e:
+            # The service rejects unknown habits and other users' habits; only the status differs
+            if habit_service.get_habit_version(habit_id) is None:
+                raise falcon.HTTPNotFound(title="Habit not found", description=str(e))
+            raise falcon.HTTPForbidden(title="Not your habit", description=str(e))
+        # Under group commit, only answer once the check-off is durable
+        if future is not None:
+            future.result()
+        resp.status = falcon.HTTP_201
+        resp.media = {"habit_id": habit_id, "user_id": body["user_id"]}
+
+
+class StreakResource:
+    """
+    /habits/{habit_id}/streak: the habit's current and longest streak.
+    """
+
+    def on_get(self, req, resp, habit_id):
+        owner = habit_service.get_habit_version(habit_id)
+        if owner is None:
+            raise falcon.HTTPNotFound(title="Habit not found")
+        if _not_modified(req, resp, f"streak-{habit_id}-{owner[1]}"):
+            return
+        resp.media = habit_service.get_streak_summary(habit_id)
+
+
+class AnalyticsResource:
+    """
+    /users/{user_id}/analytics: longest streak and most missed habits of a user.
+    Query parameters: engine ('python', 'numpy' or 'sql').
+    """
+
+    def on_get(self, req, resp, user_id):
+        engine = req.get_param("engine", default="python")
+        if engine not in habit_service.ANALYTICS_ENGINES:
+            raise falcon.HTTPBadRequest(title="Invalid engine",
+                                        description=f"Choose from: {', '.join(habit_service.ANALYTICS_ENGINES)}")
+        # Checked before computing: a current client costs one lookup
+        if _not_modified(req, resp, f"analytics-{user_id}-{habit_service.get_data_version(user_id)}-{engine}"):
+            return
+        longest, most_missed = habit_service.get_user_analytics(user_id, engine=engine)
+        longest_streak = None
+        if longest:
+            # Streaks count periods: days for daily habits, ISO weeks for weekly ones
+            frequency = next((habit["frequency"] for habit in habit_service.get_user_habits(user_id)
+                              if habit["habit_id"] == longest[0]), None)
+            longest_streak = {"habit_id": longest[0], "periods": longest[1],
+                              "unit": habit_service.STREAK_UNITS.get(frequency, "periods")}
+        resp.media = {
+            "user_id": user_id,
+            "longest_streak": longest_streak,
+            "most_missed": [{"habit_id": habit_id, "missed": count} for habit_id, count in most_missed],
+        }
+
+
+def create_app():
+    """
+    Build the WSGI application.
+    Returns:
+        falcon.App: The app with every route registered.
+    """
+    app = falcon.App()
+    handler = falcon.media.JSONHandler(dumps=partial(json.dumps, default=_json_default))
+    app.resp_options.media_handlers[falcon.MEDIA_JSON] = handler
+    app.req_options.media_handlers[falcon.MEDIA_JSON] = handler
+    app.add_error_handler(ValueError, _handle_value_error)
+    app.add_route("/users/{user_id:int}/habits", HabitsResource())
+    app.add_route("/users/{user_id:int}/analytics", AnalyticsResource())
+    app.add_route("/habits/{habit_id:int}", HabitResource())
+    app.add_route("/habits/{habit_id:int}/checkoffs", CheckoffsResource())
+    app.add_route("/habits/{habit_id:int}/streak", StreakResource())
+    return app
+
+
+app = create_app()
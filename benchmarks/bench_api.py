@@ -0,0 +1,133 @@
+"""
+Load-test the HTTP API under gunicorn with different numbers of worker processes.
+
+Usage:
+    python -m benchmarks.bench_api [--users 200] [--workers 1,2,4] [--clients 8] [--seconds 5]
+"""
+import argparse
+import http.client
+import multiprocessing
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.datagen import generate
+from config import db_config
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# name -> whether requests repeat the ETag of an earlier response (If-None-Match)
+SCENARIOS = {
+    "analytics": False,
+    "analytics 304": True,
+    "habits": False,
+}
+
+
+def _free_port():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def _wait_for_port(port, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"❌ gunicorn did not listen on port {port} in time")
+
+
+def _get(port, path, etag=None):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    try:
+        conn.request("GET", path, headers={"If-None-Match": etag} if etag else {})
+        response = conn.getresponse()
+        response.read()
+        return response.status, response.getheader("ETag")
+    finally:
+        conn.close()
+
+
+def _client(port, scenario, users, seconds, seed):
+    # One load-generating process: request random users until time is up; returns latencies
+    rng = random.Random(seed)
+    resource = "habits" if scenario == "habits" else "analytics"
+    etags = {}
+    if SCENARIOS[scenario]:
+        # A polling client already holds every ETag
+        for user_id in range(1, users + 1):
+            etags[user_id] = _get(port, f"/users/{user_id}/{resource}")[1]
+    latencies = []
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        user_id = rng.randint(1, users)
+        etag = etags.get(user_id) if SCENARIOS[scenario] else None
+        started = time.perf_counter()
+        status, etags[user_id] = _get(port, f"/users/{user_id}/{resource}", etag)
+        latencies.append(time.perf_counter() - started)
+        if status not in (200, 304):
+            raise RuntimeError(f"❌ Unexpected status {status}")
+    return latencies
+
+
+def run(users=200, worker_counts=(1, 2, 4), clients=8, seconds=5.0):
+    """
+    Measure requests per second and latency per scenario and number of gunicorn workers.
+    Parameters:
+        users (int): Users in the generated database (5 habits x 365 days each).
+        worker_counts (Iterable[int]): gunicorn worker processes to try.
+        clients (int): Concurrent client processes generating load.
+        seconds (float): Duration of each measurement.
+    Returns:
+        list[tuple[int, str, float, float, float]]: (workers, scenario, requests_per_second, p50_ms, p99_ms).
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        generate(path, users=users, habits=5, days=365)
+        db_config.close_connections()
+        for workers in worker_counts:
+            port = _free_port()
+            env = dict(os.environ, DB_PATH=path, API_BIND=f"127.0.0.1:{port}", WEB_CONCURRENCY=str(workers))
+            server = subprocess.Popen([sys.executable, "-m", "gunicorn", "api.app:app"], cwd=PROJECT_ROOT, env=env,
+                                      stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            try:
+                _wait_for_port(port)
+                with multiprocessing.Pool(clients) as pool:
+                    for scenario in SCENARIOS:
+                        # Warm-up pass: worker connections, caches and imports
+                        pool.starmap(_client, [(port, scenario, users, 0.5, n) for n in range(clients)])
+                        runs = pool.starmap(_client, [(port, scenario, users, seconds, n) for n in range(clients)])
+                        latencies = sorted(latency for run_latencies in runs for latency in run_latencies)
+                        results.append((workers, scenario, len(latencies) / seconds,
+                                        latencies[len(latencies) // 2] * 1e3,
+                                        latencies[int(len(latencies) * 0.99)] * 1e3))
+            finally:
+                server.terminate()
+                server.wait()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--workers", default="1,2,4", help="Comma separated gunicorn worker counts.")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    worker_counts = [int(value) for value in args.workers.split(",") if value]
+    print(f"{'workers':>7}  {'scenario':<16}{'req/s':>10}{'p50':>11}{'p99':>11}")
+    for workers, scenario, rate, p50, p99 in run(args.users, worker_counts, args.clients, args.seconds):
+        print(f"{workers:>7}  {scenario:<16}{rate:>10,.0f}{p50:>8.2f} ms{p99:>8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Measure sign-up and login throughput under concurrency and the cost of validating session tokens.
+
+Usage:
+    python -m benchmarks.bench_auth [--users 32] [--threads 1,2,4,8] [--validations 20000]
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from config import db_config
+from init_db import initialize_schema
+from services import auth
+from utils import passwords
+
+
+def _concurrent(threads, items, action):
+    # Split items over threads; returns elapsed seconds
+    def worker(chunk):
+        for item in chunk:
+            action(item)
+
+    workers = [threading.Thread(target=worker, args=(items[n::threads],)) for n in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return time.perf_counter() - started
+
+
+def run(users=32, thread_counts=(1, 2, 4, 8), validations=20000):
+    """
+    Log users in from several threads, then validate their session tokens.
+    Parameters:
+        users (int): Registered users; every login round logs each of them in once.
+        thread_counts (Iterable[int]): Concurrent threads to try for logins.
+        validations (int): Token validations per validation scenario.
+    Returns:
+        list[tuple[str, float]]: (scenario, operations per second).
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        db_config.DB_PATH = os.path.join(tmp, "bench.db")
+        initialize_schema()
+        names = [f"user{n}" for n in range(users)]
+        half = users // 2
+        started = time.perf_counter()
+        for name in names[:half]:
+            auth.sign_up(name, "", f"{name}-pw")
+        results.append(("sign-up, one at a time", half / (time.perf_counter() - started)))
+        started = time.perf_counter()
+        auth.sign_up_many((name, "", f"{name}-pw") for name in names[half:])
+        results.append(("sign-up, sign_up_many", (users - half) / (time.perf_counter() - started)))
+
+        for threads in thread_counts:
+            elapsed = _concurrent(threads, names, lambda name: auth.log_in(name, f"{name}-pw"))
+            results.append((f"login, {threads} thread(s), KDF pool of {passwords.KDF_WORKERS}", users / elapsed))
+
+        tokens = [auth.log_in_with_session(name, f"{name}-pw")[1] for name in names]
+        lookups = [tokens[n % users] for n in range(validations)]
+        for label, cache_size in (("token validation, database", 0), ("token validation, cached", 4096)):
+            auth.SESSION_CACHE.maxsize = cache_size
+            auth.SESSION_CACHE.clear()
+            started = time.perf_counter()
+            for token in lookups:
+                auth.validate_session(token)
+            results.append((label, validations / (time.perf_counter() - started)))
+        db_config.close_connections()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=32)
+    parser.add_argument("--threads", default="1,2,4,8", help="Comma separated thread counts for logins.")
+    parser.add_argument("--validations", type=int, default=20000)
+    args = parser.parse_args()
+
+    thread_counts = [int(value) for value in args.threads.split(",") if value]
+    print(f"{'scenario (' + passwords.PASSWORD_KDF + ')':<60}{'ops/s':>14}")
+    for scenario, rate in run(args.users, thread_counts, args.validations):
+        print(f"{scenario:<60}{rate:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
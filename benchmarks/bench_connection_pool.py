@@ -0,0 +1,118 @@
+"""
+Compare the old connect-per-call storage path with the pooled connection manager.
+
+Usage:
+    python -m benchmarks.bench_connection_pool [--calls 2000] [--profile default]
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime
+
+from config import db_config
+
+SCHEMA_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "db", "habits.sql")
+
+
+def _old_checkoff(habit_id, user_id):
+    # Mirrors the original storage_manager code: open, run one statement, commit, close
+    conn = db_config.get_connection()
+    cursor = conn.cursor()
+    cursor.execute("""
+        INSERT INTO Habit_Logs (habit_id, user_id, completed_at, missed)
+        VALUES (?, ?, ?, 0)
+    """, (habit_id, user_id, datetime.now()))
+    conn.commit()
+    conn.close()
+
+
+def _old_last_checkoff(habit_id):
+    conn = db_config.get_connection()
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT completed_at FROM Habit_Logs
+        WHERE habit_id = ?
+        ORDER BY completed_at DESC
+        LIMIT 1
+    """, (habit_id,))
+    cursor.fetchone()
+    conn.close()
+
+
+def _pooled_checkoff(habit_id, user_id):
+    with db_config.db_session() as conn:
+        conn.execute("""
+            INSERT INTO Habit_Logs (habit_id, user_id, completed_at, missed)
+            VALUES (?, ?, ?, 0)
+        """, (habit_id, user_id, datetime.now()))
+
+
+def _pooled_last_checkoff(habit_id):
+    with db_config.db_session() as conn:
+        conn.execute("""
+            SELECT completed_at FROM Habit_Logs
+            WHERE habit_id = ?
+            ORDER BY completed_at DESC
+            LIMIT 1
+        """, (habit_id,)).fetchone()
+
+
+def _time_calls(func, calls, *args):
+    start = time.perf_counter()
+    for _ in range(calls):
+        func(*args)
+    return time.perf_counter() - start
+
+
+def run(calls=2000, profile="default"):
+    """
+    Time check-off writes and latest-check-off reads through both connection paths.
+    Parameters:
+        calls (int): Number of calls per scenario.
+        profile (str): PRAGMA profile used by the pooled path.
+    Returns:
+        list[tuple[str, float, float]]: (scenario, old_seconds, pooled_seconds) rows.
+    """
+    with open(SCHEMA_FILE, "r") as f:
+        schema = f.read()
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        # Separate files so the WAL setting of one run cannot leak into the other
+        old_path = os.path.join(tmp, "old.db")
+        pooled_path = os.path.join(tmp, "pooled.db")
+        db_config.DB_PROFILE = profile
+        for path in (old_path, pooled_path):
+            db_config.DB_PATH = path
+            conn = db_config.get_connection()
+            conn.executescript(schema)
+            conn.close()
+
+        for name, old_func, pooled_func, args in (
+            ("save_checkoff", _old_checkoff, _pooled_checkoff, (1, 1)),
+            ("last_checkoff", _old_last_checkoff, _pooled_last_checkoff, (1,)),
+        ):
+            db_config.DB_PATH = old_path
+            old_seconds = _time_calls(old_func, calls, *args)
+            db_config.DB_PATH = pooled_path
+            pooled_seconds = _time_calls(pooled_func, calls, *args)
+            results.append((name, old_seconds, pooled_seconds))
+        db_config.close_connections()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--profile", default="default", choices=sorted(db_config.PRAGMA_PROFILES))
+    args = parser.parse_args()
+
+    print(f"{'scenario':<16}{'connect/call':>16}{'pooled':>16}{'speedup':>10}")
+    for name, old_seconds, pooled_seconds in run(args.calls, args.profile):
+        old_us = old_seconds / args.calls * 1e6
+        pooled_us = pooled_seconds / args.calls * 1e6
+        print(f"{name:<16}{old_us:>13.1f} µs{pooled_us:>13.1f} µs{old_us / pooled_us:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
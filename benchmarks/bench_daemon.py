@@ -0,0 +1,111 @@
+"""
+Compare running CLI commands in-process with forwarding them to the `serve` daemon.
+
+Usage:
+    python -m benchmarks.bench_daemon [--users 200] [--runs 15] [--calls 500]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.datagen import generate
+from cli import client
+from config import db_config
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# (label, CLI arguments); every command reads, so runs do not change the data
+COMMANDS = [
+    ("list", ["list", "--user-id", "1"]),
+    ("logs", ["logs", "--habit-id", "1", "--limit", "20"]),
+    ("analyze", ["analyze", "--user-id", "1"]),
+    ("analyze numpy", ["analyze", "--user-id", "1", "--engine", "numpy"]),
+]
+# (operation, args, kwargs) timed per call inside one process
+CALLS = [
+    ("get_user_habits", (1,), {}),
+    ("get_checkoffs_page", (1,), {"limit": 20}),
+    ("get_user_analytics", (1,), {"engine": "python"}),
+]
+
+
+def _median_ms(action, runs):
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        action()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1e3
+
+
+def _cli(env, args):
+    subprocess.run([sys.executable, "-m", "cli", *args], cwd=PROJECT_ROOT, env=env, check=True,
+                   stdout=subprocess.DEVNULL)
+
+
+def _wait_for(path, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while not os.path.exists(path):
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"❌ The daemon did not create {path} in time")
+        time.sleep(0.05)
+
+
+def run(users=200, runs=15, calls=500):
+    """
+    Time whole CLI invocations and single service calls with and without the daemon.
+    Parameters:
+        users (int): Users in the generated database (5 habits x 365 days each).
+        runs (int): CLI invocations per command and mode.
+        calls (int): Service calls per operation and mode.
+    Returns:
+        list[tuple[str, float, float]]: (what, in-process ms, via daemon ms), medians.
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        generate(path, users=users, habits=5, days=365)
+        db_config.close_connections()
+        env = dict(os.environ, DB_PATH=path, HABIT_DAEMON_SOCKET="")
+        sock = f"{path}.sock"
+        local = {label: _median_ms(lambda: _cli(env, ["--no-daemon", *args]), runs) for label, args in COMMANDS}
+        in_process = {}
+        client.FORWARD = False
+        for operation, args, kwargs in CALLS:
+            in_process[operation] = _median_ms(lambda: client.call(operation, *args, **kwargs), calls)
+
+        daemon = subprocess.Popen([sys.executable, "-m", "cli", "serve"], cwd=PROJECT_ROOT, env=env,
+                                  stdout=subprocess.DEVNULL)
+        try:
+            _wait_for(sock)
+            for label, args in COMMANDS:
+                _cli(env, args)  # let the daemon warm its caches for this command
+                results.append((f"cli {label}", local[label], _median_ms(lambda: _cli(env, args), runs)))
+            client.FORWARD = True
+            for operation, args, kwargs in CALLS:
+                remote = _median_ms(lambda: client.call(operation, *args, **kwargs), calls)
+                results.append((f"call {operation}", in_process[operation], remote))
+        finally:
+            daemon.terminate()
+            daemon.wait()
+            db_config.close_connections()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--runs", type=int, default=15)
+    parser.add_argument("--calls", type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{'median latency':<34}{'in-process':>12}{'daemon':>12}")
+    for what, local_ms, daemon_ms in run(args.users, args.runs, args.calls):
+        print(f"{what:<34}{local_ms:>9.2f} ms{daemon_ms:>9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Measure memory and fetch time of the log representations returned by the storage layer.
+
+Usage:
+    python -m benchmarks.bench_log_records [--logs 1000000] [--habits 50]
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from config import db_config
+from init_db import initialize_schema
+from repository import storage_manager
+
+
+def _fill(logs, habits):
+    with db_config.db_session() as conn:
+        conn.executemany(
+            "INSERT INTO Habit (habit_id, user_id, name, frequency) VALUES (?, 1, ?, 'daily')",
+            [(habit_id, f"Habit number {habit_id}") for habit_id in range(1, habits + 1)],
+        )
+    start = datetime(2020, 1, 1, 7, 30, 0)
+    per_habit = logs // habits
+    records = (
+        (habit_id, 1, (start + timedelta(days=day)).strftime("%Y-%m-%d %H:%M:%S"), None, day % 10 == 0)
+        for habit_id in range(1, habits + 1)
+        for day in range(per_habit)
+    )
+    # Plain executemany: this measures reads, so skip the streak maintenance of the bulk API
+    with db_config.db_session() as conn:
+        conn.executemany(
+            "INSERT INTO Habit_Logs (habit_id, user_id, completed_at, note, missed) VALUES (?, ?, ?, ?, ?)",
+            records,
+        )
+
+
+def _measure(load):
+    # Time without tracemalloc (it slows allocation-heavy code a lot), then measure memory
+    started = time.perf_counter()
+    load()
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    result = load()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--logs", type=int, default=1_000_000)
+    parser.add_argument("--habits", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_config.DB_PATH = os.path.join(tmp, "records.db")
+        initialize_schema()
+        _fill(args.logs, args.habits)
+
+        scenarios = (
+            ("dicts (iter_user_logs)", lambda: list(storage_manager.iter_user_logs(1))),
+            ("LogRecord (iter_user_log_records)", lambda: list(storage_manager.iter_user_log_records(1))),
+            ("LogColumns (load_user_log_columns)", lambda: storage_manager.load_user_log_columns(1)),
+        )
+        print(f"{'representation':<38}{'rows':>10}{'memory':>12}{'per 1M logs':>14}{'fetch':>9}")
+        for name, load in scenarios:
+            result, size, elapsed = _measure(load)
+            rows = len(result)
+            per_million = size / rows * 1_000_000 if rows else 0
+            print(f"{name:<38}{rows:>10,}{size / 2**20:>9.1f} MB{per_million / 2**20:>11.1f} MB{elapsed:>8.2f}s")
+            del result
+        db_config.close_connections()
+
+
+if __name__ == "__main__":
+    main()
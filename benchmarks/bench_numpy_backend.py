@@ -0,0 +1,85 @@
+"""
+Compare the pure Python analytics with the NumPy-vectorized backend on synthetic logs.
+
+Usage:
+    python -m benchmarks.bench_numpy_backend [--logs 1000000] [--habits 2000]
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from analytics import analytics_module, numpy_backend
+
+
+def make_logs(count, habits, seed=42):
+    """
+    Generate check-off logs shaped like storage rows: mostly daily runs with random gaps.
+    Parameters:
+        count (int): Number of logs to generate.
+        habits (int): Number of distinct habit IDs.
+        seed (int): Random seed, for repeatable runs.
+    Returns:
+        list[dict]: Logs with habit_id, completed_at and missed keys.
+    """
+    rng = random.Random(seed)
+    start = datetime(2020, 1, 1, 7, 0, 0)
+    per_habit = max(1, count // habits)
+    logs = []
+    for habit_id in range(1, habits + 1):
+        day = 0
+        for _ in range(per_habit):
+            # Usually the next day, sometimes a skipped day or two
+            day += 1 if rng.random() < 0.85 else rng.randint(2, 4)
+            logs.append({
+                "habit_id": habit_id,
+                "completed_at": (start + timedelta(days=day)).strftime("%Y-%m-%d %H:%M:%S"),
+                "missed": rng.random() < 0.05,
+            })
+    rng.shuffle(logs)
+    return logs
+
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--logs", type=int, default=1_000_000)
+    parser.add_argument("--habits", type=int, default=2000)
+    args = parser.parse_args()
+
+    logs = make_logs(args.logs, args.habits)
+    print(f"{len(logs):,} logs across {args.habits:,} habits")
+    print(f"{'function (from dicts)':<32}{'python':>12}{'numpy':>12}{'speedup':>10}")
+    results = {}
+    for name in ("get_longest_streak", "get_most_missed_habits", "summarize_logs"):
+        python_seconds, expected = _timed(getattr(analytics_module, name), logs)
+        numpy_seconds, actual = _timed(getattr(numpy_backend, name), logs)
+        assert actual == expected, f"{name}: backends disagree"
+        results[name] = (python_seconds, expected)
+        print(f"{name:<32}{python_seconds:>11.2f}s{numpy_seconds:>11.2f}s{python_seconds / numpy_seconds:>9.1f}x")
+
+    # Kernel only: the columns already exist as arrays (e.g. a columnar export), so the
+    # cost of pulling fields out of a million dicts is not part of the measurement
+    habit_ids = np.array([log["habit_id"] for log in logs], dtype=np.int64)
+    completed_us = np.array([log["completed_at"] for log in logs], dtype="datetime64[us]").astype(np.int64)
+    missed = np.array([log["missed"] for log in logs], dtype=bool)
+    print(f"{'function (from columns)':<32}{'python':>12}{'numpy':>12}{'speedup':>10}")
+    for name, func, columns in (
+        ("get_longest_streak", numpy_backend.longest_streak_from_columns, (habit_ids, completed_us)),
+        ("get_most_missed_habits", numpy_backend.most_missed_from_columns, (habit_ids, missed)),
+    ):
+        python_seconds, expected = results[name]
+        numpy_seconds, actual = _timed(func, *columns)
+        assert actual == expected, f"{name}: backends disagree"
+        print(f"{name:<32}{python_seconds:>11.2f}s{numpy_seconds:>11.2f}s{python_seconds / numpy_seconds:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
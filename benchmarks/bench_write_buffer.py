@@ -0,0 +1,109 @@
+"""
+Compare one commit per check-off with group commit at several durability windows.
+
+Usage:
+    python -m benchmarks.bench_write_buffer [--threads 8] [--checkoffs 250] [--delays 1,5,20,50]
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+from config import db_config
+from init_db import initialize_schema
+from models.habits import Habit
+from repository.storage_manager import save_checkoff, save_habit
+from repository.write_buffer import CheckoffBuffer
+
+
+def _run_writers(threads, checkoffs, checkoff):
+    # Every thread checks off its own habit; returns elapsed seconds and per-call latencies
+    latencies = []
+    lock = threading.Lock()
+
+    def writer(habit_id):
+        own = []
+        for _ in range(checkoffs):
+            started = time.perf_counter()
+            checkoff(habit_id)
+            own.append(time.perf_counter() - started)
+        with lock:
+            latencies.extend(own)
+
+    workers = [threading.Thread(target=writer, args=(habit_id,)) for habit_id in range(1, threads + 1)]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - started, sorted(latencies)
+
+
+def run(threads=8, checkoffs=250, delays_ms=(1, 5, 20, 50), synchronous="FULL"):
+    """
+    Measure check-off throughput and the latency until each write is durable.
+    Parameters:
+        threads (int): Concurrent writer threads.
+        checkoffs (int): Check-offs per thread.
+        delays_ms (Iterable[int]): Group-commit max_delay values to try, in milliseconds.
+        synchronous (str): PRAGMA synchronous for both the direct and the buffered writes.
+    Returns:
+        list[tuple[str, float, float, float, int]]: (mode, checkoffs_per_second, p50_ms, p99_ms, commits).
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        db_config.DB_PATH = os.path.join(tmp, "bench.db")
+        initialize_schema()
+        for habit_id in range(1, threads + 1):
+            save_habit(Habit(None, 1, f"Habit {habit_id}", "daily", "", None))
+        total = threads * checkoffs
+
+        def direct(habit_id):
+            db_config.acquire_connection().execute(f"PRAGMA synchronous = {synchronous}")
+            save_checkoff(habit_id, 1)
+
+        elapsed, latencies = _run_writers(threads, checkoffs, direct)
+        results.append(("commit per check-off", total / elapsed, latencies[len(latencies) // 2] * 1e3,
+                        latencies[int(len(latencies) * 0.99)] * 1e3, total))
+
+        for delay_ms in delays_ms:
+            buffer = CheckoffBuffer(max_batch=threads * 4, max_delay=delay_ms / 1000, synchronous=synchronous)
+            # Waiting on the Future makes the latency "until durable", not just "until queued"
+            elapsed, latencies = _run_writers(threads, checkoffs, lambda habit_id: buffer.submit(habit_id, 1).result())
+            buffer.close()
+            results.append((f"group commit {delay_ms} ms", total / elapsed, statistics.median(latencies) * 1e3,
+                            latencies[int(len(latencies) * 0.99)] * 1e3, buffer.batches))
+
+            # Fire and forget: callers only queue, durability is awaited once at the end
+            buffer = CheckoffBuffer(max_batch=500, max_delay=delay_ms / 1000, synchronous=synchronous)
+            futures = []
+            started = time.perf_counter()
+            _, latencies = _run_writers(threads, checkoffs, lambda habit_id: futures.append(buffer.submit(habit_id, 1)))
+            for future in futures:
+                future.result()
+            elapsed = time.perf_counter() - started
+            buffer.close()
+            results.append((f"  queued, {delay_ms} ms", total / elapsed, statistics.median(latencies) * 1e3,
+                            latencies[int(len(latencies) * 0.99)] * 1e3, buffer.batches))
+        db_config.close_connections()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--checkoffs", type=int, default=250)
+    parser.add_argument("--delays", default="1,5,20,50", help="Comma separated max_delay values in ms.")
+    parser.add_argument("--synchronous", default="FULL", choices=["OFF", "NORMAL", "FULL"])
+    args = parser.parse_args()
+
+    delays = [int(value) for value in args.delays.split(",") if value]
+    print(f"{'mode':<24}{'check-offs/s':>14}{'p50':>11}{'p99':>11}{'commits':>9}")
+    for mode, rate, p50, p99, commits in run(args.threads, args.checkoffs, delays, args.synchronous):
+        print(f"{mode:<24}{rate:>14,.0f}{p50:>8.2f} ms{p99:>8.2f} ms{commits:>9}")
+
+
+if __name__ == "__main__":
+    main()
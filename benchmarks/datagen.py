@@ -0,0 +1,126 @@
+"""
+Seeded generator of synthetic users, habits and check-off histories, written straight into SQLite.
+
+Usage:
+    python -m benchmarks.datagen bench.db [--users 1000] [--habits 5] [--days 365] [--seed 42]
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from config import db_config
+from init_db import initialize_schema
+from repository.storage_manager import rebuild_streak_summaries
+
+# Rows handed to one executemany call / transaction
+INSERT_CHUNK_SIZE = 10000
+
+_HABIT_NAMES = ("Drink water", "Read", "Workout", "Meditate", "Journal", "Stretch",
+                "Walk the dog", "Learn Spanish", "Practice guitar", "Clean the kitchen")
+
+
+def _habit_history(rng, habit_id, user_id, frequency, start, days):
+    # Two-state chain: people who did the habit in the last period tend to keep going,
+    # people who dropped it tend to stay off for a while. Each habit gets its own adherence.
+    keep_going = rng.uniform(0.75, 0.97)
+    pick_up = rng.uniform(0.2, 0.6)
+    hour = rng.randint(6, 21)
+    step = 7 if frequency == "weekly" else 1
+    done = True
+    for day in range(0, days, step):
+        done = rng.random() < (keep_going if done else pick_up)
+        when = start + timedelta(days=day, hours=hour, minutes=rng.randint(0, 59), seconds=rng.randint(0, 59))
+        if done:
+            yield habit_id, user_id, when.strftime("%Y-%m-%d %H:%M:%S"), None, 0
+        elif rng.random() < 0.5:
+            # Roughly half of the skipped periods were recorded as missed by the deadline check
+            yield habit_id, user_id, when.strftime("%Y-%m-%d %H:%M:%S"), None, 1
+
+
+def _insert_chunked(sql, rows):
+    total, chunk = 0, []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == INSERT_CHUNK_SIZE:
+            with db_config.db_session() as conn:
+                conn.executemany(sql, chunk)
+            total += len(chunk)
+            chunk = []
+    if chunk:
+        with db_config.db_session() as conn:
+            conn.executemany(sql, chunk)
+        total += len(chunk)
+    return total
+
+
+def generate(path, users=100, habits=5, days=365, seed=42, end=None):
+    """
+    Create (or extend) a database with N users x M habits x K days of check-off history.
+    The same arguments always produce the same rows, so benchmark runs are comparable.
+    Parameters:
+        path (str): SQLite file to fill. It becomes the active DB_PATH.
+        users (int): Number of users (N).
+        habits (int): Habits per user (M); roughly one in five is weekly.
+        days (int): Days of history per habit (K), ending the day before `end`.
+        seed (int): Random seed.
+        end (Optional[datetime]): Day after the last generated day. Defaults to a fixed date
+                                  so that the data does not depend on when it is generated.
+    Returns:
+        dict: Row counts with 'users', 'habits' and 'logs' keys.
+    """
+    db_config.DB_PATH = path
+    initialize_schema()
+    rng = random.Random(seed)
+    end = end or datetime(2025, 1, 1)
+    start = end - timedelta(days=days)
+    with db_config.db_session() as conn:
+        first_user = conn.execute("SELECT COALESCE(MAX(user_id), 0) FROM User").fetchone()[0] + 1
+        first_habit = conn.execute("SELECT COALESCE(MAX(habit_id), 0) FROM Habit").fetchone()[0] + 1
+
+    user_ids = range(first_user, first_user + users)
+    _insert_chunked(
+        "INSERT INTO User (user_id, username, email, password) VALUES (?, ?, ?, ?)",
+        ((user_id, f"user{user_id}", f"user{user_id}@example.com", "password") for user_id in user_ids),
+    )
+    # (habit_id, user_id, frequency) of every generated habit, kept for the log pass
+    plan = []
+    habit_id = first_habit
+    for user_id in user_ids:
+        for _ in range(habits):
+            plan.append((habit_id, user_id, "weekly" if rng.random() < 0.2 else "daily"))
+            habit_id += 1
+    _insert_chunked(
+        "INSERT INTO Habit (habit_id, user_id, name, frequency, description, deadline_time) "
+        "VALUES (?, ?, ?, ?, '', NULL)",
+        ((habit_id, user_id, rng.choice(_HABIT_NAMES), frequency) for habit_id, user_id, frequency in plan),
+    )
+    logs = _insert_chunked(
+        "INSERT INTO Habit_Logs (habit_id, user_id, completed_at, note, missed) VALUES (?, ?, ?, ?, ?)",
+        (log for habit_id, user_id, frequency in plan
+         for log in _habit_history(rng, habit_id, user_id, frequency, start, days)),
+    )
+    rebuild_streak_summaries()
+    return {"users": users, "habits": len(plan), "logs": logs}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("path")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--habits", type=int, default=5)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--profile", default="fast", choices=sorted(db_config.PRAGMA_PROFILES))
+    args = parser.parse_args()
+
+    db_config.DB_PROFILE = args.profile
+    started = time.perf_counter()
+    counts = generate(args.path, args.users, args.habits, args.days, args.seed)
+    db_config.close_connections()
+    print(f"✅ {counts['users']:,} users, {counts['habits']:,} habits, {counts['logs']:,} logs "
+          f"written to {args.path} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
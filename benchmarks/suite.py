@@ -0,0 +1,250 @@
+"""
+Time every storage and analytics function and the analyze command on a generated database.
+
+Usage:
+    python -m benchmarks.suite [--users 200] [--habits 5] [--days 365] [--repeat 5] [--output results.json]
+    python -m benchmarks.suite --compare baseline.json [--threshold 0.25]
+"""
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import deque
+from datetime import datetime
+
+from click.testing import CliRunner
+
+from analytics import analytics_module, sql_engine
+from benchmarks.datagen import generate
+from cli.commands import cli
+from config import db_config
+from models.habits import Habit
+from repository import storage_manager
+
+# Changes below this many seconds are within timer noise and never count as a regression
+NOISE_FLOOR_SECONDS = 0.0005
+NOISE_FLOOR_KIB = 64
+
+
+def _consume(iterable):
+    # Drain a generator without keeping its items, so peak memory reflects the reader itself
+    deque(iterable, maxlen=0)
+
+
+def _log_target(user_id):
+    # The target user's habit with the most logs, so per-habit scenarios see a full history
+    with db_config.db_session() as conn:
+        return conn.execute("""
+            SELECT l.habit_id FROM Habit_Logs l JOIN Habit h ON h.habit_id = l.habit_id
+            WHERE h.user_id = ? GROUP BY l.habit_id ORDER BY COUNT(*) DESC LIMIT 1
+        """, (user_id,)).fetchone()[0]
+
+
+def _new_checkoff(habit_id, user_id):
+    storage_manager.save_checkoff(habit_id, user_id)
+    with db_config.db_session() as conn:
+        return (conn.execute("SELECT MAX(log_id) FROM Habit_Logs").fetchone()[0],)
+
+
+def _new_habit(user_id):
+    storage_manager.save_habit(Habit(None, user_id, "Benchmark habit", "daily", "", None))
+    with db_config.db_session() as conn:
+        return (conn.execute("SELECT MAX(habit_id) FROM Habit").fetchone()[0],)
+
+
+def _analyze(user_id, engine):
+    result = CliRunner().invoke(cli, ["analyze", "--user-id", str(user_id), "--engine", engine])
+    if result.exit_code != 0:
+        raise RuntimeError(f"❌ analyze --engine {engine} failed: {result.output}")
+
+
+def scenarios(user_id):
+    """
+    Build the benchmark scenarios for one user of the generated database.
+    Parameters:
+        user_id (int): The user whose habits and logs the scenarios read and write.
+    Returns:
+        list[tuple[str, Callable, Callable]]: (name, setup, run) triples. setup() is not timed
+                                              and returns the arguments passed to run().
+    """
+    habit_id = _log_target(user_id)
+    logs = [dict(log) for log in storage_manager.load_checkoffs_for_habit(habit_id)]
+    user_logs = [log for log in storage_manager.iter_user_logs(user_id) if log["log_id"] is not None]
+    habits = storage_manager.load_all_habits(user_id)
+    deadline = datetime(2025, 1, 1)
+    no_args = lambda: ()
+    bulk_rows = lambda: ([(habit_id, user_id, f"2024-06-01 {i // 3600 % 24:02d}:{i // 60 % 60:02d}:{i % 60:02d}", None, 0)
+                          for i in range(1000)],)
+    return [
+        # Storage reads
+        ("storage.load_all_habits", no_args, lambda: storage_manager.load_all_habits(user_id)),
+        ("storage.load_checkoffs_for_habit", no_args, lambda: storage_manager.load_checkoffs_for_habit(habit_id)),
+        ("storage.load_checkoff_records", no_args, lambda: storage_manager.load_checkoff_records(habit_id)),
+        ("storage.iter_checkoffs", no_args, lambda: _consume(storage_manager.iter_checkoffs(habit_id))),
+        ("storage.load_checkoffs_page", no_args, lambda: storage_manager.load_checkoffs_page(habit_id, limit=50)),
+        ("storage.iter_user_logs", no_args, lambda: _consume(storage_manager.iter_user_logs(user_id))),
+        ("storage.iter_user_log_records", no_args, lambda: _consume(storage_manager.iter_user_log_records(user_id))),
+        ("storage.load_user_log_columns", no_args, lambda: storage_manager.load_user_log_columns(user_id)),
+        ("storage.check_if_missed", no_args, lambda: storage_manager.check_if_missed(habit_id, deadline)),
+        ("storage.load_streak_summary", no_args, lambda: storage_manager.load_streak_summary(habit_id)),
+        # Storage writes
+        ("storage.save_habit", no_args,
+         lambda: storage_manager.save_habit(Habit(None, user_id, "Benchmark habit", "daily", "", None))),
+        ("storage.delete_habit", lambda: _new_habit(user_id), storage_manager.delete_habit),
+        ("storage.save_checkoff", no_args, lambda: storage_manager.save_checkoff(habit_id, user_id)),
+        ("storage.delete_checkoff", lambda: _new_checkoff(habit_id, user_id), storage_manager.delete_checkoff),
+        ("storage.save_checkoffs_bulk", bulk_rows, storage_manager.save_checkoffs_bulk),
+        ("storage.rebuild_streak_summaries", no_args, storage_manager.rebuild_streak_summaries),
+        # Pure analytics over logs already in memory
+        ("analytics.get_most_missed_habits", no_args, lambda: analytics_module.get_most_missed_habits(user_logs)),
+        ("analytics.get_longest_streak", no_args, lambda: analytics_module.get_longest_streak(user_logs)),
+        ("analytics.summarize_logs", no_args, lambda: analytics_module.summarize_logs(user_logs)),
+        ("analytics.get_habits_by_period", no_args, lambda: analytics_module.get_habits_by_period(habits)),
+        ("analytics.calculate_streaks", no_args, lambda: analytics_module.calculate_streaks(logs)),
+        ("sql_engine.get_longest_streak", no_args, lambda: sql_engine.get_longest_streak(user_id)),
+        ("sql_engine.calculate_streaks", no_args, lambda: sql_engine.calculate_streaks(habit_id)),
+        # End to end, through click
+        ("cli.analyze[python]", no_args, lambda: _analyze(user_id, "python")),
+        ("cli.analyze[numpy]", no_args, lambda: _analyze(user_id, "numpy")),
+        ("cli.analyze[sql]", no_args, lambda: _analyze(user_id, "sql")),
+    ]
+
+
+def measure(setup, run, repeat=5):
+    """
+    Time a scenario several times, then run it once more under tracemalloc for its peak memory.
+    Parameters:
+        setup (Callable[[], tuple]): Untimed preparation returning run()'s arguments.
+        run (Callable): The code being measured.
+        repeat (int): Number of timed runs.
+    Returns:
+        dict: 'median_s', 'min_s' and 'peak_kib' of the scenario.
+    """
+    timings = []
+    for _ in range(repeat):
+        args = setup()
+        started = time.perf_counter()
+        run(*args)
+        timings.append(time.perf_counter() - started)
+    # Measured separately because tracing allocations slows everything down
+    args = setup()
+    tracemalloc.start()
+    try:
+        run(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"median_s": statistics.median(timings), "min_s": min(timings), "peak_kib": round(peak / 1024, 1)}
+
+
+def run_suite(path, users=200, habits=5, days=365, seed=42, repeat=5, only=None, user_id=1):
+    """
+    Generate (if needed) a database and benchmark every scenario against it.
+    Parameters:
+        path (str): SQLite file to benchmark. It is generated when it does not exist yet.
+        users (int): Users to generate.
+        habits (int): Habits per user.
+        days (int): Days of history per habit.
+        seed (int): Generator seed.
+        repeat (int): Timed runs per scenario.
+        only (Optional[str]): fnmatch pattern selecting scenarios by name, e.g. 'storage.*'.
+        user_id (int): The user the scenarios operate on.
+    Returns:
+        dict: JSON-serializable {'meta': {...}, 'results': {scenario: measurement}}.
+    """
+    if os.path.exists(path):
+        db_config.DB_PATH = path
+    else:
+        generate(path, users, habits, days, seed)
+    with db_config.db_session() as conn:
+        counts = conn.execute("""
+            SELECT (SELECT COUNT(*) FROM User), (SELECT COUNT(*) FROM Habit), (SELECT COUNT(*) FROM Habit_Logs)
+        """).fetchone()
+    results = {}
+    for name, setup, run in scenarios(user_id):
+        if only and not fnmatch.fnmatch(name, only):
+            continue
+        results[name] = measure(setup, run, repeat)
+    db_config.close_connections()
+    meta = {
+        "users": counts[0], "habits": counts[1], "logs": counts[2], "days": days, "seed": seed,
+        "repeat": repeat, "profile": db_config.DB_PROFILE, "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version, "machine": platform.machine(),
+    }
+    return {"meta": meta, "results": results}
+
+
+def compare(current, baseline, threshold=0.25):
+    """
+    Find scenarios that got slower or hungrier than in a stored baseline run.
+    Parameters:
+        current (dict): Output of run_suite().
+        baseline (dict): A previous run_suite() output, e.g. loaded from JSON.
+        threshold (float): Allowed relative increase, 0.25 meaning 25%.
+    Returns:
+        list[dict]: One entry per regression with 'scenario', 'metric', 'baseline',
+                    'current' and 'ratio' keys, worst first.
+    """
+    regressions = []
+    for name, now in current["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if before is None:
+            continue
+        for metric, floor in (("median_s", NOISE_FLOOR_SECONDS), ("peak_kib", NOISE_FLOOR_KIB)):
+            ratio = max(now[metric], floor) / max(before[metric], floor)
+            if ratio > 1 + threshold:
+                regressions.append({"scenario": name, "metric": metric, "baseline": before[metric],
+                                    "current": now[metric], "ratio": round(ratio, 2)})
+    return sorted(regressions, key=lambda entry: entry["ratio"], reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--db", help="Benchmark this database (generated there if missing) instead of a temp file.")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--habits", type=int, default=5)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", help="Only run scenarios matching this pattern, e.g. 'storage.*'.")
+    parser.add_argument("--profile", default=db_config.DB_PROFILE, choices=sorted(db_config.PRAGMA_PROFILES))
+    parser.add_argument("--output", help="Write the JSON results to this file.")
+    parser.add_argument("--compare", metavar="BASELINE", help="Flag regressions against a saved JSON result.")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    args = parser.parse_args()
+
+    db_config.DB_PROFILE = args.profile
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.db or os.path.join(tmp, "bench.db")
+        report = run_suite(path, args.users, args.habits, args.days, args.seed, args.repeat, args.only)
+
+    meta = report["meta"]
+    print(f"{meta['users']:,} users, {meta['habits']:,} habits, {meta['logs']:,} logs ({meta['profile']} profile)")
+    print(f"{'scenario':<40}{'median':>12}{'min':>12}{'peak':>14}")
+    for name, result in report["results"].items():
+        print(f"{name:<40}{result['median_s'] * 1e3:>9.2f} ms{result['min_s'] * 1e3:>9.2f} ms"
+              f"{result['peak_kib']:>10.1f} KiB")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Results written to {args.output}")
+    if args.compare:
+        with open(args.compare, "r") as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        for entry in regressions:
+            print(f"❌ {entry['scenario']} {entry['metric']}: {entry['baseline']} → {entry['current']} "
+                  f"({entry['ratio']}x)")
+        if regressions:
+            sys.exit(1)
+        print(f"✅ No regressions beyond {args.threshold:.0%} against {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+from cli.commands import cli
+
+# Allows running subcommands directly, e.g. `python -m cli import-logs logs.csv`
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,131 @@
+import os
+import select
+import socket
+
+from utils.daemon_protocol import receive_message, send_message, socket_path
+
+# How the click commands reach habit_service: through the `serve` daemon when one is
+# listening for the configured database, otherwise by calling the functions in-process.
+# Results that went through the daemon are plain JSON (tuples become lists, datetimes
+# become 'YYYY-MM-DD HH:MM:SS' strings), which is all the commands rely on.
+
+DAEMON_SUPPORTED = hasattr(socket, "AF_UNIX")
+# Turned off by --no-daemon and --profile, which must measure the in-process path
+FORWARD = DAEMON_SUPPORTED
+
+# (socket path, connected socket) reused by every call of this process
+_connection = None
+# Returned by _forward when no daemon is listening
+_NO_DAEMON = object()
+
+
+class _NotAnswered(ConnectionError):
+    # The daemon closed the connection without handling the request (e.g. it was idle too long)
+    pass
+
+
+def _is_closed(sock):
+    # Between requests nothing is due from the daemon, so a readable connection is one it
+    # dropped (end-of-file) or broke; an idle live one is not readable
+    try:
+        readable, _, _ = select.select([sock], [], [], 0)
+        return bool(readable) and sock.recv(1, socket.MSG_PEEK) == b""
+    except (OSError, ValueError):
+        return True
+
+
+def _daemon_socket():
+    global _connection
+    path = socket_path()
+    if _connection is not None:
+        if _connection[0] == path and not _is_closed(_connection[1]):
+            return _connection[1]
+        disconnect()
+    # Checking for the file first keeps the no-daemon case free of socket syscalls
+    if not os.path.exists(path):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except OSError:
+        # Socket file of a daemon that is no longer running
+        sock.close()
+        return None
+    _connection = (path, sock)
+    return sock
+
+
+def disconnect():
+    """
+    Close the connection to the daemon, if any; the next call reconnects (or runs in-process).
+    """
+    global _connection
+    if _connection is not None:
+        _connection[1].close()
+        _connection = None
+
+
+def daemon_info():
+    """
+    Ask the daemon for the configured database about itself.
+    Returns:
+        Optional[dict]: pid, db_path, requests_served and uptime, or None if no daemon is running.
+    """
+    result = _forward("ping", (), {})
+    return None if result is _NO_DAEMON else result
+
+
+def _request(sock, operation, args, kwargs):
+    try:
+        send_message(sock, {"op": operation, "args": args, "kwargs": kwargs})
+    except OSError:
+        disconnect()
+        raise _NotAnswered("❌ The habit daemon closed the connection")
+    try:
+        response = receive_message(sock)
+    except OSError:
+        disconnect()
+        raise ConnectionError("❌ Lost the connection to the habit daemon")
+    if response is None:
+        # The daemon answers every request it reads, so this one was never handled
+        disconnect()
+        raise _NotAnswered("❌ The habit daemon closed the connection")
+    if not response["ok"]:
+        error = ValueError if response["type"] == "ValueError" else RuntimeError
+        raise error(response["error"])
+    return response["result"]
+
+
+def _forward(operation, args, kwargs):
+    # Retried once on a fresh connection if the daemon dropped the old one unanswered;
+    # a request that may have been handled is never sent twice
+    for attempt in (1, 2):
+        sock = _daemon_socket()
+        if sock is None:
+            return _NO_DAEMON
+        try:
+            return _request(sock, operation, args, kwargs)
+        except _NotAnswered:
+            if attempt == 2:
+                raise
+
+
+def call(operation, *args, **kwargs):
+    """
+    Run a habit_service function, in the daemon if one is running.
+    Parameters:
+        operation (str): Name of the habit_service function, e.g. 'get_user_habits'.
+        *args: Positional arguments of the function.
+        **kwargs: Keyword arguments of the function.
+    Returns:
+        Any: The function's result (JSON-decoded when it came from the daemon).
+    Raises:
+        ValueError: Re-raised from the function, wherever it ran.
+        ConnectionError: If the daemon went away while handling the call.
+    """
+    if FORWARD:
+        result = _forward(operation, args, kwargs)
+        if result is not _NO_DAEMON:
+            return result
+    from services import habit_service
+    return getattr(habit_service, operation)(*args, **kwargs)
@@ -1,32 +1,125 @@
 import click
-from services.habit_service import (
-    create_habit,
-    remove_habit,
-    get_user_habits,
-    checkoff_habit,
-)
-from analytics.analytics_module import (
-    get_longest_streak,
-    get_most_missed_habits,
-)
-from repository.storage_manager import (
-    load_all_habits,
-    load_checkoffs_for_habit,
-)
-from datetime import datetime
+import csv
+import json
+import os
+import time
+from collections import deque
+from cli import client
+from config import db_config
+from services.habit_service import checkoff_habits_bulk, ANALYTICS_ENGINES, STREAK_UNITS
+from services.batch_analytics import analyze_all_users, OUTPUT_FORMATS, SHARD_SIZE
+from utils.validators import validate_log_record, validate_user_record
+from datetime import date, datetime, timedelta
+
+# Written by `login`: the session token for one database, readable by this OS user only
+SESSION_FILE = os.getenv("HABIT_SESSION_FILE") or os.path.join(os.path.expanduser("~"), ".habit_tracker_session")
+
+
+def _saved_token():
+    # The token saved by `login`, if it was issued for the configured database
+    try:
+        with open(SESSION_FILE) as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return saved.get("token") if saved.get("db_path") == os.path.abspath(db_config.DB_PATH) else None
+
+
+def _logged_in_user():
+    # Default of every --user-id: the user of a valid `login` session, if any
+    token = _saved_token()
+    if token is None:
+        return None
+    from services.auth import validate_session
+    return validate_session(token)
 
 
 @click.group()
-def cli():
+@click.option('--profile', is_flag=True,
+              help='Print timings of storage/auth calls and SQL statements after the command.')
+@click.option('--profile-json', type=click.Path(dir_okay=False, writable=True), default=None,
+              help='Also write the profile as JSON to this file (implies --profile).')
+@click.option('--slow-ms', default=50.0, show_default=True, type=click.FloatRange(min=0),
+              help='Log statements slower than this, with their query plan.')
+@click.option('--cprofile', type=click.Path(dir_okay=False, writable=True), default=None,
+              help='Write a cProfile dump of the command to this file (implies --profile).')
+@click.option('--no-daemon', is_flag=True,
+              help='Run in this process even if a `serve` daemon is running.')
+@click.pass_context
+def cli(ctx, profile, profile_json, slow_ms, cprofile, no_daemon):
     """
     Habit Tracker CLI
     This is the root command group for the Habit Tracker command-line interface.
+    Commands run in a `serve` daemon for the same database when one is listening.
+    """
+    profiling = profile or profile_json or cprofile
+    # Profiles describe this process, so the work must happen here
+    client.FORWARD = client.DAEMON_SUPPORTED and not (no_daemon or profiling)
+    if not profiling:
+        return
+    # Imported lazily, profiling is off for normal runs
+    from utils.profiler import QueryProfiler
+    profiler = QueryProfiler(slow_ms=slow_ms, cprofile_path=cprofile)
+    command = ctx.invoked_subcommand
+
+    def report():
+        profiler.stop()
+        click.echo(profiler.format_summary(command), err=True)
+        if profile_json:
+            with open(profile_json, "w") as f:
+                json.dump(profiler.report(command), f, indent=2)
+
+    profiler.start()
+    ctx.call_on_close(report)
+
+
+@cli.command()
+@click.option('--username', prompt='Username')
+@click.option('--password', prompt='Password', hide_input=True)
+def login(username, password):
     """
-    pass
+    Log in once; until `logout`, commands default --user-id to this user.
+    Parameters:
+        username (str): The user's username.
+        password (str): The user's password.
+    The session token is saved (owner-only) in HABIT_SESSION_FILE, by default ~/.habit_tracker_session.
+    """
+    from services.auth import log_in_with_session
+    user_id, token, message = log_in_with_session(username, password)
+    click.echo(message)
+    if token is None:
+        return
+    descriptor = os.open(SESSION_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(descriptor, "w") as f:
+        json.dump({"db_path": os.path.abspath(db_config.DB_PATH), "user_id": user_id, "token": token}, f)
+    click.echo(f"🔑 Session started for user {user_id}.")
 
 
 @cli.command()
-@click.option('--user-id', prompt='User ID', type=int)
+def logout():
+    """
+    End the session started by `login`.
+    """
+    token = _saved_token()
+    if token is not None:
+        from services.auth import end_session
+        end_session(token)
+    if os.path.exists(SESSION_FILE):
+        os.remove(SESSION_FILE)
+    click.echo("👋 Logged out.")
+
+
+@cli.command()
+def whoami():
+    """
+    Show the user of the current `login` session.
+    """
+    user_id = _logged_in_user()
+    click.echo(f"👤 Logged in as user {user_id}." if user_id is not None else "👤 Not logged in.")
+
+
+@cli.command()
+@click.option('--user-id', prompt='User ID', type=int, default=_logged_in_user)
 @click.option('--name', prompt='Habit name')
 @click.option('--frequency', prompt='Frequency (daily/weekly)', type=click.Choice(['daily', 'weekly']))
 @click.option('--description', prompt='Description', default='')
@@ -44,85 +137,148 @@ def create(user_id, name, frequency, description, deadline):
     # Convert the deadline string to a datetime object if provided
     deadline_time = datetime.strptime(deadline, "%Y-%m-%d %H:%M") if deadline else None
     # Call the habit creation logic
-    habit = create_habit(user_id, name, frequency, description, deadline_time)
+    client.call("create_habit", user_id, name, frequency, description, deadline_time)
     # Provide feedback to the user
-    click.echo(f"✅ Habit '{habit.name}' created for user {user_id}.")
+    click.echo(f"✅ Habit '{name}' created for user {user_id}.")
 
 
 @cli.command(name="list")
-@click.option('--user-id', prompt='User ID', type=int)
-def list_habits(user_id):
+@click.option('--user-id', prompt='User ID', type=int, default=_logged_in_user)
+@click.option('--recent', default=0, type=click.IntRange(min=0),
+              help="Also show each habit's N most recent check-offs.")
+def list_habits(user_id, recent):
     """
     List all habits for a specific user.
     Parameters:
         user_id (int): The ID of the user whose habits will be displayed.
+        recent (int): Number of most recent check-offs to show per habit (0 for none).
     """
     # Fetch habits associated with the use
-    habits = get_user_habits(user_id)
+    habits = client.call("get_user_habits", user_id)
     if not habits:
         click.echo("📭 No habits found.")
     else:
         click.echo(f"📋 Habits for user {user_id}:")
         for habit in habits:
             click.echo(f"[{habit['habit_id']}] {habit['name']} ({habit['frequency']})")
+            if recent:
+                # One bounded index range per habit instead of its whole history
+                logs, _ = client.call("get_checkoffs_page", habit['habit_id'], limit=recent)
+                for log in logs:
+                    click.echo(f"    {_format_log(log)}")
+
+
+def _format_log(log):
+    status = "missed" if log['missed'] else "done"
+    note = f" - {log['note']}" if log['note'] else ""
+    return f"#{log['log_id']} {log['completed_at']} {status}{note}"
+
+
+def _parse_cursor(ctx, param, value):
+    # Cursors are printed as 'completed_at|log_id' by the logs command
+    if value is None:
+        return None
+    completed_at, sep, log_id = value.rpartition("|")
+    if not sep or not completed_at or not log_id.isdigit():
+        raise click.BadParameter("expected the 'completed_at|log_id' cursor printed by a previous page")
+    return completed_at, int(log_id)
 
 
 @cli.command()
 @click.option('--habit-id', prompt='Habit ID', type=int)
-def delete(habit_id):
+@click.pass_context
+def delete(ctx, habit_id):
     """
     Delete a specific habit by its ID.
     Parameters:
         habit_id (int): The ID of the habit to be deleted.
+    Exits with status 1 if there is no such habit.
     """
     # Remove the habit from the system
-    remove_habit(habit_id)
+    if not client.call("remove_habit", habit_id):
+        click.echo(f"❌ Habit {habit_id} not found.", err=True)
+        # An exit code rather than an exception, so the interactive menu keeps running
+        ctx.exit(1)
     # Inform the user about the deletion
     click.echo(f"🗑️ Habit {habit_id} deleted.")
 
 
 @cli.command()
 @click.option('--habit-id', prompt='Habit ID', type=int)
-@click.option('--user-id', prompt='User ID', type=int)
-def checkoff(habit_id, user_id):
+@click.option('--user-id', prompt='User ID', type=int, default=_logged_in_user)
+@click.pass_context
+def checkoff(ctx, habit_id, user_id):
     """
     Mark a habit as completed for a specific user.
     Parameters:
         habit_id (int): The ID of the habit to be checked off.
         user_id (int): The ID of the user completing the habit.
+    Exits with status 1 if there is no such habit or it belongs to another user.
     """
     # Register the habit check-off action
-    checkoff_habit(habit_id, user_id)
+    try:
+        client.call("checkoff_habit", habit_id, user_id)
+    except ValueError as e:
+        click.echo(str(e), err=True)
+        ctx.exit(1)
     # Confirm the action to the user
     click.echo(f"✅ Habit {habit_id} checked off for user {user_id}.")
 
 
 @cli.command()
-@click.option('--user-id', prompt='User ID', type=int)
-def analyze(user_id):
+@click.option('--habit-id', prompt='Habit ID', type=int)
+@click.option('--since', type=click.DateTime(), default=None, help="Only check-offs at or after this time.")
+@click.option('--until', type=click.DateTime(), default=None, help="Only check-offs before this time.")
+@click.option('--limit', default=20, show_default=True, type=click.IntRange(min=1),
+              help="Number of check-offs per page.")
+@click.option('--after', callback=_parse_cursor, default=None,
+              help="Continue after the cursor printed by the previous page.")
+def logs(habit_id, since, until, limit, after):
+    """
+    Show a habit's check-offs, most recent first, one page at a time.
+    Parameters:
+        habit_id (int): The ID of the habit whose check-offs are shown.
+        since (datetime): Optional inclusive start of the time range.
+        until (datetime): Optional exclusive end of the time range.
+        limit (int): Page size.
+        after (tuple): Cursor of the previous page, or None for the first page.
+    """
+    page, next_cursor = client.call("get_checkoffs_page", habit_id, limit=limit, after=after, since=since,
+                                    until=until)
+    if not page:
+        click.echo("📭 No check-offs found.")
+        return
+    click.echo(f"📋 Check-offs for habit {habit_id}:")
+    for log in page:
+        click.echo(_format_log(log))
+    if next_cursor:
+        click.echo(f"➡️ More: --after '{next_cursor[0]}|{next_cursor[1]}'")
+
+
+@cli.command()
+@click.option('--user-id', prompt='User ID', type=int, default=_logged_in_user)
+@click.option('--engine', type=click.Choice(ANALYTICS_ENGINES), default='python', show_default=True,
+              help="Compute in Python over streamed logs, or push the work into SQLite.")
+def analyze(user_id, engine):
     """
      Analyze habit performance data for a specific user.
      Parameters:
         user_id (int): The ID of the user whose habits will be analyzed.
-     This command loads all habits and check-off logs for the user,
-     calculates the longest completion streak, and identifies the most missed habits.
+        engine (str): Analytics engine, 'python' or 'sql'.
+     This command calculates the longest completion streak and identifies the most
+     missed habits, either from one streamed log query or entirely inside SQLite.
      """
-    # Load all habits for the user
-    habits = load_all_habits(user_id)
-    # Collect all check-off logs across all habits
-    all_logs = []
-    for habit in habits:
-        logs = load_checkoffs_for_habit(habit['habit_id'])
-        all_logs.extend(logs)
-    # Analyze the longest completion streak
-    longest_streak = get_longest_streak(all_logs)
-    # Analyze most frequently missed habits
-    missed_habits = get_most_missed_habits(all_logs)
+    # Longest completion streak and most frequently missed habits
+    longest_streak, missed_habits = client.call("get_user_analytics", user_id, engine=engine)
 
     click.echo("📊 Analytics Summary:")
 
     if longest_streak:
-        click.echo(f"🔥 Longest streak: Habit {longest_streak[0]} → {longest_streak[1]} days")
+        # Streaks count periods: days for daily habits, ISO weeks for weekly ones
+        frequency = next((habit["frequency"] for habit in client.call("get_user_habits", user_id)
+                          if habit["habit_id"] == longest_streak[0]), None)
+        unit = STREAK_UNITS.get(frequency, "periods")
+        click.echo(f"🔥 Longest streak: Habit {longest_streak[0]} → {longest_streak[1]} {unit}")
     else:
         click.echo("No streak data available.")
 
@@ -131,4 +287,329 @@ def analyze(user_id):
         for habit_id, count in missed_habits:
             click.echo(f" Habit {habit_id} missed {count} times")
     else:
-        click.echo("✅ No missed habits.")
\ No newline at end of file
+        click.echo("✅ No missed habits.")
+
+
+# Heatmap cells: completions per day (4 or more share the darkest shade), or a miss
+_HEAT_SHADES = "·░▒▓█"
+_MISSED_CELL = "x"
+_WEEKDAYS = ("Mon", "", "Wed", "", "Fri", "", "Sun")
+
+
+def _heatmap(start, end, days):
+    """
+    Render one habit's calendar heatmap: a row per weekday and a column per ISO week.
+    Parameters:
+        start (date): First day shown.
+        end (date): Last day shown.
+        days (dict): 'YYYY-MM-DD' -> [completions, missed] for days with logs.
+    Returns:
+        list[str]: The month header line followed by seven weekday lines.
+    """
+    first_monday = start - timedelta(days=start.weekday())
+    weeks = (end - first_monday).days // 7 + 1
+    # Room for a month name that starts in the last column
+    header = [" "] * (weeks + 3)
+    rows = [[] for _ in range(7)]
+    for week in range(weeks):
+        for weekday in range(7):
+            day = first_monday + timedelta(weeks=week, days=weekday)
+            if not start <= day <= end:
+                rows[weekday].append(" ")
+                continue
+            completions, missed = days.get(day.isoformat(), (0, 0))
+            if completions:
+                rows[weekday].append(_HEAT_SHADES[min(completions, len(_HEAT_SHADES) - 1)])
+            else:
+                rows[weekday].append(_MISSED_CELL if missed else _HEAT_SHADES[0])
+            # Month names start at the week holding the 1st, if there is room before the next one
+            if day.day == 1 or day == start:
+                label = day.strftime("%b")
+                if all(cell == " " for cell in header[week:week + len(label)]):
+                    header[week:week + len(label)] = label
+    lines = ["     " + "".join(header)] + [f"{name:<4} " + "".join(row) for name, row in zip(_WEEKDAYS, rows)]
+    return [line.rstrip() for line in lines]
+
+
+@cli.command()
+@click.option('--user-id', prompt='User ID', type=int, default=_logged_in_user)
+@click.option('--days', default=365, show_default=True, type=click.IntRange(min=1, max=3660),
+              help='Number of days shown, ending with --end.')
+@click.option('--end', type=click.DateTime(formats=["%Y-%m-%d"]), default=None,
+              help='Last day shown (YYYY-MM-DD). Defaults to today.')
+def calendar(user_id, days, end):
+    """
+    Show a calendar heatmap of each habit's completions over the last year.
+    Parameters:
+        user_id (int): The ID of the user whose habits are shown.
+        days (int): Number of days shown.
+        end (Optional[datetime]): Last day shown.
+    Reads the per-day rollup, so the cost depends on the days shown, not on the number of logs.
+    """
+    result = client.call("get_calendar", user_id, days=days, end=end.date().isoformat() if end else None)
+    if not result["habits"]:
+        click.echo("📭 No habits found.")
+        return
+    start, end = date.fromisoformat(result["start"]), date.fromisoformat(result["end"])
+    click.echo(f"📅 Habits for user {user_id}, {start} to {end}:")
+    for habit in result["habits"]:
+        done = sum(1 for completions, _ in habit["days"].values() if completions)
+        missed = sum(1 for completions, missed in habit["days"].values() if missed and not completions)
+        click.echo(f"\n[{habit['habit_id']}] {habit['name']} ({habit['frequency']}): "
+                   f"{done} days done, {missed} missed")
+        for line in _heatmap(start, end, habit["days"]):
+            click.echo(line)
+    click.echo(f"\n{_HEAT_SHADES[0]} none  {_HEAT_SHADES[1]}{_HEAT_SHADES[2]}{_HEAT_SHADES[3]}{_HEAT_SHADES[4]} "
+               f"1-4+ check-offs  {_MISSED_CELL} missed")
+
+
+@cli.command(name="analyze-all")
+@click.argument('output', type=click.Path(dir_okay=False, writable=True))
+@click.option('--format', 'fmt', type=click.Choice(OUTPUT_FORMATS), default=None,
+              help='Output format. Guessed from the file extension; defaults to ndjson.')
+@click.option('--workers', type=click.IntRange(min=1), default=None,
+              help='Worker processes. Defaults to the number of CPUs.')
+@click.option('--engine', type=click.Choice(ANALYTICS_ENGINES), default='python', show_default=True)
+@click.option('--shard-size', default=SHARD_SIZE, show_default=True, type=click.IntRange(min=1),
+              help='Consecutive user IDs handed to a worker at once.')
+@click.option('--resume', is_flag=True, help='Continue an interrupted run, skipping users already in OUTPUT.')
+def analyze_all(output, fmt, workers, engine, shard_size, resume):
+    """
+    Analyze every user in parallel and stream per-user results to OUTPUT.
+    Parameters:
+        output (str): NDJSON or CSV file receiving one result per user.
+        fmt (str): Output format ('ndjson' or 'csv').
+        workers (int): Number of worker processes.
+        engine (str): Analytics engine used for each user.
+        shard_size (int): Users per unit of work.
+        resume (bool): Append to an existing OUTPUT instead of starting over.
+    """
+    if fmt is None:
+        fmt = "csv" if output.endswith(".csv") else "ndjson"
+    started = time.perf_counter()
+
+    def progress(done, total):
+        elapsed = time.perf_counter() - started
+        click.echo(f"⏳ {done}/{total} users ({elapsed:.1f}s)", err=True)
+
+    count = analyze_all_users(output, fmt=fmt, workers=workers, engine=engine, shard_size=shard_size,
+                              resume=resume, on_progress=progress)
+    elapsed = time.perf_counter() - started
+    click.echo(f"✅ Analyzed {count} users in {elapsed:.2f}s → {output}")
+
+
+@cli.command()
+@click.option('--file', 'file_path', type=click.Path(exists=True, dir_okay=False), default=None,
+              help='Fixture file to load. Defaults to db/fixtures.json.')
+@click.option('--chunk-size', default=5000, show_default=True, type=click.IntRange(min=1),
+              help='Rows written per transaction.')
+def seed(file_path, chunk_size):
+    """
+    Load users, habits and logs from a fixture file (the demo data by default).
+    A file that was loaded before is skipped, so it is safe to run again; an
+    interrupted load picks up after the last committed chunk.
+    """
+    # Only this command needs the fixture loader
+    from load_fixtures import FIXTURE_FILE, load_fixtures
+    started = time.perf_counter()
+    loaded = load_fixtures(file_path or FIXTURE_FILE, chunk_size=chunk_size)
+    if any(loaded.values()):
+        click.echo(f"📦 {loaded['users']} users, {loaded['habits']} habits, {loaded['habit_logs']} logs "
+                   f"in {time.perf_counter() - started:.2f}s")
+
+
+@cli.command()
+@click.option('--socket', 'socket_file', type=click.Path(dir_okay=False), default=None,
+              help='Socket to listen on. Defaults to HABIT_DAEMON_SOCKET or the database path + .sock.')
+@click.option('--workers', default=4, show_default=True, type=click.IntRange(min=1),
+              help='Client connections served concurrently.')
+@click.option('--group-commit', is_flag=True, help='Batch concurrent check-offs into group commits.')
+def serve(socket_file, workers, group_commit):
+    """
+    Run a daemon that keeps the services, connections and caches warm.
+    Other commands for the same database forward to it while it runs. Stop it with Ctrl+C.
+    """
+    # Only this command needs the server
+    from services.daemon import serve as run_daemon
+
+    def ready(server):
+        click.echo(f"🛰️ Serving {server.path} (pid {os.getpid()}). Press Ctrl+C to stop.")
+
+    run_daemon(socket_file, workers=workers, group_commit=group_commit, on_ready=ready)
+    click.echo("👋 Daemon stopped.")
+
+
+@cli.command(name="rebuild-streaks")
+def rebuild_streaks_command():
+    """
+    Recompute the Habit_Streaks summary table from all check-off logs.
+    Useful after editing Habit_Logs by hand or restoring a backup.
+    """
+    started = time.perf_counter()
+    count = client.call("rebuild_streaks")
+    click.echo(f"✅ Rebuilt streaks for {count} habits in {time.perf_counter() - started:.2f}s")
+
+
+@cli.command(name="rebuild-rollup")
+def rebuild_rollup_command():
+    """
+    Recompute the per-day rollup behind `calendar` from all check-off logs.
+    Useful after restoring a backup or editing Habit_Logs with the triggers dropped.
+    """
+    started = time.perf_counter()
+    count = client.call("rebuild_rollup")
+    click.echo(f"✅ Rebuilt {count} habit days in {time.perf_counter() - started:.2f}s")
+
+
+@cli.command(name="record-missed")
+@click.option('--until', type=click.DateTime(formats=["%Y-%m-%d %H:%M", "%Y-%m-%d %H:%M:%S"]), default=None,
+              help='Evaluate deadlines up to this time instead of now.')
+def record_missed(until):
+    """
+    Record a missed log for every period whose deadline passed without a check-off.
+    Meant to run from cron: each run only evaluates deadlines since the previous one,
+    and re-running it never records a period twice.
+    Parameters:
+        until (Optional[datetime]): Evaluate deadlines up to this time. Defaults to now.
+    """
+    started = time.perf_counter()
+    result = client.call("evaluate_deadlines", until)
+    window = f"after {result['since']} " if result["since"] else ""
+    click.echo(f"✅ Recorded {result['missed']} missed periods (deadlines {window}up to {result['until']}) "
+               f"in {time.perf_counter() - started:.2f}s")
+
+
+def _read_log_records(source, fmt):
+    """
+    Lazily parse and validate check-off rows from an open CSV or JSONL stream.
+    Parameters:
+        source (IO[str]): The open file or stdin.
+        fmt (str): 'csv' or 'jsonl'.
+    Yields:
+        tuple[int, Optional[tuple], Optional[str]]: The line number, and either the validated
+        record or the reason the row was rejected.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(source)
+        rows = ((reader.line_num, row) for row in reader)
+    else:
+        rows = ((number, line) for number, line in enumerate(source, start=1) if line.strip())
+    for line_number, row in rows:
+        try:
+            if fmt == "jsonl":
+                row = json.loads(row)
+                if not isinstance(row, dict):
+                    raise ValueError("❌ Each JSONL line must be an object")
+            yield line_number, validate_log_record(row), None
+        except ValueError as e:
+            yield line_number, None, str(e)
+
+
+@cli.command(name="import-logs")
+@click.argument('source', type=click.File('r'), default='-')
+@click.option('--format', 'fmt', type=click.Choice(['csv', 'jsonl']), default=None,
+              help='Input format. Guessed from the file extension; stdin defaults to csv.')
+@click.option('--chunk-size', default=5000, show_default=True, type=click.IntRange(min=1),
+              help='Rows written per transaction.')
+def import_logs(source, fmt, chunk_size):
+    """
+    Bulk-import check-off logs from a CSV or JSONL file (or '-' for stdin).
+    Parameters:
+        source (IO[str]): File with habit_id, user_id, completed_at[, note, missed] columns/keys.
+        fmt (str): Input format ('csv' or 'jsonl').
+        chunk_size (int): Number of rows committed per transaction.
+    Rows are streamed and validated one by one, so memory use does not grow with file size.
+    Invalid rows are reported and skipped.
+    """
+    if fmt is None:
+        fmt = "jsonl" if source.name.endswith((".jsonl", ".ndjson")) else "csv"
+    rejected = 0
+
+    def valid_records():
+        nonlocal rejected
+        for line_number, record, error in _read_log_records(source, fmt):
+            if error:
+                rejected += 1
+                click.echo(f"⚠️ Line {line_number} skipped: {error}", err=True)
+            else:
+                yield record
+
+    started = time.perf_counter()
+    imported = checkoff_habits_bulk(valid_records(), chunk_size=chunk_size)
+    elapsed = time.perf_counter() - started
+    rate = imported / elapsed if elapsed > 0 else 0.0
+    click.echo(f"✅ Imported {imported} logs ({rejected} rejected) in {elapsed:.2f}s — {rate:,.0f} rows/s")
+
+
+@cli.command(name="import-users")
+@click.argument('source', type=click.File('r'), default='-')
+@click.option('--chunk-size', default=1000, show_default=True, type=click.IntRange(min=1),
+              help='Users written per transaction; their passwords are hashed in parallel first.')
+def import_users(source, chunk_size):
+    """
+    Provision user accounts from a CSV file (or '-' for stdin).
+    Parameters:
+        source (IO[str]): CSV with username, password[, email] columns.
+        chunk_size (int): Number of users committed per transaction.
+    Rows are streamed, so memory use does not grow with file size. Invalid rows and taken
+    usernames are reported with their line number and skipped.
+    """
+    from services.auth import sign_up_many
+
+    reader = csv.DictReader(source)
+    # Line numbers of the users yielded so far; conflicts are reported within the chunk they are in
+    line_numbers = deque(maxlen=chunk_size)
+    yielded = 0
+    rejected = 0
+    conflicts = 0
+
+    def valid_users():
+        nonlocal rejected, yielded
+        for row in reader:
+            try:
+                user = validate_user_record(row)
+            except ValueError as e:
+                rejected += 1
+                click.echo(f"⚠️ Line {reader.line_num} skipped: {e}", err=True)
+                continue
+            line_numbers.append(reader.line_num)
+            yielded += 1
+            yield user
+
+    def report_conflict(position, username):
+        nonlocal conflicts
+        conflicts += 1
+        line_number = line_numbers[position - (yielded - len(line_numbers))]
+        click.echo(f"⚠️ Line {line_number} skipped: ❌ Username {username!r} already exists", err=True)
+
+    started = time.perf_counter()
+    created = sign_up_many(valid_users(), chunk_size=chunk_size, on_conflict=report_conflict)
+    elapsed = time.perf_counter() - started
+    rate = created / elapsed if elapsed > 0 else 0.0
+    click.echo(f"✅ Created {created} users ({conflicts} taken, {rejected} rejected) "
+               f"in {elapsed:.2f}s — {rate:,.0f} users/s")
+
+
+@cli.command(name="export-columnar")
+@click.argument('directory', type=click.Path(file_okay=False))
+@click.option('--chunk-size', default=100000, show_default=True, type=click.IntRange(min=1),
+              help='Logs read per short read transaction and appended per write.')
+def export_columnar_command(directory, chunk_size):
+    """
+    Append new check-offs to memory-mappable NumPy column files for offline analytics.
+    Parameters:
+        directory (str): Directory of the export; created on the first run.
+        chunk_size (int): Number of logs copied per chunk.
+    Only logs added since the previous export into the same directory are copied.
+    """
+    try:
+        # Imported lazily so numpy stays optional for the rest of the CLI
+        from analytics.columnar import export_columnar
+    except ImportError:
+        raise click.ClickException("❌ export-columnar needs numpy: pip install numpy")
+    started = time.perf_counter()
+    result = export_columnar(directory, chunk_size=chunk_size)
+    elapsed = time.perf_counter() - started
+    rate = result["exported"] / elapsed if elapsed > 0 else 0.0
+    click.echo(f"✅ Exported {result['exported']} new logs ({result['rows']} total, up to log_id "
+               f"{result['last_log_id']}) to {directory} in {elapsed:.2f}s — {rate:,.0f} logs/s")
@@ -1,12 +1,114 @@
 # config/db_config.py
+import atexit
+import functools
 import os
+import re
 import sqlite3
-from dotenv import load_dotenv
+import threading
+from contextlib import contextmanager
+
+# A .env line the fast path understands without python-dotenv: NAME=value, optionally after
+# `export`, with a plain or single-quoted value. Importing python-dotenv is a noticeable share
+# of CLI startup time, and its parsed values (secrets included) are never written to disk.
+_SIMPLE_DOTENV_LINE = re.compile(r"(?:export\s+)?([A-Za-z_][A-Za-z0-9_.]*)\s*=\s*(?:'([^'\\]*)'|([^'\"`#$\\\s]*))\s*")
+
+
+def _find_dotenv():
+    # Same search as python-dotenv's find_dotenv() from this file: this folder, then its parents
+    directory = os.path.dirname(os.path.abspath(__file__))
+    while True:
+        candidate = os.path.join(directory, ".env")
+        if os.path.isfile(candidate):
+            return candidate
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return None
+        directory = parent
+
+
+def _parse_simple_dotenv(text):
+    # The values of a .env made only of simple lines and comments, or None if python-dotenv is needed
+    values = {}
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        match = _SIMPLE_DOTENV_LINE.fullmatch(line)
+        if match is None:
+            return None
+        name, quoted, plain = match.groups()
+        values[name] = quoted if quoted is not None else plain
+    return values
+
+
+def _dotenv_values(path):
+    with open(path, "r", encoding="utf-8") as f:
+        values = _parse_simple_dotenv(f.read())
+    if values is not None:
+        return values
+    # Quotes with escapes, ${VAR} expansion, multi-line values, ...
+    from dotenv import dotenv_values
+    return dotenv_values(path)
+
+
+@functools.lru_cache(maxsize=None)
+def load_environment():
+    """
+    Load variables from the nearest .env file into os.environ, like python-dotenv's load_dotenv().
+    Variables already set in the environment win. Resolved once per process; python-dotenv is
+    only imported for files with more than plain NAME=value lines.
+    Returns:
+        Optional[str]: Path of the .env file that was loaded, or None if there is none.
+    """
+    path = _find_dotenv()
+    if path is None:
+        return None
+    for name, value in _dotenv_values(path).items():
+        if value is not None:
+            os.environ.setdefault(name, value)
+    return path
+
 
 # Load environment variables from a .env file
-load_dotenv()
+load_environment()
 # Get the path to the SQLite database from environment, or use default
 DB_PATH = os.getenv("DB_PATH", "./db/habits.db")
+# Name of the PRAGMA profile applied to pooled connections (see PRAGMA_PROFILES)
+DB_PROFILE = os.getenv("DB_PROFILE", "default")
+
+# PRAGMA settings applied once to every pooled connection, keyed by profile name
+PRAGMA_PROFILES = {
+    # SQLite's own defaults: rollback journal and a full fsync on every commit
+    "safe": {},
+    # WAL lets readers run next to the writer; NORMAL only fsyncs at checkpoints
+    "default": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -16000,        # negative means KiB, so roughly 16 MB
+        "temp_store": "MEMORY",
+        "mmap_size": 134217728,      # 128 MB
+    },
+    # Bulk loads and benchmarks only: a crash may lose the latest transactions
+    "fast": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -64000,
+        "temp_store": "MEMORY",
+        "mmap_size": 268435456,
+    },
+}
+
+# Class used for new connections; the CLI --profile mode swaps in an instrumented subclass
+CONNECTION_FACTORY = sqlite3.Connection
+
+# Per-thread pool state: open connections and the nesting depth of db_session()
+_local = threading.local()
+# (pid, connection) for every pooled connection, so they can be closed at exit
+_all_connections = []
+_registry_lock = threading.Lock()
+# Bumped by close_connections() so other threads drop their closed handles
+_generation = 0
+
 
 def get_connection():
     """
@@ -15,4 +117,135 @@ def get_connection():
         sqlite3.Connection: A connection object to the specified SQLite database,
         with type detection enabled for better datetime parsing and column name support.
     """
-    return sqlite3.connect(DB_PATH, detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES)
\ No newline at end of file
+    return sqlite3.connect(DB_PATH, detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES,
+                           factory=CONNECTION_FACTORY)
+
+
+def apply_pragmas(conn, profile=None):
+    """
+    Apply the PRAGMA settings of a profile to a connection.
+    Parameters:
+        conn (sqlite3.Connection): The connection to configure.
+        profile (Optional[str]): Profile name. Defaults to DB_PROFILE.
+    Raises:
+        ValueError: If the profile name is unknown.
+    """
+    profile = profile or DB_PROFILE
+    if profile not in PRAGMA_PROFILES:
+        raise ValueError(f"❌ Unknown DB profile '{profile}'. Choose from: {', '.join(PRAGMA_PROFILES)}")
+    for name, value in PRAGMA_PROFILES[profile].items():
+        conn.execute(f"PRAGMA {name} = {value}")
+
+
+def _file_identity(path):
+    # (device, inode) of the database file, or None if it does not exist yet
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_dev, stat.st_ino
+
+
+def _thread_pool():
+    # Connections inherited through fork() belong to the parent process, so start fresh
+    if getattr(_local, "pid", None) != os.getpid():
+        _local.pid = os.getpid()
+        _local.pool = {}
+        _local.depth = 0
+    if getattr(_local, "generation", None) != _generation:
+        _local.generation = _generation
+        _local.pool = {}
+    return _local.pool
+
+
+def acquire_connection():
+    """
+    Return this thread's pooled connection to DB_PATH, opening it on first use.
+    The connection is reused by later calls from the same thread. It is reopened if
+    DB_PATH or DB_PROFILE change, or if the database file was replaced on disk.
+    Returns:
+        sqlite3.Connection: A configured connection owned by the calling thread.
+    """
+    pool = _thread_pool()
+    key = (DB_PATH, DB_PROFILE)
+    identity = _file_identity(DB_PATH)
+    entry = pool.get(key)
+    if entry is not None:
+        conn, known_identity = entry
+        if known_identity == identity:
+            return conn
+        # The file was deleted or swapped underneath us; drop the stale handle
+        _discard(conn)
+
+    conn = sqlite3.connect(
+        DB_PATH,
+        detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES,
+        # Only the owning thread uses it, but close_connections() may run elsewhere
+        check_same_thread=False,
+        factory=CONNECTION_FACTORY,
+    )
+    try:
+        apply_pragmas(conn)
+    except Exception:
+        conn.close()
+        raise
+    pool[key] = (conn, _file_identity(DB_PATH))
+    with _registry_lock:
+        _all_connections.append((os.getpid(), conn))
+    return conn
+
+
+@contextmanager
+def db_session():
+    """
+    Context manager around the calling thread's pooled connection.
+    The outermost session commits on success and rolls back on error. Nested sessions
+    share the same transaction, so several storage calls can be grouped together.
+    Yields:
+        sqlite3.Connection: The pooled connection.
+    """
+    conn = acquire_connection()
+    _local.depth += 1
+    try:
+        yield conn
+    except BaseException:
+        _local.depth -= 1
+        if _local.depth == 0:
+            conn.rollback()
+        raise
+    _local.depth -= 1
+    if _local.depth == 0 and conn.in_transaction:
+        conn.commit()
+
+
+def _discard(conn):
+    with _registry_lock:
+        _all_connections[:] = [entry for entry in _all_connections if entry[1] is not conn]
+    try:
+        conn.close()
+    except sqlite3.Error:
+        pass
+
+
+def close_connections():
+    """
+    Close every pooled connection opened by this process, in all threads.
+    Connections inherited from a parent process through fork() are left alone.
+    Threads transparently reopen a connection on their next call.
+    """
+    global _generation
+    pid = os.getpid()
+    with _registry_lock:
+        _generation += 1
+        connections = [conn for owner, conn in _all_connections if owner == pid]
+        _all_connections.clear()
+    for conn in connections:
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+    _local.depth = 0
+
+
+# Closing cleanly checkpoints the WAL and removes the -wal/-shm side files
+atexit.register(close_connections)
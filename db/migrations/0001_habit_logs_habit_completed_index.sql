@@ -0,0 +1,6 @@
+-- db/migrations/0001_habit_logs_habit_completed_index.sql
+-- Serves load_checkoffs_for_habit and check_if_missed (WHERE habit_id = ? ORDER BY completed_at)
+-- with an index range scan. Including `missed` makes it covering for streak/miss analytics.
+
+CREATE INDEX IF NOT EXISTS idx_habit_logs_habit_completed
+    ON Habit_Logs (habit_id, completed_at, missed);
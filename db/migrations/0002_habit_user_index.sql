@@ -0,0 +1,5 @@
+-- db/migrations/0002_habit_user_index.sql
+-- Serves load_all_habits (WHERE user_id = ?) without scanning every user's habits.
+
+CREATE INDEX IF NOT EXISTS idx_habit_user
+    ON Habit (user_id);
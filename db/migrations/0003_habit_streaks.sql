@@ -0,0 +1,13 @@
+-- db/migrations/0003_habit_streaks.sql
+-- Per-habit streak summary kept up to date by the storage write path, so streak lookups
+-- do not have to replay the whole log history. Counts completed (missed = 0) logs by
+-- calendar day. Rows are (re)built from Habit_Logs on demand or by `rebuild-streaks`.
+
+CREATE TABLE IF NOT EXISTS Habit_Streaks (
+    habit_id INTEGER PRIMARY KEY,
+    current_streak INTEGER NOT NULL DEFAULT 0,
+    longest_streak INTEGER NOT NULL DEFAULT 0,
+    last_completed_day TEXT,            -- 'YYYY-MM-DD'
+    total_completions INTEGER NOT NULL DEFAULT 0,
+    FOREIGN KEY (habit_id) REFERENCES Habit(habit_id) ON DELETE CASCADE
+);
@@ -0,0 +1,9 @@
+-- db/migrations/0004_habit_logs_keyset_index.sql
+-- Replaces the 0001 index with one ordered by (habit_id, completed_at, log_id), the exact
+-- keyset used by the paginated log readers, so pages come straight off the index without
+-- a sort step for logs sharing a timestamp. `missed` stays in the index to keep it covering.
+
+DROP INDEX IF EXISTS idx_habit_logs_habit_completed;
+
+CREATE INDEX IF NOT EXISTS idx_habit_logs_habit_completed_id
+    ON Habit_Logs (habit_id, completed_at, log_id, missed);
@@ -0,0 +1,16 @@
+-- db/migrations/0005_fixture_loads.sql
+-- Bookkeeping for load_fixtures.py. Every fixture file is identified by the SHA-256 of its
+-- content; a 'complete' row makes re-running the same file a single lookup. While a load is
+-- in progress the per-section counters are updated in the same transaction as each chunk of
+-- inserted rows, so an interrupted load resumes right after the last committed chunk.
+
+CREATE TABLE IF NOT EXISTS Fixture_Loads (
+    content_hash TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'loading' CHECK (status IN ('loading', 'complete')),
+    users_loaded INTEGER NOT NULL DEFAULT 0,
+    habits_loaded INTEGER NOT NULL DEFAULT 0,
+    logs_loaded INTEGER NOT NULL DEFAULT 0,
+    started_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    completed_at DATETIME
+);
@@ -0,0 +1,50 @@
+-- db/migrations/0006_data_versions.sql
+-- A per-user counter bumped by triggers whenever one of the user's habits or check-off logs
+-- changes, from any connection or process. The HTTP API derives ETags from it, so a repeat
+-- poll is answered with 304 Not Modified after one primary-key lookup. Users without a row
+-- have never changed since this migration and are at version 0.
+
+CREATE TABLE IF NOT EXISTS Data_Versions (
+    user_id INTEGER PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_habit_logs_insert_version AFTER INSERT ON Habit_Logs
+BEGIN
+    INSERT INTO Data_Versions (user_id, version) VALUES (NEW.user_id, 1)
+        ON CONFLICT (user_id) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_habit_logs_update_version AFTER UPDATE ON Habit_Logs
+BEGIN
+    INSERT INTO Data_Versions (user_id, version) VALUES (OLD.user_id, 1)
+        ON CONFLICT (user_id) DO UPDATE SET version = version + 1;
+    INSERT INTO Data_Versions (user_id, version) VALUES (NEW.user_id, 1)
+        ON CONFLICT (user_id) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_habit_logs_delete_version AFTER DELETE ON Habit_Logs
+BEGIN
+    INSERT INTO Data_Versions (user_id, version) VALUES (OLD.user_id, 1)
+        ON CONFLICT (user_id) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_habit_insert_version AFTER INSERT ON Habit
+BEGIN
+    INSERT INTO Data_Versions (user_id, version) VALUES (NEW.user_id, 1)
+        ON CONFLICT (user_id) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_habit_update_version AFTER UPDATE ON Habit
+BEGIN
+    INSERT INTO Data_Versions (user_id, version) VALUES (OLD.user_id, 1)
+        ON CONFLICT (user_id) DO UPDATE SET version = version + 1;
+    INSERT INTO Data_Versions (user_id, version) VALUES (NEW.user_id, 1)
+        ON CONFLICT (user_id) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_habit_delete_version AFTER DELETE ON Habit
+BEGIN
+    INSERT INTO Data_Versions (user_id, version) VALUES (OLD.user_id, 1)
+        ON CONFLICT (user_id) DO UPDATE SET version = version + 1;
+END;
@@ -0,0 +1,14 @@
+-- db/migrations/0007_sessions.sql
+-- Login sessions issued by services/auth.log_in_with_session. Only the SHA-256 of a token is
+-- stored, so the table is useless to whoever reads it; validating a token is one primary-key
+-- lookup and no password hashing. The user_id index serves "log out everywhere".
+
+CREATE TABLE IF NOT EXISTS Sessions (
+    token_hash TEXT PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    expires_at DATETIME NOT NULL,
+    FOREIGN KEY (user_id) REFERENCES User(user_id) ON DELETE CASCADE
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_sessions_user ON Sessions (user_id);
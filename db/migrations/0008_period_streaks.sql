@@ -0,0 +1,7 @@
+-- db/migrations/0008_period_streaks.sql
+-- Habit_Streaks now counts each habit in its own period: calendar days for daily habits,
+-- ISO weeks for weekly ones. Summaries of weekly habits were counted in days; dropping
+-- them makes the next read or check-off rebuild them from Habit_Logs.
+
+DELETE FROM Habit_Streaks
+WHERE habit_id IN (SELECT habit_id FROM Habit WHERE frequency = 'weekly');
@@ -0,0 +1,14 @@
+-- db/migrations/0009_deadline_watermark.sql
+-- Bookkeeping for record_missed_deadlines: each run evaluates the deadlines that passed after
+-- the previous run's watermark and moves the watermark forward in the same transaction, so
+-- a run only ever looks at new periods. The partial index lets a run visit only the habits
+-- that have a deadline at all.
+
+CREATE TABLE IF NOT EXISTS Job_Watermarks (
+    job TEXT PRIMARY KEY,
+    watermark TEXT NOT NULL,            -- 'YYYY-MM-DD HH:MM:SS', local time like completed_at
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_habit_deadline
+    ON Habit (deadline_time) WHERE deadline_time IS NOT NULL;
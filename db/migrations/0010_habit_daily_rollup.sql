@@ -0,0 +1,55 @@
+-- db/migrations/0010_habit_daily_rollup.sql
+-- One row per habit and calendar day with at least one log: how many completed and how many
+-- missed logs the day has (missed > 0 is the day's missed flag). Calendar views read a
+-- year of a user's habits from here, one row per active day, instead of every raw log.
+-- Triggers keep it current for every write path, bulk loads and the deadline job included;
+-- rows are backfilled below and can be rebuilt with `rebuild-rollup`.
+
+CREATE TABLE IF NOT EXISTS Habit_Daily_Rollup (
+    habit_id INTEGER NOT NULL,
+    day TEXT NOT NULL,                  -- 'YYYY-MM-DD'
+    completions INTEGER NOT NULL DEFAULT 0,
+    missed INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (habit_id, day),
+    FOREIGN KEY (habit_id) REFERENCES Habit(habit_id) ON DELETE CASCADE
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS trg_habit_logs_insert_rollup AFTER INSERT ON Habit_Logs
+WHEN NEW.completed_at IS NOT NULL
+BEGIN
+    INSERT INTO Habit_Daily_Rollup (habit_id, day, completions, missed)
+    VALUES (NEW.habit_id, date(NEW.completed_at), NOT NEW.missed, NEW.missed <> 0)
+        ON CONFLICT (habit_id, day) DO UPDATE
+        SET completions = completions + excluded.completions, missed = missed + excluded.missed;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_habit_logs_delete_rollup AFTER DELETE ON Habit_Logs
+WHEN OLD.completed_at IS NOT NULL
+BEGIN
+    UPDATE Habit_Daily_Rollup
+    SET completions = completions - (NOT OLD.missed), missed = missed - (OLD.missed <> 0)
+    WHERE habit_id = OLD.habit_id AND day = date(OLD.completed_at);
+    DELETE FROM Habit_Daily_Rollup
+    WHERE habit_id = OLD.habit_id AND day = date(OLD.completed_at) AND completions <= 0 AND missed <= 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_habit_logs_update_rollup
+AFTER UPDATE OF habit_id, completed_at, missed ON Habit_Logs
+BEGIN
+    UPDATE Habit_Daily_Rollup
+    SET completions = completions - (NOT OLD.missed), missed = missed - (OLD.missed <> 0)
+    WHERE habit_id = OLD.habit_id AND day = date(OLD.completed_at);
+    DELETE FROM Habit_Daily_Rollup
+    WHERE habit_id = OLD.habit_id AND day = date(OLD.completed_at) AND completions <= 0 AND missed <= 0;
+    INSERT INTO Habit_Daily_Rollup (habit_id, day, completions, missed)
+    SELECT NEW.habit_id, date(NEW.completed_at), NOT NEW.missed, NEW.missed <> 0
+    WHERE NEW.completed_at IS NOT NULL
+        ON CONFLICT (habit_id, day) DO UPDATE
+        SET completions = completions + excluded.completions, missed = missed + excluded.missed;
+END;
+
+INSERT OR REPLACE INTO Habit_Daily_Rollup (habit_id, day, completions, missed)
+SELECT habit_id, date(completed_at), SUM(NOT missed), SUM(missed <> 0)
+FROM Habit_Logs
+WHERE completed_at IS NOT NULL
+GROUP BY habit_id, date(completed_at);
@@ -0,0 +1,24 @@
+# gunicorn settings for the HTTP API, picked up automatically when gunicorn runs from the
+# project root:  gunicorn api.app:app
+import multiprocessing
+import os
+
+bind = os.getenv("API_BIND", "127.0.0.1:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+# Sync workers handle one request at a time on their main thread, which then owns the
+# worker's single pooled connection. With 'gthread', each request thread opens its own.
+worker_class = os.getenv("API_WORKER_CLASS", "sync")
+threads = int(os.getenv("API_THREADS", "1"))
+
+
+def post_fork(server, worker):
+    # Connections opened in the master (e.g. with --preload) belong to it and are ignored by
+    # the pool after fork; open and configure this worker's own before the first request
+    from config import db_config
+    db_config.acquire_connection()
+
+
+def worker_exit(server, worker):
+    # Checkpoint and close this worker's connections cleanly
+    from config import db_config
+    db_config.close_connections()
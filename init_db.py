@@ -1,24 +1,108 @@
 # init_db.py
+import os
+import re
 from config.db_config import get_connection
 
-def initialize_schema():
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SCHEMA_FILE = os.path.join(BASE_DIR, "db", "habits.sql")
+# Ordered migration scripts named like '0001_short_description.sql'
+MIGRATIONS_DIR = os.path.join(BASE_DIR, "db", "migrations")
+_MIGRATION_NAME = re.compile(r"^(\d+)_(\w+)\.sql$")
+
+
+def list_migrations(directory=MIGRATIONS_DIR):
+    """
+    Discover migration scripts in version order.
+    Parameters:
+        directory (str): Folder holding the '<version>_<name>.sql' files.
+    Returns:
+        list[tuple[int, str, str]]: (version, name, path) tuples sorted by version.
+    Raises:
+        ValueError: If two files share the same version number.
     """
-    Initialize the SQLite database using the schema SQL file.
+    migrations = {}
+    for filename in os.listdir(directory):
+        match = _MIGRATION_NAME.match(filename)
+        if not match:
+            continue
+        version = int(match.group(1))
+        if version in migrations:
+            raise ValueError(f"❌ Duplicate migration version {version}: {filename}")
+        migrations[version] = (version, match.group(2), os.path.join(directory, filename))
+    return [migrations[version] for version in sorted(migrations)]
+
+
+def get_schema_version(conn):
+    """
+    Return the highest migration version applied to a database.
     Parameters:
-    file_path (str): Path to the SQL schema file. Defaults to 'db/habits.sql'.
+        conn (sqlite3.Connection): Connection to the database.
+    Returns:
+        int: The current schema version, or 0 if no migration has run yet.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+
+
+def apply_migrations(conn, directory=MIGRATIONS_DIR):
+    """
+    Apply every pending migration to an existing database, in version order.
+    Each migration runs in its own transaction together with its schema_version row,
+    so a failing script leaves the database at the previous version.
+    Parameters:
+        conn (sqlite3.Connection): Connection to the database to upgrade.
+        directory (str): Folder holding the migration scripts.
+    Returns:
+        list[int]: Versions that were applied by this call.
+    """
+    current = get_schema_version(conn)
+    conn.commit()
+    applied = []
+    for version, name, path in list_migrations(directory):
+        if version <= current:
+            continue
+        with open(path, "r") as f:
+            script = f.read()
+        try:
+            # executescript() would autocommit each statement; wrap it in one transaction
+            conn.executescript(
+                f"BEGIN;\n{script}\n;"
+                f"INSERT INTO schema_version (version, name) VALUES ({version}, '{name}');\n"
+                "COMMIT;"
+            )
+        except Exception:
+            conn.rollback()
+            raise
+        applied.append(version)
+    return applied
+
+
+def initialize_schema():
+    """
+    Initialize the SQLite database using the schema SQL file, then bring it up to date
+    by applying any pending migrations from db/migrations.
 
     This function reads the SQL schema from the specified file
-    and executes it against the connected database.
+    and executes it against the connected database. It is safe to run
+    repeatedly against an existing database.
     """
-    with open("db/habits.sql", "r") as f:
+    with open(SCHEMA_FILE, "r") as f:
         schema = f.read()
     conn = get_connection()
     cursor = conn.cursor()
     # Executing here full schema script (CREATE TABLE, etc.)
     cursor.executescript(schema)
     conn.commit()
+    applied = apply_migrations(conn)
+    version = get_schema_version(conn)
     conn.close()
-    print("✅ Database initialized: habits.db")
+    print(f"✅ Database initialized: habits.db (schema version {version}, {len(applied)} migration(s) applied)")
 
 if __name__ == "__main__":
-    initialize_schema()
\ No newline at end of file
+    initialize_schema()
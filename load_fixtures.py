@@ -1,75 +1,237 @@
+import hashlib
 import json
+import os
 from datetime import datetime
-from config.db_config import get_connection
+from itertools import groupby, islice
 
+from config.db_config import db_session
+from repository.storage_manager import rebuild_streak_summaries
 
-def load_fixtures():
+# Fixture files can hold many users with years of logs, so they are never read whole:
+# the top-level object is scanned incrementally and every element of its arrays is decoded
+# on its own. Rows go in with executemany, one transaction per chunk, and each transaction
+# also advances the file's row in Fixture_Loads (migration 0005). A finished file is thus
+# recognized by its content hash alone, and an interrupted load resumes after its last chunk.
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURE_FILE = os.path.join(BASE_DIR, "db", "fixtures.json")
+# Rows committed per transaction
+FIXTURE_CHUNK_SIZE = 5000
+# Characters read from the file at a time
+READ_SIZE = 1 << 16
+
+# Top-level keys holding records, and the table section they load into. 'user' is the
+# single-object form of the original fixture file; everything else (e.g. '__doc__') is ignored.
+SECTIONS = {"user": "users", "users": "users", "habits": "habits", "habit_logs": "habit_logs"}
+_PROGRESS_COLUMNS = {"users": "users_loaded", "habits": "habits_loaded", "habit_logs": "logs_loaded"}
+_INSERTS = {
+    "users": "INSERT INTO User (user_id, username, email, password) VALUES (?, ?, ?, ?)",
+    "habits": """
+        INSERT INTO Habit (habit_id, user_id, name, frequency, description, deadline_time, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """,
+    "habit_logs": """
+        INSERT INTO Habit_Logs (habit_id, user_id, completed_at, note, missed)
+        VALUES (?, ?, ?, ?, ?)
+    """,
+}
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = " \t\r\n"
+_NUMBER_CHARS = "0123456789+-.eE"
+
+
+class _JsonScanner:
+    # Walks a JSON text read from a stream, keeping only the undecoded tail in memory
+
+    def __init__(self, stream, read_size):
+        self._stream = stream
+        self._read_size = read_size
+        self._buffer = ""
+        self._pos = 0
+
+    def _fill(self):
+        chunk = self._stream.read(self._read_size)
+        if not chunk:
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self):
+        # Next non-whitespace character, or "" at the end of the input
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"❌ Invalid fixture file: expected '{char}', found '{found or 'end of file'}'")
+        self._pos += 1
+
+    def _runs_to_end(self, pos):
+        while pos < len(self._buffer) and self._buffer[pos] in _NUMBER_CHARS:
+            pos += 1
+        return pos == len(self._buffer)
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                # Most likely the value continues past the buffer; give up only at the end of the file
+                if self._fill():
+                    continue
+                raise
+            # A number cut by the read boundary ('12' of '12.5') still decodes; read until it ends
+            if isinstance(value, (int, float)) and self._runs_to_end(end) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+
+def iter_fixture_records(stream, read_size=READ_SIZE):
     """
-    Load initial fixture data into the database from a JSON file.
-    This function inserts users, habits, and habit logs from the given fixture file.
-    It checks for duplication by verifying whether the user already exists.
+    Stream the records of a fixture file without loading it into memory.
     Parameters:
-    file_path (str): Path to the fixture JSON file. Defaults to 'db/fixtures.json'.
+        stream (IO[str]): The open fixture file, containing one JSON object.
+        read_size (int): Number of characters read at a time.
+    Yields:
+        tuple[str, Any]: (key, value) for every top-level key. Array values are not yielded
+                         whole; each of their elements is yielded as (key, element) instead.
     Raises:
-    FileNotFoundError: If the JSON fixture file is missing.
-    KeyError: If required keys like 'user', 'habits', or 'habit_logs' are missing.
+        ValueError: If the file is not a JSON object (json.JSONDecodeError for malformed values).
     """
-    # Load fixture data
-    with open("db/fixtures.json", "r") as f:
-        data = json.load(f)
+    scanner = _JsonScanner(stream, read_size)
+    scanner.expect("{")
+    if scanner.peek() == "}":
+        return
+    while True:
+        key = scanner.value()
+        if not isinstance(key, str):
+            raise ValueError(f"❌ Invalid fixture file: expected a key, found {key!r}")
+        scanner.expect(":")
+        if scanner.peek() == "[":
+            scanner.expect("[")
+            if scanner.peek() == "]":
+                scanner.expect("]")
+            else:
+                while True:
+                    yield key, scanner.value()
+                    if scanner.peek() != ",":
+                        break
+                    scanner.expect(",")
+                scanner.expect("]")
+        else:
+            yield key, scanner.value()
+        if scanner.peek() != ",":
+            break
+        scanner.expect(",")
+    scanner.expect("}")
 
-    conn = get_connection()
-    cursor = conn.cursor()
 
-    # Here checking if user already exists
-    cursor.execute("SELECT COUNT(*) FROM User WHERE user_id = ?", (data["user"]["user_id"],))
-    if cursor.fetchone()[0] > 0:
+def _row(section, record):
+    if section == "users":
+        return record["user_id"], record["username"], record["email"], record["password"]
+    if section == "habits":
+        return (record["habit_id"], record["user_id"], record["name"], record["frequency"],
+                record.get("description", ""), record.get("deadline_time"),
+                record.get("created_at") or datetime.now().isoformat(sep=" "))
+    return (record["habit_id"], record["user_id"], record["completed_at"],
+            record.get("note", ""), record.get("missed", 0))
+
+
+def _content_hash(file_path):
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(READ_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _section_rows(file_path, skip):
+    # (section, row) for every record in the file, minus the first skip[section] of each section
+    seen = dict.fromkeys(_PROGRESS_COLUMNS, 0)
+    with open(file_path, "r", encoding="utf-8") as f:
+        for key, record in iter_fixture_records(f):
+            section = SECTIONS.get(key)
+            if section is None:
+                continue
+            seen[section] += 1
+            if seen[section] > skip[section]:
+                yield section, _row(section, record)
+
+
+def load_fixtures(file_path=FIXTURE_FILE, chunk_size=FIXTURE_CHUNK_SIZE, on_chunk=None):
+    """
+    Load users, habits and habit logs from a fixture file into the database.
+    The file is recorded in Fixture_Loads by content hash: a file loaded before is skipped
+    after one lookup, and a load that failed part way continues where it stopped.
+    Parameters:
+        file_path (str): Path to the fixture JSON file. Defaults to db/fixtures.json.
+        chunk_size (int): Number of rows inserted per transaction.
+        on_chunk (Optional[Callable[[str, int], None]]): Called with (section, rows loaded in that
+                                                         section so far) after every commit.
+    Returns:
+        dict[str, int]: Rows inserted by this call per section ('users', 'habits', 'habit_logs').
+    Raises:
+        FileNotFoundError: If the JSON fixture file is missing.
+        KeyError: If a record lacks a required field such as 'user_id'.
+        ValueError: If the file is not a JSON object of fixture sections.
+    """
+    content_hash = _content_hash(file_path)
+    loaded = dict.fromkeys(_PROGRESS_COLUMNS, 0)
+    with db_session() as conn:
+        progress = conn.execute("""
+            SELECT status, users_loaded, habits_loaded, logs_loaded FROM Fixture_Loads WHERE content_hash = ?
+        """, (content_hash,)).fetchone()
+        if progress is None:
+            conn.execute("INSERT INTO Fixture_Loads (content_hash, source) VALUES (?, ?)", (content_hash, file_path))
+    if progress is not None and progress[0] == "complete":
         print("ℹ️ Fixtures already loaded. Skipping.")
-        conn.close()
-        return
+        return loaded
+    skip = dict(zip(_PROGRESS_COLUMNS, progress[1:])) if progress else dict.fromkeys(_PROGRESS_COLUMNS, 0)
+    print("🔁 Resuming fixture load..." if any(skip.values()) else "📦 Loading fixtures...")
+
+    for section, rows in groupby(_section_rows(file_path, skip), key=lambda item: item[0]):
+        rows = (row for _, row in rows)
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            with db_session() as conn:
+                if section == "users" and not any(skip.values()) and not any(loaded.values()):
+                    # Databases seeded before Fixture_Loads existed: the first user tells
+                    if conn.execute("SELECT 1 FROM User WHERE user_id = ?", (chunk[0][0],)).fetchone():
+                        conn.execute("""
+                            UPDATE Fixture_Loads SET status = 'complete', completed_at = CURRENT_TIMESTAMP
+                            WHERE content_hash = ?
+                        """, (content_hash,))
+                        print("ℹ️ Fixtures already loaded. Skipping.")
+                        return loaded
+                conn.executemany(_INSERTS[section], chunk)
+                column = _PROGRESS_COLUMNS[section]
+                conn.execute(f"UPDATE Fixture_Loads SET {column} = {column} + ? WHERE content_hash = ?",
+                             (len(chunk), content_hash))
+            loaded[section] += len(chunk)
+            if on_chunk:
+                on_chunk(section, skip[section] + loaded[section])
+
+    # One set-based pass is cheaper than keeping the summaries current chunk by chunk
+    rebuild_streak_summaries()
+    with db_session() as conn:
+        conn.execute("""
+            UPDATE Fixture_Loads SET status = 'complete', completed_at = CURRENT_TIMESTAMP WHERE content_hash = ?
+        """, (content_hash,))
+    print("✅ Fixtures loaded successfully!")
+    return loaded
+
 
-    print("📦 Loading fixtures...")
-
-    # Inserting user
-    user = data["user"]
-    cursor.execute("""
-        INSERT INTO User (user_id, username, email, password)
-        VALUES (?, ?, ?, ?)
-    """, (
-        user["user_id"],
-        user["username"],
-        user["email"],
-        user["password"]
-    ))
-
-    # Inserting habits
-    for habit in data["habits"]:
-        cursor.execute("""
-            INSERT INTO Habit (habit_id, user_id, name, frequency, description, deadline_time, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (
-            habit["habit_id"],
-            habit["user_id"],
-            habit["name"],
-            habit["frequency"],
-            habit["description"],
-            habit["deadline_time"],
-            datetime.now()
-        ))
-
-    # Inserting logs
-    for log in data["habit_logs"]:
-        cursor.execute("""
-            INSERT INTO Habit_Logs (habit_id, user_id, completed_at, note, missed)
-            VALUES (?, ?, ?, ?, ?)
-        """, (
-            log["habit_id"],
-            log["user_id"],
-            log["completed_at"],
-            log.get("note", ""),
-            log.get("missed", 0)
-        ))
-
-    conn.commit()
-    conn.close()
-    print("✅ Fixtures loaded successfully!")
\ No newline at end of file
+if __name__ == "__main__":
+    load_fixtures()
@@ -1,8 +1,6 @@
 import click
 import time
 import sys
-from cli.commands import cli
-from load_fixtures import load_fixtures
 from services.auth import sign_up, log_in
 from utils.cli_helper import (get_masked_input)
 
@@ -79,6 +77,8 @@ def show_main_menu():
 
 def run_interactive_menu():
     global CURRENT_USER_ID, CURRENT_USERNAME
+    # Imported on first use, so the login prompt shows up without loading every command
+    from cli.commands import cli
 
     while True:
         show_main_menu()
@@ -150,7 +150,7 @@ def start():
     run_interactive_menu()
 
 if __name__ == "__main__":
-    load_fixtures()         # Load fixture data only if not already in DB
+    # Demo data is no longer loaded on every launch; run `python -m cli seed` once instead
     authenticate_user()     # Prompt login or signup
     run_interactive_menu()  # Personalized habit tracking 🎯
     cli_main()
\ No newline at end of file
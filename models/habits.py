@@ -55,11 +55,12 @@ class Habit:
 
     def calculate_streaks(self):
         """
-        Calculate the current streak of consecutive completions for the habit.
+        Return the current streak of consecutive completions for the habit.
+        Reads the incrementally maintained Habit_Streaks summary, so the cost does not
+        depend on how many logs the habit has.
         Returns:
-         int: The number of consecutive completions.
+         int: The number of consecutive periods completed (days for daily habits, ISO weeks for
+              weekly ones), up to the last completion.
         """
-        from repository.storage_manager import load_checkoffs_for_habit
-        from analytics.analytics_module import calculate_streaks
-        logs = load_checkoffs_for_habit(self.habit_id)
-        return calculate_streaks(logs)
\ No newline at end of file
+        from repository.storage_manager import load_streak_summary
+        return load_streak_summary(self.habit_id)["current_streak"]
\ No newline at end of file
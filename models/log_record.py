@@ -0,0 +1,79 @@
+from array import array
+from collections import namedtuple
+
+_LogRecordBase = namedtuple(
+    "_LogRecordBase",
+    ["log_id", "habit_id", "user_id", "completed_at", "note", "missed", "name", "frequency"],
+    defaults=(None, None),
+)
+
+
+class LogRecord(_LogRecordBase):
+    """
+    Compact, read-only check-off log as returned by the storage layer's record readers.
+    A namedtuple (no per-instance __dict__), with completed_at already parsed to a datetime
+    and the repeated habit name/frequency strings interned, so a million logs cost a
+    fraction of the equivalent dicts.
+    It also supports the dict-style access used by the analytics functions
+    (record['habit_id'], record.get('missed')), so both can be passed interchangeably.
+    Attributes:
+        log_id (Optional[int]): ID of the log, or None for a habit without logs in a joined read.
+        habit_id (int): The habit the log belongs to.
+        user_id (int): The user who owns the habit.
+        completed_at (Optional[datetime]): When the habit was checked off.
+        note (Optional[str]): Optional note attached to the log.
+        missed (bool): True if the log records a missed period.
+        name (Optional[str]): Habit name, only filled by joined reads.
+        frequency (Optional[str]): Habit frequency, only filled by joined reads.
+    """
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        return tuple.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        """
+        Dict-style lookup of a field by name.
+        Parameters:
+            key (str): Field name.
+            default: Value returned if the field does not exist.
+        """
+        return getattr(self, key, default)
+
+
+class LogColumns:
+    """
+    Columnar form of many logs: parallel typed arrays instead of one object per log.
+    Each entry costs 8 + 4 + 1 bytes, which suits analytics that only need
+    which habit, which day and whether it was missed.
+    Attributes:
+        habit_ids (array[int]): Habit ID per log ('q', 64-bit).
+        days (array[int]): Completion day per log as days since 1970-01-01 ('i', 32-bit).
+        missed (array[int]): 1 if the log was missed, else 0 ('b').
+    """
+    __slots__ = ("habit_ids", "days", "missed")
+
+    def __init__(self):
+        self.habit_ids = array("q")
+        self.days = array("i")
+        self.missed = array("b")
+
+    def __len__(self):
+        return len(self.habit_ids)
+
+    def append(self, habit_id, day, missed):
+        """
+        Add one log to the columns.
+        Parameters:
+            habit_id (int): The habit ID.
+            day (int): Days since 1970-01-01.
+            missed (int | bool): Missed flag.
+        """
+        self.habit_ids.append(habit_id)
+        self.days.append(day)
+        self.missed.append(1 if missed else 0)
@@ -0,0 +1,130 @@
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from repository import storage_manager
+
+# asyncio front end to storage_manager. Every coroutine runs the very same sync function
+# (and therefore the same SQL) on a worker thread, so the event loop never blocks on SQLite.
+#
+# Reads go to a bounded pool; each worker thread keeps its own pooled connection, so with
+# WAL they run side by side. Writes go through a single writer thread: SQLite allows one
+# writer at a time anyway, and queueing them in-process avoids 'database is locked' retries.
+
+# Maximum number of concurrent read threads (and therefore read connections)
+READ_WORKERS = int(os.getenv("DB_READ_WORKERS", "8"))
+
+_executors = {}
+_executors_lock = threading.Lock()
+
+
+def _executor(kind):
+    # Created on first use, and again after shutdown()
+    with _executors_lock:
+        executor = _executors.get(kind)
+        if executor is None:
+            workers = READ_WORKERS if kind == "read" else 1
+            executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"habit-db-{kind}")
+            _executors[kind] = executor
+        return executor
+
+
+async def run_read(func, *args, **kwargs):
+    """
+    Run a blocking read on the bounded reader pool.
+    Parameters:
+        func (Callable): Sync function to call, e.g. storage_manager.load_all_habits.
+        *args, **kwargs: Arguments passed to func.
+    Returns:
+        The return value of func.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor("read"), functools.partial(func, *args, **kwargs))
+
+
+async def run_write(func, *args, **kwargs):
+    """
+    Queue a blocking write on the single writer thread; writes run one at a time, in order.
+    Parameters:
+        func (Callable): Sync function to call, e.g. storage_manager.save_checkoff.
+        *args, **kwargs: Arguments passed to func.
+    Returns:
+        The return value of func.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor("write"), functools.partial(func, *args, **kwargs))
+
+
+def _reader(func):
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await run_read(func, *args, **kwargs)
+    return wrapper
+
+
+def _writer(func):
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await run_write(func, *args, **kwargs)
+    return wrapper
+
+
+def shutdown(wait=True):
+    """
+    Stop the reader and writer threads. They are started again on the next call.
+    Parameters:
+        wait (bool): Block until queued work has finished.
+    """
+    with _executors_lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=wait)
+
+
+# Reads
+load_all_habits = _reader(storage_manager.load_all_habits)
+load_checkoffs_for_habit = _reader(storage_manager.load_checkoffs_for_habit)
+load_checkoff_records = _reader(storage_manager.load_checkoff_records)
+load_checkoffs_page = _reader(storage_manager.load_checkoffs_page)
+load_user_log_columns = _reader(storage_manager.load_user_log_columns)
+load_streak_summary = _reader(storage_manager.load_streak_summary)
+check_if_missed = _reader(storage_manager.check_if_missed)
+load_daily_rollup = _reader(storage_manager.load_daily_rollup)
+
+# Writes
+save_habit = _writer(storage_manager.save_habit)
+delete_habit = _writer(storage_manager.delete_habit)
+save_checkoff = _writer(storage_manager.save_checkoff)
+save_checkoffs_bulk = _writer(storage_manager.save_checkoffs_bulk)
+delete_checkoff = _writer(storage_manager.delete_checkoff)
+rebuild_streak_summaries = _writer(storage_manager.rebuild_streak_summaries)
+record_missed_deadlines = _writer(storage_manager.record_missed_deadlines)
+rebuild_daily_rollup = _writer(storage_manager.rebuild_daily_rollup)
+
+
+async def iter_checkoffs(habit_id, since=None, until=None, newest_first=False,
+                         page_size=storage_manager.STREAM_CHUNK_SIZE):
+    """
+    Asynchronously stream a habit's check-off logs within an optional time range.
+    Each page is a separate keyset query on the reader pool, so no cursor is held open
+    across awaits and other users' reads interleave between pages.
+    Parameters:
+        habit_id (int): The ID of the habit whose logs are streamed.
+        since (Optional[datetime | date | str]): Inclusive lower bound on completed_at.
+        until (Optional[datetime | date | str]): Exclusive upper bound on completed_at.
+        newest_first (bool): Stream from the most recent log backwards.
+        page_size (int): Number of logs fetched per query.
+    Yields:
+        Dict: Log records, as returned by storage_manager.iter_checkoffs.
+    """
+    after = None
+    while True:
+        logs, after = await load_checkoffs_page(habit_id, limit=page_size, after=after, since=since,
+                                                until=until, newest_first=newest_first)
+        for log in logs:
+            yield log
+        if after is None:
+            return
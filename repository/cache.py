@@ -0,0 +1,106 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    Bounded, thread-safe LRU cache whose entries also expire after a fixed time.
+    Used by the storage layer to avoid re-running identical read queries.
+    Attributes:
+        maxsize (int): Maximum number of entries; the least recently used one is evicted beyond it.
+                       0 disables the cache.
+        ttl (float): Seconds an entry stays valid after it was stored.
+        hits (int): Lookups answered from the cache.
+        misses (int): Lookups that were absent or expired.
+        evictions (int): Entries dropped to respect maxsize.
+        expirations (int): Entries dropped because they outlived ttl.
+        invalidations (int): Entries dropped by invalidate() or clear().
+    """
+
+    def __init__(self, maxsize=256, ttl=30.0, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.expirations = self.invalidations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """
+        Look up a key, refreshing its recency.
+        Parameters:
+            key: The cache key.
+        Returns:
+            tuple[bool, Any]: (True, value) on a hit, (False, None) on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                if self._clock() - stored_at < self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+            return False, None
+
+    def put(self, key, value):
+        """
+        Store a value, evicting the least recently used entries beyond maxsize.
+        Parameters:
+            key: The cache key.
+            value: The value to cache.
+        """
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (self._clock(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key):
+        """
+        Drop one entry, if present.
+        Parameters:
+            key: The cache key.
+        """
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def clear(self):
+        """
+        Drop every entry; the counters are kept.
+        """
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Return the counters needed to size the cache.
+        Returns:
+            dict: size, maxsize, ttl, hits, misses, evictions, expirations,
+                  invalidations and hit_rate (0.0 without lookups).
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
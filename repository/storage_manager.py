@@ -1,31 +1,46 @@
+import os
 import sqlite3
+import sys
 
-from config.db_config import get_connection
-from datetime import datetime
+from config import db_config
+from config.db_config import acquire_connection, db_session
+from datetime import date, datetime
+from itertools import islice
+from models.log_record import LogRecord, LogColumns
+from repository.cache import TTLCache
+
+
+def _parse_log_timestamp(value):
+    # Converter for columns selected as "... [logts]": parses once, at fetch time
+    return datetime.fromisoformat(value.decode())
+
+
+# Only applies where a query opts in via a column alias, e.g. completed_at AS "completed_at [logts]"
+sqlite3.register_converter("logts", _parse_log_timestamp)
 
 
 def save_habit(habit):
     """
     Insert a new habit into the Habit table.
     Parameters:
-        habit (Habit): A Habit object containing all required fields.
+        habit (Habit): A Habit object containing all required fields. Its habit_id is set
+                       to the ID the database assigned.
     """
-    conn = get_connection()
-    cursor = conn.cursor()
-    # Insert the habit data into the Habit table
-    cursor.execute("""
-        INSERT INTO Habit (user_id, name, frequency, description, deadline_time, created_at)
-        VALUES (?, ?, ?, ?, ?, ?)
-    """, (
-        habit.user_id,
-        habit.name,
-        habit.frequency,
-        habit.description,
-        habit.deadline_time,
-        habit.created_at
-    ))
-    conn.commit()
-    conn.close()
+    with db_session() as conn:
+        # Insert the habit data into the Habit table
+        cursor = conn.execute("""
+            INSERT INTO Habit (user_id, name, frequency, description, deadline_time, created_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (
+            habit.user_id,
+            habit.name,
+            habit.frequency,
+            habit.description,
+            habit.deadline_time,
+            habit.created_at
+        ))
+    habit.habit_id = cursor.lastrowid
+    HABIT_CACHE.invalidate((db_config.DB_PATH, habit.user_id))
 
 
 def delete_habit(habit_id):
@@ -33,32 +48,193 @@ def delete_habit(habit_id):
     Delete a habit by its unique habit ID.
     Parameters:
         habit_id (int): The ID of the habit to be deleted.
+    Returns:
+        bool: True if the habit existed.
     """
-    conn = get_connection()
-    cursor = conn.cursor()
-    # Delete the habit row based on habit_id
-    cursor.execute("DELETE FROM Habit WHERE habit_id = ?", (habit_id,))
-    conn.commit()
-    conn.close()
+    with db_session() as conn:
+        owner = conn.execute("SELECT user_id FROM Habit WHERE habit_id = ?", (habit_id,)).fetchone()
+        # Delete the habit row based on habit_id
+        conn.execute("DELETE FROM Habit WHERE habit_id = ?", (habit_id,))
+        conn.execute("DELETE FROM Habit_Streaks WHERE habit_id = ?", (habit_id,))
+        conn.execute("DELETE FROM Habit_Daily_Rollup WHERE habit_id = ?", (habit_id,))
+    if owner:
+        HABIT_CACHE.invalidate((db_config.DB_PATH, owner[0]))
+    return owner is not None
+
+
+# Recent load_all_habits results keyed by (DB_PATH, user_id), each stored with the user's
+# Data_Versions counter (migration 0006) read before the query. Triggers bump that counter on
+# every committed change to the user's habits or logs, from any connection or process, so an
+# entry is only served while its version is still current: writes for other users never evict
+# it, and a list loaded before a concurrent write can be stored but never served afterwards.
+# HABIT_CACHE_SIZE=0 disables caching.
+HABIT_CACHE = TTLCache(
+    maxsize=int(os.getenv("HABIT_CACHE_SIZE", "256")),
+    ttl=float(os.getenv("HABIT_CACHE_TTL", "30")),
+)
 
 
 def load_all_habits(user_id):
     """
     Load all habits associated with a specific user.
+    Results are served from HABIT_CACHE while they are fresh and the user's data version is unchanged.
     Parameters:
         user_id (int): The ID of the user whose habits will be retrieved.
     Returns:
         List[Dict]: A list of habit records as dictionaries.
     """
-    conn = get_connection()
-    # This allows access to row data as dictionaries
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    # Fetch all habits for the given user
-    cursor.execute("SELECT * FROM Habit WHERE user_id = ?", (user_id,))
-    habits = cursor.fetchall()
-    conn.close()
-    return [dict(row) for row in habits]
+    key = (db_config.DB_PATH, user_id)
+    with db_session() as conn:
+        # Read before the habits: a write committed in between makes the entry stale, never wrong
+        row = conn.execute("SELECT version FROM Data_Versions WHERE user_id = ?", (user_id,)).fetchone()
+        version = row[0] if row else 0
+        if HABIT_CACHE.maxsize > 0:
+            hit, entry = HABIT_CACHE.get(key)
+            if hit and entry[0] == version:
+                # Copies, so callers cannot modify the cached rows
+                return [dict(habit) for habit in entry[1]]
+        cursor = conn.cursor()
+        # This allows access to row data as dictionaries (set per cursor, the connection is shared)
+        cursor.row_factory = sqlite3.Row
+        # Fetch all habits for the given user
+        cursor.execute("SELECT * FROM Habit WHERE user_id = ?", (user_id,))
+        habits = [dict(row) for row in cursor.fetchall()]
+        # Rows read inside an open transaction may still be rolled back, so do not cache them
+        cacheable = not conn.in_transaction
+    if cacheable:
+        HABIT_CACHE.put(key, (version, habits))
+    return [dict(habit) for habit in habits]
+
+
+def habit_cache_stats():
+    """
+    Return the hit, miss and eviction counters of the habit list cache.
+    Returns:
+        dict: See TTLCache.stats().
+    """
+    return HABIT_CACHE.stats()
+
+
+# Rows pulled from SQLite per fetchmany() call by the streaming readers
+STREAM_CHUNK_SIZE = 1000
+
+
+def iter_user_logs(user_id, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Stream all of a user's habits joined with their check-off logs in a single query.
+    Rows are ordered by (habit_id, completed_at) and fetched in chunks, so memory stays
+    bounded no matter how long the history is. Habits without any log appear once with
+    log_id, completed_at, note and missed set to None.
+    Parameters:
+        user_id (int): The ID of the user whose habits and logs are streamed.
+        chunk_size (int): Number of rows fetched from SQLite at a time.
+    Yields:
+        Dict: One record per log with habit_id, name, frequency, log_id, user_id,
+              completed_at, note and missed keys.
+    """
+    # Plain read on the pooled connection: no db_session(), so a consumer that writes
+    # while iterating still gets its own commit
+    cursor = acquire_connection().cursor()
+    cursor.row_factory = sqlite3.Row
+    cursor.execute("""
+        SELECT h.habit_id, h.name, h.frequency, h.user_id,
+               l.log_id, l.completed_at, l.note, l.missed
+        FROM Habit h
+        LEFT JOIN Habit_Logs l ON l.habit_id = h.habit_id
+        WHERE h.user_id = ?
+        ORDER BY h.habit_id, l.completed_at
+    """, (user_id,))
+    for row in _stream(cursor, chunk_size):
+        yield dict(row)
+
+
+def _log_record_factory(cursor, row):
+    # Builds LogRecords straight from row tuples; habit names and frequencies repeat
+    # on every row of a habit, so interning makes them share one string object
+    if len(row) == 8 and row[6] is not None:
+        return LogRecord(*row[:6], sys.intern(row[6]), sys.intern(row[7]))
+    return LogRecord(*row)
+
+
+def _stream(cursor, chunk_size):
+    # Yield rows of an executed cursor, fetchmany() chunk by chunk, then release it
+    try:
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                return
+            yield from rows
+    finally:
+        cursor.close()
+
+
+def iter_user_log_records(user_id, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Compact variant of iter_user_logs yielding LogRecord tuples instead of dicts.
+    completed_at is parsed to a datetime by an SQLite converter while fetching, so the
+    analytics never have to parse the same timestamp again.
+    Parameters:
+        user_id (int): The ID of the user whose habits and logs are streamed.
+        chunk_size (int): Number of rows fetched from SQLite at a time.
+    Yields:
+        LogRecord: One record per log, ordered by (habit_id, completed_at). Habits without
+                   logs appear once with log_id None.
+    """
+    cursor = acquire_connection().cursor()
+    cursor.row_factory = _log_record_factory
+    cursor.execute("""
+        SELECT l.log_id, h.habit_id, h.user_id, l.completed_at AS "completed_at [logts]",
+               l.note, l.missed, h.name, h.frequency
+        FROM Habit h
+        LEFT JOIN Habit_Logs l ON l.habit_id = h.habit_id
+        WHERE h.user_id = ?
+        ORDER BY h.habit_id, l.completed_at
+    """, (user_id,))
+    return _stream(cursor, chunk_size)
+
+
+def load_checkoff_records(habit_id):
+    """
+    Compact variant of load_checkoffs_for_habit returning LogRecord tuples.
+    Parameters:
+        habit_id (int): The ID of the habit whose logs are to be loaded.
+    Returns:
+        List[LogRecord]: The habit's logs, most recent first, with parsed completed_at.
+    """
+    cursor = acquire_connection().cursor()
+    cursor.row_factory = _log_record_factory
+    cursor.execute("""
+        SELECT log_id, habit_id, user_id, completed_at AS "completed_at [logts]", note, missed
+        FROM Habit_Logs
+        WHERE habit_id = ?
+        ORDER BY completed_at DESC
+    """, (habit_id,))
+    return list(_stream(cursor, STREAM_CHUNK_SIZE))
+
+
+def load_user_log_columns(user_id, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Load a user's logs in columnar form: parallel arrays of habit_id, epoch day and missed.
+    The day number is computed by SQLite, so no timestamp is parsed in Python at all.
+    Parameters:
+        user_id (int): The ID of the user whose logs are loaded.
+        chunk_size (int): Number of rows fetched from SQLite at a time.
+    Returns:
+        LogColumns: Columns ordered by (habit_id, completed_at).
+    """
+    columns = LogColumns()
+    cursor = acquire_connection().execute("""
+        SELECT l.habit_id,
+               CAST(julianday(date(l.completed_at)) - 2440587.5 AS INTEGER),
+               l.missed
+        FROM Habit h
+        JOIN Habit_Logs l ON l.habit_id = h.habit_id
+        WHERE h.user_id = ? AND l.completed_at IS NOT NULL
+        ORDER BY h.habit_id, l.completed_at
+    """, (user_id,))
+    for habit_id, day, missed in _stream(cursor, chunk_size):
+        columns.append(habit_id, day, missed)
+    return columns
 
 
 def save_checkoff(habit_id, user_id):
@@ -69,38 +245,139 @@ def save_checkoff(habit_id, user_id):
         user_id (int): The ID of the user completing the check-off.
     Note:
         The 'missed' field is defaulted to 0, meaning not missed.
+    The habit's Habit_Streaks row is updated in the same transaction.
     """
-    conn = get_connection()
-    cursor = conn.cursor()
-    # Insert a new check-off log with current timestamp
-    cursor.execute("""
-        INSERT INTO Habit_Logs (habit_id, user_id, completed_at, missed)
-        VALUES (?, ?, ?, 0)
-    """, (habit_id, user_id, datetime.now()))
-    conn.commit()
-    conn.close()
+    completed_at = datetime.now()
+    with db_session() as conn:
+        # Insert a new check-off log with current timestamp
+        conn.execute("""
+            INSERT INTO Habit_Logs (habit_id, user_id, completed_at, missed)
+            VALUES (?, ?, ?, 0)
+        """, (habit_id, user_id, completed_at))
+        # Keep the streak summary in step, inside the same transaction
+        _record_completion(conn, habit_id, completed_at.date())
+
+def save_checkoff_batch(checkoffs):
+    """
+    Log several live check-offs in one transaction, e.g. from the group-commit write buffer.
+    Parameters:
+        checkoffs (list[tuple]): (habit_id, user_id, completed_at) tuples, completed_at being a datetime.
+    Each habit's Habit_Streaks row is updated in the same transaction, as in save_checkoff.
+    """
+    with db_session() as conn:
+        for habit_id, user_id, completed_at in checkoffs:
+            # One row at a time: _record_completion may rebuild from Habit_Logs, which must
+            # not already contain the later check-offs of the batch
+            conn.execute("""
+                INSERT INTO Habit_Logs (habit_id, user_id, completed_at, missed)
+                VALUES (?, ?, ?, 0)
+            """, (habit_id, user_id, completed_at))
+            _record_completion(conn, habit_id, completed_at.date())
+
 
 def load_checkoffs_for_habit(habit_id):
     """
     Load all check-off logs for a specific habit, ordered by completion time.
+    Missed-period markers (missed = 1) are not check-offs and are left out; iter_checkoffs
+    returns both.
     Parameters:
         habit_id (int): The ID of the habit whose logs are to be loaded.
     Returns:
         List[Dict]: A list of log records as dictionaries, ordered by most recent first.
     """
-    conn = get_connection()
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    # Select all logs related to the given habit
-    cursor.execute("""
-        SELECT * FROM Habit_Logs
-        WHERE habit_id = ?
-        ORDER BY completed_at DESC
-    """, (habit_id,))
-    logs = cursor.fetchall()
-    conn.close()
+    with db_session() as conn:
+        cursor = conn.cursor()
+        cursor.row_factory = sqlite3.Row
+        # Select the completed logs of the given habit
+        cursor.execute("""
+            SELECT * FROM Habit_Logs
+            WHERE habit_id = ? AND missed = 0
+            ORDER BY completed_at DESC
+        """, (habit_id,))
+        logs = cursor.fetchall()
     return [dict(row) for row in logs]
 
+def _time_bound(value):
+    # completed_at is stored as 'YYYY-MM-DD HH:MM:SS[.ffffff]' text, so bounds compare as text
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+
+def _checkoff_range_query(habit_id, since, until, after, newest_first):
+    # Builds the bounded, keyset-ordered log query shared by iter_checkoffs and load_checkoffs_page
+    clauses, params = ["habit_id = ?"], [habit_id]
+    if since is not None:
+        clauses.append("completed_at >= ?")
+        params.append(_time_bound(since))
+    if until is not None:
+        clauses.append("completed_at < ?")
+        params.append(_time_bound(until))
+    if after is not None:
+        # Row-value comparison on the (completed_at, log_id) keyset; the index is ordered the same way
+        clauses.append("(completed_at, log_id) < (?, ?)" if newest_first else "(completed_at, log_id) > (?, ?)")
+        params.extend((_time_bound(after[0]), after[1]))
+    direction = "DESC" if newest_first else "ASC"
+    sql = f"""
+        SELECT log_id, habit_id, user_id, completed_at, note, missed
+        FROM Habit_Logs
+        WHERE {" AND ".join(clauses)}
+        ORDER BY completed_at {direction}, log_id {direction}
+    """
+    return sql, params
+
+
+def iter_checkoffs(habit_id, since=None, until=None, after=None, newest_first=False,
+                   chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Stream a habit's check-off logs within an optional time range, chunk by chunk.
+    Parameters:
+        habit_id (int): The ID of the habit whose logs are streamed.
+        since (Optional[datetime | date | str]): Inclusive lower bound on completed_at.
+        until (Optional[datetime | date | str]): Exclusive upper bound on completed_at.
+        after (Optional[tuple]): Keyset position (completed_at, log_id); only logs strictly
+                                 after it in the chosen order are returned.
+        newest_first (bool): Order by (completed_at, log_id) descending instead of ascending.
+        chunk_size (int): Number of rows fetched from SQLite at a time.
+    Yields:
+        Dict: Log records with log_id, habit_id, user_id, completed_at, note and missed keys.
+    """
+    sql, params = _checkoff_range_query(habit_id, since, until, after, newest_first)
+    cursor = acquire_connection().cursor()
+    cursor.row_factory = sqlite3.Row
+    cursor.execute(sql, params)
+    for row in _stream(cursor, chunk_size):
+        yield dict(row)
+
+
+def load_checkoffs_page(habit_id, limit=50, after=None, since=None, until=None, newest_first=True):
+    """
+    Load one page of a habit's check-off logs using keyset pagination.
+    Unlike OFFSET paging, every page costs the same no matter how deep into the history it is.
+    Parameters:
+        habit_id (int): The ID of the habit whose logs are loaded.
+        limit (int): Maximum number of logs on the page.
+        after (Optional[tuple]): The next_cursor returned with the previous page.
+        since (Optional[datetime | date | str]): Inclusive lower bound on completed_at.
+        until (Optional[datetime | date | str]): Exclusive upper bound on completed_at.
+        newest_first (bool): Page from the most recent log backwards (default) or forwards.
+    Returns:
+        Tuple[List[Dict], Optional[tuple]]: The logs, and the (completed_at, log_id) cursor of
+                                            the next page, or None if this was the last page.
+    """
+    sql, params = _checkoff_range_query(habit_id, since, until, after, newest_first)
+    cursor = acquire_connection().cursor()
+    cursor.row_factory = sqlite3.Row
+    # One extra row tells whether another page exists without a second query
+    rows = cursor.execute(sql + " LIMIT ?", params + [limit + 1]).fetchall()
+    cursor.close()
+    logs = [dict(row) for row in rows[:limit]]
+    next_cursor = (logs[-1]["completed_at"], logs[-1]["log_id"]) if len(rows) > limit else None
+    return logs, next_cursor
+
+
 def check_if_missed(habit_id, deadline_time):
     """
     Check if a habit was missed by comparing the last check-off time with the deadline.
@@ -112,23 +389,370 @@ def check_if_missed(habit_id, deadline_time):
         :param habit_id:
         :param deadline_time:
     """
-    conn = get_connection()
-    cursor = conn.cursor()
-    # Fetch the most recent check-off timestamp
-    cursor.execute("""
-        SELECT completed_at FROM Habit_Logs
-        WHERE habit_id = ?
-        ORDER BY completed_at DESC
-        LIMIT 1
-    """, (habit_id,))
-    result = cursor.fetchone()
-    conn.close()
+    with db_session() as conn:
+        # Fetch the most recent check-off timestamp, parsed by the logts converter; a missed
+        # marker recorded at a deadline is not a check-off
+        result = conn.execute("""
+            SELECT completed_at AS "completed_at [logts]" FROM Habit_Logs
+            WHERE habit_id = ? AND missed = 0
+            ORDER BY completed_at DESC
+            LIMIT 1
+        """, (habit_id,)).fetchone()
 
     if not result:
         # No check-offs recorded → missed
         return True
 
-    last_check_time = datetime.strptime(result[0], "%Y-%m-%d %H:%M:%S")
+    last_check_time = result[0]
 
     # Missed if the last check-off was *after* the deadline
-    return last_check_time > deadline_time
\ No newline at end of file
+    return last_check_time > deadline_time
+
+
+# Deadlines recur once per period: a habit's deadline_time is its first due time, and every
+# day (or week, for weekly habits) after it is due again. A period is missed when no completed
+# log falls in the period that ends at its deadline. All habits are evaluated by one
+# INSERT ... SELECT. Each habit's window starts at the later of the previous run's watermark
+# and the habit's creation (periods before a habit existed are not missed), and the recursive
+# `deadlines` CTE walks only that habit's deadlines inside its window, so a run costs one row
+# per habit and new period rather than every habit times every day since the oldest deadline.
+# The NOT EXISTS probes use idx_habit_logs_habit_completed; the second one makes re-evaluating
+# a period a no-op, so a run repeated after a crash cannot double count.
+_MISSED_DEADLINES = """
+    INSERT INTO Habit_Logs (habit_id, user_id, completed_at, note, missed)
+    WITH RECURSIVE due AS (
+        SELECT habit_id, user_id, first_deadline, step, window_start,
+               -- Index of the last deadline at or before window_start (truncating is flooring here: never negative)
+               CASE WHEN window_start <= first_deadline THEN 0
+                    ELSE CAST((julianday(window_start) - julianday(first_deadline)) / step AS INTEGER)
+               END AS first_k
+        FROM (
+            SELECT habit_id, user_id, datetime(deadline_time) AS first_deadline,
+                   CASE WHEN frequency = 'weekly' THEN 7 ELSE 1 END AS step,
+                   MAX(COALESCE(:since, ''), COALESCE(datetime(created_at), '')) AS window_start
+            FROM Habit
+            WHERE deadline_time IS NOT NULL AND deadline_time <= :until
+        )
+    ),
+    deadlines(habit_id, user_id, step, window_start, deadline) AS (
+        SELECT habit_id, user_id, step, window_start,
+               datetime(first_deadline, printf('+%d days', first_k * step))
+        FROM due
+        UNION ALL
+        SELECT habit_id, user_id, step, window_start, datetime(deadline, printf('+%d days', step))
+        FROM deadlines
+        WHERE datetime(deadline, printf('+%d days', step)) <= :until
+    )
+    SELECT habit_id, user_id, deadline, 'Missed deadline', 1
+    FROM deadlines d
+    WHERE d.deadline > d.window_start AND d.deadline <= :until
+      AND NOT EXISTS (
+          SELECT 1 FROM Habit_Logs l
+          WHERE l.habit_id = d.habit_id AND NOT l.missed
+            AND l.completed_at > datetime(d.deadline, printf('-%d days', d.step))
+            AND l.completed_at <= d.deadline
+      )
+      AND NOT EXISTS (
+          SELECT 1 FROM Habit_Logs l
+          WHERE l.habit_id = d.habit_id AND l.completed_at = d.deadline AND l.missed
+      )
+"""
+
+
+def record_missed_deadlines(until=None):
+    """
+    Record a missed log for every period whose deadline passed without a completion.
+    Only deadlines after the previous run's watermark (and after each habit's creation) are
+    evaluated, all habits at once, and the watermark advances in the same transaction. Run it from cron.
+    Parameters:
+        until (Optional[datetime | str]): Evaluate deadlines up to this time. Defaults to now.
+    Returns:
+        Dict: 'missed' (number of missed logs recorded), 'since' (the previous watermark,
+              None on the first run) and 'until' (the new watermark).
+    """
+    if isinstance(until, str):
+        until = datetime.fromisoformat(until)
+    until = (until or datetime.now()).strftime("%Y-%m-%d %H:%M:%S")
+    with db_session() as conn:
+        row = conn.execute("SELECT watermark FROM Job_Watermarks WHERE job = 'missed_deadlines'").fetchone()
+        since = row[0] if row else None
+        if since is not None and since >= until:
+            return {"missed": 0, "since": since, "until": since}
+        missed = conn.execute(_MISSED_DEADLINES, {"since": since, "until": until}).rowcount
+        conn.execute("""
+            INSERT INTO Job_Watermarks (job, watermark) VALUES ('missed_deadlines', ?)
+            ON CONFLICT(job) DO UPDATE SET watermark = excluded.watermark, updated_at = CURRENT_TIMESTAMP
+        """, (until,))
+    return {"missed": missed, "since": since, "until": until}
+
+# Rows per transaction for bulk writes; large enough to amortize the commit fsync,
+# small enough that a failed chunk is cheap to retry
+BULK_CHUNK_SIZE = 5000
+
+
+def _chunked(iterable, size):
+    # Yield lists of up to `size` items without materializing the whole iterable
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def save_checkoffs_bulk(records, chunk_size=BULK_CHUNK_SIZE, on_chunk=None):
+    """
+    Insert many check-off logs with executemany, one transaction per chunk.
+    Parameters:
+        records (Iterable[tuple]): (habit_id, user_id, completed_at, note, missed) tuples.
+                                   Consumed lazily, so generators keep memory constant.
+        chunk_size (int): Number of rows committed per transaction. The streak summary of
+                          every habit touched by any chunk is rebuilt once, after the last
+                          one (or after the last committed one, if the import fails).
+        on_chunk (Optional[Callable[[int], None]]): Called with the running total after each commit.
+    Returns:
+        int: The number of inserted rows.
+    """
+    total = 0
+    touched = set()
+    try:
+        for chunk in _chunked(records, chunk_size):
+            with db_session() as conn:
+                conn.executemany("""
+                    INSERT INTO Habit_Logs (habit_id, user_id, completed_at, note, missed)
+                    VALUES (?, ?, ?, ?, ?)
+                """, chunk)
+            touched.update(record[0] for record in chunk)
+            total += len(chunk)
+            if on_chunk:
+                on_chunk(total)
+    finally:
+        # Backfilled rows can land anywhere in a habit's history, so rebuild those habits,
+        # each once however many chunks it appeared in
+        if touched:
+            with db_session() as conn:
+                for habit_id in touched:
+                    _rebuild_streaks(conn, habit_id)
+    return total
+
+
+def delete_checkoff(log_id):
+    """
+    Delete a single check-off log and bring its habit's streak summary up to date.
+    Parameters:
+        log_id (int): The ID of the log entry to delete.
+    Returns:
+        bool: True if a log was deleted, False if it did not exist.
+    """
+    with db_session() as conn:
+        row = conn.execute("SELECT habit_id FROM Habit_Logs WHERE log_id = ?", (log_id,)).fetchone()
+        if row is None:
+            return False
+        conn.execute("DELETE FROM Habit_Logs WHERE log_id = ?", (log_id,))
+        _rebuild_streaks(conn, row[0])
+    return True
+
+
+# Recomputes Habit_Streaks rows from Habit_Logs with a gaps-and-islands query over the
+# distinct completion periods: consecutive periods share the same (period - ROW_NUMBER())
+# value. Periods are Julian day numbers for daily habits and JDN / 7 (JDN 0 was a Monday,
+# so ISO weeks) for weekly ones; date(day - 0.5) turns a day back into 'YYYY-MM-DD'.
+_REBUILD_STREAKS = """
+    WITH days AS (
+        SELECT l.habit_id, h.frequency = 'weekly' AS weekly,
+               CAST(julianday(date(l.completed_at)) + 0.5 AS INTEGER) AS day
+        FROM Habit_Logs l
+        JOIN Habit h ON h.habit_id = l.habit_id
+        WHERE {where} AND NOT l.missed AND l.completed_at IS NOT NULL
+    ),
+    periods AS (
+        SELECT habit_id, CASE WHEN weekly THEN day / 7 ELSE day END AS period, MAX(day) AS last_day
+        FROM days
+        GROUP BY habit_id, period
+    ),
+    runs AS (
+        SELECT habit_id, COUNT(*) AS run, MAX(last_day) AS last_day
+        FROM (
+            SELECT habit_id, period, last_day,
+                   period - ROW_NUMBER() OVER (PARTITION BY habit_id ORDER BY period) AS island
+            FROM periods
+        )
+        GROUP BY habit_id, island
+    ),
+    summary AS (
+        SELECT habit_id, MAX(run) AS longest_streak, MAX(last_day) AS last_day
+        FROM runs
+        GROUP BY habit_id
+    ),
+    totals AS (
+        SELECT l.habit_id, COUNT(*) AS total_completions
+        FROM Habit_Logs l
+        WHERE {where} AND NOT l.missed AND l.completed_at IS NOT NULL
+        GROUP BY l.habit_id
+    )
+    INSERT OR REPLACE INTO Habit_Streaks
+        (habit_id, current_streak, longest_streak, last_completed_day, total_completions)
+    SELECT h.habit_id,
+           COALESCE(r.run, 0),
+           COALESCE(s.longest_streak, 0),
+           date(s.last_day - 0.5),
+           COALESCE(t.total_completions, 0)
+    FROM Habit h
+    LEFT JOIN summary s ON s.habit_id = h.habit_id
+    LEFT JOIN runs r ON r.habit_id = h.habit_id AND r.last_day = s.last_day
+    LEFT JOIN totals t ON t.habit_id = h.habit_id
+    WHERE {habit_where}
+"""
+
+
+def _rebuild_streaks(conn, habit_id=None):
+    # Recompute the summary of one habit, or of every habit when habit_id is None
+    if habit_id is None:
+        conn.execute("DELETE FROM Habit_Streaks")
+        conn.execute(_REBUILD_STREAKS.format(where="1", habit_where="1"))
+    else:
+        conn.execute(
+            _REBUILD_STREAKS.format(where="l.habit_id = :habit_id", habit_where="h.habit_id = :habit_id"),
+            {"habit_id": habit_id},
+        )
+
+
+def _period(day, frequency):
+    # Consecutive periods get consecutive numbers: day ordinals, or ISO weeks for weekly habits
+    return (day.toordinal() - 1) // 7 if frequency == "weekly" else day.toordinal()
+
+
+def _record_completion(conn, habit_id, day):
+    # O(1) update for the common case of a check-off on or after the last completed day;
+    # older (late or backfilled) days and missing summaries fall back to a rebuild
+    row = conn.execute("""
+        SELECT s.current_streak, s.longest_streak, s.last_completed_day, s.total_completions, h.frequency
+        FROM Habit_Streaks s
+        JOIN Habit h ON h.habit_id = s.habit_id
+        WHERE s.habit_id = ?
+    """, (habit_id,)).fetchone()
+    if row is None:
+        _rebuild_streaks(conn, habit_id)
+        return
+    current, longest, last_day, total, frequency = row
+    last_day = date.fromisoformat(last_day) if last_day else None
+    if last_day is not None and day < last_day:
+        _rebuild_streaks(conn, habit_id)
+        return
+    if last_day is None or _period(day, frequency) > _period(last_day, frequency):
+        continues = last_day is not None and _period(day, frequency) - _period(last_day, frequency) == 1
+        current = current + 1 if continues else 1
+        longest = max(longest, current)
+    last_day = day
+    conn.execute("""
+        UPDATE Habit_Streaks
+        SET current_streak = ?, longest_streak = ?, last_completed_day = ?, total_completions = ?
+        WHERE habit_id = ?
+    """, (current, longest, last_day.isoformat(), total + 1, habit_id))
+
+
+def load_streak_summary(habit_id):
+    """
+    Load a habit's streak summary in O(1), building it from the logs if it does not exist yet.
+    Parameters:
+        habit_id (int): The ID of the habit.
+    Returns:
+        Dict: current_streak, longest_streak, last_completed_day ('YYYY-MM-DD' or None)
+              and total_completions. Streaks count consecutive calendar days, or ISO weeks
+              for weekly habits.
+    """
+    query = "SELECT * FROM Habit_Streaks WHERE habit_id = ?"
+    with db_session() as conn:
+        cursor = conn.cursor()
+        cursor.row_factory = sqlite3.Row
+        row = cursor.execute(query, (habit_id,)).fetchone()
+        if row is None:
+            _rebuild_streaks(conn, habit_id)
+            row = cursor.execute(query, (habit_id,)).fetchone()
+    if row is None:
+        # Unknown habit: nothing to summarize
+        return {"habit_id": habit_id, "current_streak": 0, "longest_streak": 0,
+                "last_completed_day": None, "total_completions": 0}
+    return dict(row)
+
+
+def load_data_version(user_id):
+    """
+    Load the change counter of a user's habits and logs (maintained by triggers, migration 0006).
+    Parameters:
+        user_id (int): The ID of the user.
+    Returns:
+        int: A number that grows with every committed change to the user's data; 0 if none yet.
+    """
+    with db_session() as conn:
+        row = conn.execute("SELECT version FROM Data_Versions WHERE user_id = ?", (user_id,)).fetchone()
+    return row[0] if row else 0
+
+
+def load_habit_version(habit_id):
+    """
+    Load the owner of a habit together with the owner's data version.
+    Parameters:
+        habit_id (int): The ID of the habit.
+    Returns:
+        Optional[tuple[int, int]]: (user_id, version), or None if the habit does not exist.
+    """
+    with db_session() as conn:
+        return conn.execute("""
+            SELECT h.user_id, COALESCE(v.version, 0)
+            FROM Habit h
+            LEFT JOIN Data_Versions v ON v.user_id = h.user_id
+            WHERE h.habit_id = ?
+        """, (habit_id,)).fetchone()
+
+
+def load_daily_rollup(user_id, start, end):
+    """
+    Load the per-day completion counts of all of a user's habits within a date range.
+    Reads Habit_Daily_Rollup (migration 0010), so the cost grows with the number of active
+    days in the range, not with the number of logs.
+    Parameters:
+        user_id (int): The ID of the user.
+        start (date | str): First day of the range.
+        end (date | str): Last day of the range (inclusive).
+    Returns:
+        List[tuple]: (habit_id, day, completions, missed) rows ordered by habit and day,
+                     day being 'YYYY-MM-DD'. Days without any log have no row.
+    """
+    with db_session() as conn:
+        return conn.execute("""
+            SELECT r.habit_id, r.day, r.completions, r.missed
+            FROM Habit h
+            JOIN Habit_Daily_Rollup r ON r.habit_id = h.habit_id
+            WHERE h.user_id = ? AND r.day BETWEEN ? AND ?
+            ORDER BY r.habit_id, r.day
+        """, (user_id, str(start), str(end))).fetchall()
+
+
+def rebuild_daily_rollup():
+    """
+    Recompute the Habit_Daily_Rollup table from Habit_Logs, e.g. after editing logs by hand
+    with the triggers dropped or restoring a backup.
+    Returns:
+        int: The number of (habit, day) rows written.
+    """
+    with db_session() as conn:
+        conn.execute("DELETE FROM Habit_Daily_Rollup")
+        return conn.execute("""
+            INSERT INTO Habit_Daily_Rollup (habit_id, day, completions, missed)
+            SELECT habit_id, date(completed_at), SUM(NOT missed), SUM(missed <> 0)
+            FROM Habit_Logs
+            WHERE completed_at IS NOT NULL
+            GROUP BY habit_id, date(completed_at)
+        """).rowcount
+
+
+def rebuild_streak_summaries():
+    """
+    Recompute the Habit_Streaks table for every habit from Habit_Logs.
+    Returns:
+        int: The number of habits summarized.
+    """
+    with db_session() as conn:
+        _rebuild_streaks(conn)
+        return conn.execute("SELECT COUNT(*) FROM Habit_Streaks").fetchone()[0]
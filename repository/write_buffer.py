@@ -0,0 +1,200 @@
+import atexit
+import os
+import threading
+import time
+from concurrent.futures import Future, wait
+from datetime import datetime
+
+from config.db_config import acquire_connection
+from repository.storage_manager import save_checkoff_batch
+
+# Opt-in group commit for check-offs. Instead of one transaction (and one fsync) per
+# save_checkoff, incoming check-offs are queued and a background thread writes them in
+# one transaction once max_batch are waiting or the oldest has waited max_delay seconds.
+#
+# The trade-off: a larger max_delay means fewer, bigger commits (more throughput) but a
+# longer window in which an acknowledged-but-unflushed check-off lives only in memory.
+# Callers that must not lose a write wait on the Future returned by submit().
+#
+# Every batch is written by the flusher thread on its own pooled connection, flush() and
+# close() included. A batch written from a caller's thread could land inside the caller's
+# open db_session, whose later rollback would undo check-offs already reported as committed.
+
+# Defaults for start_checkoff_buffer(), overridable from the environment
+BUFFER_MAX_BATCH = int(os.getenv("CHECKOFF_BUFFER_MAX_BATCH", "500"))
+BUFFER_MAX_DELAY = float(os.getenv("CHECKOFF_BUFFER_MAX_DELAY_MS", "20")) / 1000
+
+
+class CheckoffBuffer:
+    """
+    Batches check-offs from any number of threads into group commits.
+    Attributes:
+        max_batch (int): Flush as soon as this many check-offs are queued.
+        max_delay (float): Flush when the oldest queued check-off has waited this many seconds.
+        synchronous (Optional[str]): PRAGMA synchronous used for the flushes, e.g. 'FULL' to fsync
+                                     every group commit even in WAL mode. None keeps the profile's.
+        batches (int): Number of transactions written so far.
+        written (int): Number of check-offs written so far.
+    """
+
+    def __init__(self, max_batch=BUFFER_MAX_BATCH, max_delay=BUFFER_MAX_DELAY, synchronous="FULL"):
+        if max_batch < 1 or max_delay < 0:
+            raise ValueError("❌ max_batch must be at least 1 and max_delay must not be negative")
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.synchronous = synchronous
+        self.batches = 0
+        self.written = 0
+        # (habit_id, user_id, completed_at, future) waiting for the next flush
+        self._pending = []
+        self._oldest = None
+        self._closed = False
+        # Set by flush() to make the flusher write the queue without waiting for a threshold
+        self._flush_requested = False
+        self._condition = threading.Condition()
+        self._flusher = threading.Thread(target=self._run, name="habit-db-group-commit", daemon=True)
+        self._flusher.start()
+
+    def submit(self, habit_id, user_id, completed_at=None):
+        """
+        Queue a check-off. The completion time is taken now, not when it is flushed.
+        Parameters:
+            habit_id (int): The ID of the habit being checked off.
+            user_id (int): The ID of the user completing the check-off.
+            completed_at (Optional[datetime]): Completion time. Defaults to now.
+        Returns:
+            Future: Resolves to None once the check-off is committed, or raises the write error.
+        Raises:
+            RuntimeError: If the buffer was closed.
+        """
+        future = Future()
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("❌ The check-off buffer is closed")
+            if not self._pending:
+                self._oldest = time.monotonic()
+            self._pending.append((habit_id, user_id, completed_at or datetime.now(), future))
+            # Wake the flusher for a full batch, or to start the max_delay timer of a new one
+            if len(self._pending) >= self.max_batch or len(self._pending) == 1:
+                self._condition.notify()
+        return future
+
+    def flush(self):
+        """
+        Have the flusher thread write everything queued so far, and wait for it to commit.
+        Safe to call inside an open db_session: the write never joins the caller's transaction.
+        Returns:
+            int: Number of check-offs written.
+        """
+        with self._condition:
+            futures = [future for *_, future in self._pending]
+            if not futures:
+                return 0
+            self._flush_requested = True
+            self._condition.notify()
+        wait(futures)
+        return sum(1 for future in futures if future.exception() is None)
+
+    def close(self):
+        """
+        Stop accepting check-offs, write the remaining ones and stop the flusher thread.
+        Safe to call more than once; also run automatically at interpreter exit.
+        """
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify()
+        # The flusher writes what is still queued before it exits
+        self._flusher.join()
+
+    def _take(self):
+        batch, self._pending, self._oldest = self._pending, [], None
+        return batch
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._closed and not self._flush_requested:
+                    if len(self._pending) >= self.max_batch:
+                        break
+                    if self._pending:
+                        remaining = self._oldest + self.max_delay - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._condition.wait(remaining)
+                    else:
+                        self._condition.wait()
+                self._flush_requested = False
+                closed = self._closed
+                batch = self._take()
+            self._write(batch)
+            if closed:
+                return
+
+    def _write(self, batch):
+        if not batch:
+            return 0
+        conn = acquire_connection()
+        previous = conn.execute("PRAGMA synchronous").fetchone()[0]
+        try:
+            if self.synchronous:
+                conn.execute(f"PRAGMA synchronous = {self.synchronous}")
+            save_checkoff_batch([(habit_id, user_id, completed_at) for habit_id, user_id, completed_at, _ in batch])
+        except Exception as e:
+            for *_, future in batch:
+                future.set_exception(e)
+            return 0
+        finally:
+            # Leave the flusher's pooled connection with the profile's setting
+            conn.execute(f"PRAGMA synchronous = {previous}")
+        self.batches += 1
+        self.written += len(batch)
+        for *_, future in batch:
+            future.set_result(None)
+        return len(batch)
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def start_checkoff_buffer(max_batch=BUFFER_MAX_BATCH, max_delay=BUFFER_MAX_DELAY, synchronous="FULL"):
+    """
+    Turn on group commit for check-offs made through habit_service.checkoff_habit.
+    Parameters:
+        max_batch (int): Size threshold of a group commit.
+        max_delay (float): Time threshold in seconds, i.e. the longest durability window.
+        synchronous (Optional[str]): PRAGMA synchronous for the flushes ('FULL', 'NORMAL', ... or None).
+    Returns:
+        CheckoffBuffer: The active buffer. Calling this again returns the running one.
+    """
+    global _buffer
+    with _buffer_lock:
+        if _buffer is None:
+            _buffer = CheckoffBuffer(max_batch, max_delay, synchronous)
+        return _buffer
+
+
+def get_checkoff_buffer():
+    """
+    Return the active check-off buffer.
+    Returns:
+        Optional[CheckoffBuffer]: The buffer, or None while group commit is off (the default).
+    """
+    return _buffer
+
+
+def stop_checkoff_buffer():
+    """
+    Flush and stop the active check-off buffer; check-offs go back to one commit each.
+    """
+    global _buffer
+    with _buffer_lock:
+        buffer, _buffer = _buffer, None
+    if buffer is not None:
+        buffer.close()
+
+
+# Registered after db_config's close_connections, so it runs before the pool is closed
+atexit.register(stop_checkoff_buffer)
@@ -0,0 +1,139 @@
+import asyncio
+
+from repository.async_storage import run_read, run_write
+from services import habit_service
+
+# Coroutine versions of services/habit_service.py for event-loop based front ends.
+# Each one runs the sync service function on the async_storage reader pool or writer
+# thread, so both APIs share the same logic and SQL.
+
+
+async def create_habit(user_id, name, frequency, description, deadline_time):
+    """
+    Create a new Habit instance and persist it to the database.
+    Parameters:
+        user_id (int): The ID of the user who owns the habit.
+        name (str): Name of the habit.
+        frequency (str): Frequency of the habit ('daily' or 'weekly').
+        description (str): A brief description of the habit.
+        deadline_time (datetime): The deadline by which the habit should be completed.
+    Returns:
+        Habit: The newly created Habit instance.
+    """
+    return await run_write(habit_service.create_habit, user_id, name, frequency, description, deadline_time)
+
+
+async def remove_habit(habit_id):
+    """
+    Delete a habit from the database by its ID.
+    Parameters:
+        habit_id (int): The ID of the habit to delete.
+    Returns:
+        bool: True if the habit existed.
+    """
+    return await run_write(habit_service.remove_habit, habit_id)
+
+
+async def get_user_habits(user_id):
+    """
+    Retrieve all habits associated with a specific user.
+    Parameters:
+        user_id (int): The ID of the user whose habits will be retrieved.
+    Returns:
+        List[Dict]: A list of habit dictionaries.
+    """
+    return await run_read(habit_service.get_user_habits, user_id)
+
+
+async def checkoff_habit(habit_id, user_id):
+    """
+    Record a check-off entry for a specific habit and user.
+    Parameters:
+        habit_id (int): The ID of the habit to be checked off.
+        user_id (int): The ID of the user performing the check-off.
+    Returns once the check-off is committed, also while group commit is on.
+    Raises:
+        Exception: The write error of the group commit the check-off was part of.
+    """
+    future = await run_write(habit_service.checkoff_habit, habit_id, user_id)
+    # Under group commit the service only queued the check-off
+    if future is not None:
+        await asyncio.wrap_future(future)
+
+
+async def checkoff_habits_bulk(records, chunk_size=habit_service.BULK_CHUNK_SIZE):
+    """
+    Record many check-off entries at once, e.g. when backfilling history.
+    Parameters:
+        records (Iterable[tuple]): (habit_id, user_id, completed_at, note, missed) tuples.
+        chunk_size (int): Number of rows written per transaction.
+    Returns:
+        int: The number of check-offs recorded.
+    """
+    return await run_write(habit_service.checkoff_habits_bulk, records, chunk_size=chunk_size)
+
+
+async def remove_checkoff(log_id):
+    """
+    Delete a single check-off log.
+    Parameters:
+        log_id (int): The ID of the log entry to delete.
+    Returns:
+        bool: True if the log existed and was deleted.
+    """
+    return await run_write(habit_service.remove_checkoff, log_id)
+
+
+async def get_streak_summary(habit_id):
+    """
+    Retrieve the current and longest streak of a habit without scanning its logs.
+    Parameters:
+        habit_id (int): The ID of the habit.
+    Returns:
+        Dict: current_streak, longest_streak, last_completed_day and total_completions.
+    """
+    return await run_read(habit_service.get_streak_summary, habit_id)
+
+
+async def get_checkoffs(habit_id, since=None, until=None):
+    """
+    Retrieve the check-off logs for a given habit, most recent first.
+    Parameters:
+        habit_id (int): The ID of the habit whose logs are requested.
+        since (Optional[datetime | date | str]): Only logs completed at or after this time.
+        until (Optional[datetime | date | str]): Only logs completed before this time.
+    Returns:
+        List[Dict]: A list of check-off log entries as dictionaries.
+    """
+    return await run_read(habit_service.get_checkoffs, habit_id, since=since, until=until)
+
+
+async def get_checkoffs_page(habit_id, limit=50, after=None, since=None, until=None):
+    """
+    Retrieve one page of a habit's check-off logs, most recent first.
+    Parameters:
+        habit_id (int): The ID of the habit whose logs are requested.
+        limit (int): Maximum number of logs on the page.
+        after (Optional[tuple]): Cursor returned with the previous page.
+        since (Optional[datetime | date | str]): Only logs completed at or after this time.
+        until (Optional[datetime | date | str]): Only logs completed before this time.
+    Returns:
+        Tuple[List[Dict], Optional[tuple]]: The logs and the cursor of the next page (or None).
+    """
+    return await run_read(habit_service.get_checkoffs_page, habit_id, limit=limit, after=after,
+                          since=since, until=until)
+
+
+async def get_user_analytics(user_id, engine="python"):
+    """
+    Compute the longest streak and the most missed habits for a user.
+    A slow analysis only occupies one reader thread; other users' requests keep being served.
+    Parameters:
+        user_id (int): The ID of the user whose habits are analyzed.
+        engine (str): 'python', 'numpy' or 'sql', as in habit_service.get_user_analytics.
+    Returns:
+        tuple: (longest_streak, most_missed).
+    Raises:
+        ValueError: If the engine name is unknown.
+    """
+    return await run_read(habit_service.get_user_analytics, user_id, engine=engine)
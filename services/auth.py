@@ -1,58 +1,219 @@
-from config.db_config import get_connection
+import hashlib
+import os
+import secrets
+import sqlite3
+from datetime import datetime, timedelta
+from itertools import islice
+
+from config import db_config
+from config.db_config import db_session
+from repository.cache import TTLCache
+from repository.storage_manager import BULK_CHUNK_SIZE
+from utils.passwords import hash_password, hash_passwords, verify_password
+
+# How long a session token from log_in_with_session stays valid
+SESSION_TTL = timedelta(hours=float(os.getenv("SESSION_TTL_HOURS", "168")))
+# Validated tokens keyed by (DB_PATH, token hash) -> (user_id, expires_at), or (None, None) for
+# unknown tokens. end_session invalidates its own entry; a session ended by another process
+# is noticed once the entry expires, i.e. after at most SESSION_CACHE_TTL seconds.
+SESSION_CACHE = TTLCache(
+    maxsize=int(os.getenv("SESSION_CACHE_SIZE", "4096")),
+    ttl=float(os.getenv("SESSION_CACHE_TTL", "60")),
+)
+# Hash checked for unknown usernames, so they take as long to reject as wrong passwords
+_unknown_user_hash = None
 
 
 def sign_up(username, email, password):
     """
-    Register a new user in the system. Checks whether the given username already exists.
-    If not, inserts the new user into the User table.
+    Register a new user in the system. The UNIQUE constraint on User.username detects
+    taken usernames atomically, so two concurrent sign-ups cannot both claim one.
     Parameters:
         username (str): Desired username.
         email (str): User's email address.
-        password (str): User's password (should be hashed in production).
+        password (str): User's password; only its salted hash is stored.
     Returns:
         Tuple[Optional[int], str]: A tuple containing the new user's ID (or None if failed),
                                    and a status message.
     """
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    # Check if username exists
-    cursor.execute("SELECT * FROM User WHERE username = ?", (username,))
-    if cursor.fetchone():
-        conn.close()
+    # Hashed before the transaction starts: the KDF takes tens of milliseconds on purpose
+    password_hash = hash_password(password)
+    try:
+        with db_session() as conn:
+            user_id = conn.execute(
+                "INSERT INTO User (username, email, password) VALUES (?, ?, ?)",
+                (username, email, password_hash)
+            ).lastrowid
+    except sqlite3.IntegrityError:
         return None, "❌ Username already exists."
-
-    # Inserting new user here
-    cursor.execute(
-        "INSERT INTO User (username, email, password) VALUES (?, ?, ?)",
-        (username, email, password)
-    )
-    conn.commit()
-    user_id = cursor.lastrowid
-    conn.close()
     return user_id, "✅ User registered successfully."
 
 
+def sign_up_many(users, chunk_size=BULK_CHUNK_SIZE, on_conflict=None, on_chunk=None):
+    """
+    Register many users, one transaction per chunk.
+    Usernames already in the database are loaded once into a set, so obvious duplicates
+    (and repeats within the input) are skipped before their password is hashed. Usernames
+    taken concurrently after that are still caught by the UNIQUE constraint.
+    Parameters:
+        users (Iterable[tuple]): (username, email, password) tuples. Consumed lazily.
+        chunk_size (int): Number of users committed per transaction. Each chunk's passwords
+                          are hashed in parallel on the KDF pool before it starts.
+        on_conflict (Optional[Callable[[int, str], None]]): Called with the position of the row in
+                                                            `users` (from 0) and the username for
+                                                            every taken username.
+        on_chunk (Optional[Callable[[int], None]]): Called with the running total after each commit.
+    Returns:
+        int: The number of created users.
+    """
+    with db_session() as conn:
+        taken = {row[0] for row in conn.execute("SELECT username FROM User")}
+    created = 0
+    position = 0
+    rows = iter(users)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return created
+        fresh = []
+        for username, email, password in chunk:
+            if username in taken:
+                if on_conflict:
+                    on_conflict(position, username)
+            else:
+                taken.add(username)
+                fresh.append((position, username, email, password))
+            position += 1
+        if not fresh:
+            continue
+        hashes = hash_passwords([password for *_, password in fresh])
+        with db_session() as conn:
+            for (row_position, username, email, _), password_hash in zip(fresh, hashes):
+                inserted = conn.execute(
+                    "INSERT INTO User (username, email, password) VALUES (?, ?, ?) "
+                    "ON CONFLICT(username) DO NOTHING",
+                    (username, email, password_hash)
+                ).rowcount
+                if inserted:
+                    created += 1
+                elif on_conflict:
+                    # Registered by someone else since the usernames were loaded
+                    on_conflict(row_position, username)
+        if on_chunk:
+            on_chunk(created)
+
+
 def log_in(username, password):
     """
     Authenticate a user based on username and password.
+    Passwords still stored in plain text, or hashed with outdated settings, are rehashed
+    with the current ones after a successful login.
     Parameters:
         username (str): The user's username.
-        password (str): The password to verify (plain text comparison — NOT secure).
+        password (str): The password to verify.
     Returns:
         Tuple[Optional[int], str]: A tuple with the user's ID if authenticated, and a status message.
     """
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    # Fetch user credentials from the database
-    cursor.execute("SELECT user_id, password FROM User WHERE username = ?", (username,))
-    row = cursor.fetchone()
-    conn.close()
+    global _unknown_user_hash
+    with db_session() as conn:
+        # Fetch user credentials from the database
+        row = conn.execute(
+            "SELECT user_id, password FROM User WHERE username = ?", (username,)
+        ).fetchone()
 
     if not row:
+        if _unknown_user_hash is None:
+            _unknown_user_hash = hash_password(secrets.token_hex(16))
+        verify_password(password, _unknown_user_hash)
         return None, "❌ User not found."
-    if row[1] != password:
+    matches, needs_rehash = verify_password(password, row[1])
+    if not matches:
         return None, "❌ Incorrect password."
+    if needs_rehash:
+        upgraded = hash_password(password)
+        with db_session() as conn:
+            # Unless the password was changed in the meantime
+            conn.execute("UPDATE User SET password = ? WHERE user_id = ? AND password = ?",
+                         (upgraded, row[0], row[1]))
+
+    return row[0], "✅ Logged in successfully."
+
+
+def _token_hash(token):
+    # Tokens carry 256 random bits, so a fast hash is enough to keep them out of the database
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def create_session(user_id, ttl=None):
+    """
+    Issue a session token for an authenticated user.
+    Parameters:
+        user_id (int): The user the session belongs to.
+        ttl (Optional[timedelta]): Lifetime of the session. Defaults to SESSION_TTL.
+    Returns:
+        str: The token. It is not stored anywhere; only its hash is.
+    """
+    token = secrets.token_urlsafe(32)
+    expires_at = datetime.now() + (ttl or SESSION_TTL)
+    with db_session() as conn:
+        conn.execute("INSERT INTO Sessions (token_hash, user_id, expires_at) VALUES (?, ?, ?)",
+                     (_token_hash(token), user_id, expires_at.isoformat(sep=" ", timespec="seconds")))
+    return token
+
+
+def log_in_with_session(username, password):
+    """
+    Authenticate a user and open a session, so later requests need no password.
+    Parameters:
+        username (str): The user's username.
+        password (str): The password to verify.
+    Returns:
+        Tuple[Optional[int], Optional[str], str]: The user's ID and session token (both None on
+                                                  failure), and a status message.
+    """
+    user_id, message = log_in(username, password)
+    if user_id is None:
+        return None, None, message
+    return user_id, create_session(user_id), message
 
-    return row[0], "✅ Logged in successfully."
\ No newline at end of file
+
+def validate_session(token):
+    """
+    Resolve a session token to its user without any password hashing.
+    Repeated validations of the same token are answered from SESSION_CACHE.
+    Parameters:
+        token (str): A token returned by log_in_with_session or create_session.
+    Returns:
+        Optional[int]: The user's ID, or None if the token is unknown, ended or expired.
+    """
+    key = (db_config.DB_PATH, _token_hash(token))
+    hit, entry = SESSION_CACHE.get(key)
+    if not hit:
+        with db_session() as conn:
+            row = conn.execute("SELECT user_id, expires_at FROM Sessions WHERE token_hash = ?",
+                               (key[1],)).fetchone()
+        # Unknown tokens are cached too: a token cannot start to exist after it was first seen
+        entry = (row[0], datetime.fromisoformat(row[1])) if row else (None, None)
+        SESSION_CACHE.put(key, entry)
+    user_id, expires_at = entry
+    if user_id is None:
+        return None
+    if expires_at <= datetime.now():
+        end_session(token)
+        return None
+    return user_id
+
+
+def end_session(token):
+    """
+    Log out: invalidate a session token.
+    Parameters:
+        token (str): The session token.
+    Returns:
+        bool: True if the session existed.
+    """
+    key = (db_config.DB_PATH, _token_hash(token))
+    with db_session() as conn:
+        deleted = conn.execute("DELETE FROM Sessions WHERE token_hash = ?", (key[1],)).rowcount
+    SESSION_CACHE.invalidate(key)
+    return deleted > 0
@@ -0,0 +1,132 @@
+import csv
+import json
+import os
+
+from config import db_config
+
+# Analytics for every user at once, e.g. for a nightly job. Users are split into user_id
+# ranges ("shards") that run in a ProcessPoolExecutor; every worker process opens its own
+# read connection, so the work scales across cores. Results are appended to the output as
+# each shard finishes, which also makes an interrupted run resumable.
+
+OUTPUT_FORMATS = ("ndjson", "csv")
+CSV_FIELDS = ["user_id", "longest_habit_id", "longest_streak", "most_missed_habit_id",
+              "most_missed_count", "missed_habits"]
+# Users per shard: small enough for an even spread and frequent progress, large enough
+# that the per-task overhead stays negligible
+SHARD_SIZE = 500
+
+
+def _user_id_range():
+    # Only users that own habits have anything to analyze; Habit(user_id) is indexed
+    with db_config.db_session() as conn:
+        return conn.execute("SELECT MIN(user_id), MAX(user_id), COUNT(DISTINCT user_id) FROM Habit").fetchone()
+
+
+def _shards(first, last, size):
+    return [(start, min(start + size - 1, last)) for start in range(first, last + 1, size)]
+
+
+def _analyze_shard(db_path, profile, engine, first, last, skip):
+    # Runs in a worker process: point the pool at the parent's database, then analyze every
+    # user in [first, last] that is not already in the output
+    from services.habit_service import get_user_analytics
+    db_config.DB_PATH = db_path
+    db_config.DB_PROFILE = profile
+    with db_config.db_session() as conn:
+        user_ids = [row[0] for row in conn.execute(
+            "SELECT DISTINCT user_id FROM Habit WHERE user_id BETWEEN ? AND ? ORDER BY user_id", (first, last)
+        )]
+    results = []
+    for user_id in user_ids:
+        if user_id in skip:
+            continue
+        longest, most_missed = get_user_analytics(user_id, engine=engine)
+        results.append({"user_id": user_id, "longest_streak": longest, "most_missed": most_missed})
+    return results
+
+
+def _to_csv_row(result):
+    longest = result["longest_streak"] or (None, None)
+    top = result["most_missed"][0] if result["most_missed"] else (None, None)
+    return {
+        "user_id": result["user_id"],
+        "longest_habit_id": longest[0],
+        "longest_streak": longest[1],
+        "most_missed_habit_id": top[0],
+        "most_missed_count": top[1],
+        "missed_habits": ";".join(f"{habit_id}:{count}" for habit_id, count in result["most_missed"]),
+    }
+
+
+def _completed_user_ids(path, fmt):
+    """
+    Read the user IDs already written by an earlier, possibly interrupted run.
+    A trailing partial line (the process died mid-write) is cut off so appending stays valid.
+    """
+    if not os.path.exists(path):
+        return set()
+    with open(path, "rb+") as f:
+        data = f.read()
+        end = data.rfind(b"\n") + 1
+        if end != len(data):
+            f.truncate(end)
+    lines = data[:end].decode().splitlines()
+    if fmt == "csv":
+        return {int(row["user_id"]) for row in csv.DictReader(lines)}
+    return {json.loads(line)["user_id"] for line in lines if line.strip()}
+
+
+def analyze_all_users(output, fmt="ndjson", workers=None, engine="python", shard_size=SHARD_SIZE,
+                      resume=False, on_progress=None):
+    """
+    Compute the longest streak and most missed habits of every user, across processes.
+    Parameters:
+        output (str): File the per-user results are written to.
+        fmt (str): 'ndjson' (one JSON object per line) or 'csv'.
+        workers (Optional[int]): Worker processes; defaults to the number of CPUs.
+        engine (str): Analytics engine used per user, as in get_user_analytics.
+        shard_size (int): Number of consecutive user IDs handed to a worker at once.
+        resume (bool): Keep an existing output and only analyze users missing from it.
+                       Without it, an existing output is overwritten.
+        on_progress (Optional[Callable[[int, int], None]]): Called with (users done, users total)
+                                                          after every finished shard.
+    Returns:
+        int: Number of users analyzed by this call (excluding resumed ones).
+    Raises:
+        ValueError: If the output format is unknown.
+    """
+    if fmt not in OUTPUT_FORMATS:
+        raise ValueError(f"❌ Unknown output format '{fmt}'. Choose from: {', '.join(OUTPUT_FORMATS)}")
+    done = _completed_user_ids(output, fmt) if resume else set()
+    first, last, total = _user_id_range()
+    if first is None:
+        total = 0
+    written = 0
+    # Imported here: multiprocessing is costly to import and only this command needs it
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    with open(output, "a" if resume else "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS) if fmt == "csv" else None
+        if writer and f.tell() == 0:
+            writer.writeheader()
+        if on_progress:
+            on_progress(len(done), total)
+        if total:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [
+                    pool.submit(_analyze_shard, db_config.DB_PATH, db_config.DB_PROFILE, engine, start, end,
+                                frozenset(user_id for user_id in done if start <= user_id <= end))
+                    for start, end in _shards(first, last, shard_size)
+                ]
+                # Shards are written as they finish, not in user_id order
+                for future in as_completed(futures):
+                    for result in future.result():
+                        if writer:
+                            writer.writerow(_to_csv_row(result))
+                        else:
+                            f.write(json.dumps(result) + "\n")
+                        written += 1
+                    f.flush()
+                    if on_progress:
+                        on_progress(len(done) + written, total)
+    return written
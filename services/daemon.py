@@ -0,0 +1,248 @@
+import os
+import selectors
+import signal
+import socket
+import socketserver
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from config import db_config
+from services import habit_service
+from utils.daemon_protocol import receive_message, send_message, socket_path
+
+# Long-lived server behind `python -m cli serve`. It keeps habit_service, the analytics
+# engines, the pooled SQLite connections and the habit cache warm in one process, and
+# answers requests from CLI invocations over a Unix socket (see utils/daemon_protocol.py).
+# Requests are handled by a fixed set of worker threads rather than a thread per client, so
+# every worker keeps its pooled connection open between clients. A worker is only busy while
+# it answers one request: in between, client connections wait in a selector on a poller
+# thread, so idle clients (e.g. an interactive menu) never hold a worker.
+
+# habit_service functions clients may call; anything else is rejected
+OPERATIONS = frozenset({
+    "create_habit", "remove_habit", "get_user_habits", "get_habit_cache_stats", "checkoff_habit",
+    "remove_checkoff", "get_streak_summary", "rebuild_streaks", "get_checkoffs", "get_checkoffs_page",
+    "get_user_analytics", "evaluate_deadlines", "get_calendar", "rebuild_rollup",
+})
+DAEMON_WORKERS = int(os.getenv("HABIT_DAEMON_WORKERS", "4"))
+# Seconds a client connection may sit idle before the daemon drops it (clients reconnect)
+IDLE_TIMEOUT = 30.0
+# The socket only accepts connections from the user running the daemon
+SOCKET_MODE = 0o600
+
+
+class _RequestHandler(socketserver.BaseRequestHandler):
+    # Answers one request; keep_open tells the daemon to wait for the client's next one
+
+    def handle(self):
+        self.keep_open = False
+        # Bounds the wait for the rest of a message that has started to arrive
+        self.request.settimeout(IDLE_TIMEOUT)
+        try:
+            request = receive_message(self.request)
+        except (OSError, ValueError):
+            return
+        if request is None:
+            return
+        try:
+            response = {"ok": True, "result": self.server.dispatch(
+                request.get("op"), request.get("args") or [], request.get("kwargs") or {})}
+        except Exception as e:
+            response = {"ok": False, "error": str(e), "type": type(e).__name__}
+        try:
+            send_message(self.request, response)
+        except TypeError as e:
+            # The result had no JSON form; nothing was sent yet
+            send_message(self.request, {"ok": False, "error": str(e), "type": "TypeError"})
+        except OSError:
+            return
+        self.keep_open = True
+
+
+class HabitDaemon(socketserver.UnixStreamServer):
+    """
+    Unix socket server running habit_service calls for CLI clients.
+    Attributes:
+        path (str): The socket file the daemon listens on.
+        requests_served (int): Number of requests answered so far.
+        started_at (float): Start time (time.time()).
+    """
+
+    def __init__(self, path=None, workers=DAEMON_WORKERS):
+        self.path = path or socket_path()
+        self.requests_served = 0
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self._workers = ThreadPoolExecutor(workers, thread_name_prefix="habit-daemon")
+        # Idle client connections, registered with the time they were last active
+        self._idle = selectors.DefaultSelector()
+        # Connections handed to the poller by other threads, and the socket pair that wakes it
+        self._returned = deque()
+        self._wakeup, self._waker = socket.socketpair()
+        self._wakeup.setblocking(False)
+        self._idle.register(self._wakeup, selectors.EVENT_READ)
+        self._closing = False
+        _remove_stale_socket(self.path)
+        super().__init__(self.path, _RequestHandler)
+        self._poller = threading.Thread(target=self._poll_idle, name="habit-daemon-poll", daemon=True)
+        self._poller.start()
+
+    def server_bind(self):
+        # Created owner-only: anyone who can connect can read and change every user's habits
+        umask = os.umask(0o777 & ~SOCKET_MODE)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(umask)
+        os.chmod(self.path, SOCKET_MODE)
+
+    def dispatch(self, operation, args, kwargs):
+        """
+        Run one request.
+        Parameters:
+            operation (str): 'ping', or the name of a function in OPERATIONS.
+            args (list): Positional arguments of the call.
+            kwargs (dict): Keyword arguments of the call.
+        Returns:
+            Any: The function's result; for 'ping', the daemon's pid, database and counters.
+        Raises:
+            ValueError: If the operation is unknown.
+        """
+        with self._lock:
+            self.requests_served += 1
+        if operation == "ping":
+            return {"pid": os.getpid(), "db_path": db_config.DB_PATH, "requests_served": self.requests_served,
+                    "uptime": time.time() - self.started_at}
+        if operation not in OPERATIONS:
+            raise ValueError(f"❌ Unknown daemon operation '{operation}'")
+        result = getattr(habit_service, operation)(*args, **kwargs)
+        # Under group commit checkoff_habit hands back a Future; reply once the write is durable
+        if isinstance(result, Future):
+            result = result.result()
+        return result
+
+    def process_request(self, request, client_address):
+        # New connections wait for their first request like idle ones
+        self._hand_back(request)
+
+    def finish_request(self, request, client_address):
+        return self.RequestHandlerClass(request, client_address, self).keep_open
+
+    def _hand_back(self, request):
+        self._returned.append(request)
+        try:
+            self._waker.send(b"\0")
+        except OSError:
+            # Closing: server_close() shuts the connection down
+            pass
+
+    def _serve_request(self, request):
+        keep_open = False
+        try:
+            keep_open = self.finish_request(request, None)
+        except Exception:
+            self.handle_error(request, None)
+        if keep_open and not self._closing:
+            self._hand_back(request)
+        else:
+            self.shutdown_request(request)
+
+    def _poll_idle(self):
+        # Runs on its own thread: hands readable connections to the workers, drops stale ones
+        while not self._closing:
+            now = time.monotonic()
+            for key, _ in self._idle.select(timeout=min(1.0, IDLE_TIMEOUT)):
+                if key.fileobj is self._wakeup:
+                    try:
+                        while self._wakeup.recv(4096):
+                            pass
+                    except BlockingIOError:
+                        pass
+                else:
+                    # A request (or the client hanging up) is waiting
+                    self._idle.unregister(key.fileobj)
+                    self._workers.submit(self._serve_request, key.fileobj)
+            while self._returned:
+                self._idle.register(self._returned.popleft(), selectors.EVENT_READ, now)
+            for key in list(self._idle.get_map().values()):
+                if key.data is not None and now - key.data > IDLE_TIMEOUT:
+                    self._idle.unregister(key.fileobj)
+                    self.shutdown_request(key.fileobj)
+
+    def server_close(self):
+        super().server_close()
+        self._closing = True
+        self._waker.send(b"\0")
+        self._poller.join()
+        # Requests in progress finish, then their connections are closed instead of kept
+        self._workers.shutdown(wait=True, cancel_futures=True)
+        for key in list(self._idle.get_map().values()):
+            if key.fileobj is not self._wakeup:
+                self.shutdown_request(key.fileobj)
+        while self._returned:
+            self.shutdown_request(self._returned.popleft())
+        self._idle.close()
+        self._wakeup.close()
+        self._waker.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def _remove_stale_socket(path):
+    # A socket file left behind by a killed daemon would make bind() fail
+    if not os.path.exists(path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.remove(path)
+    else:
+        raise RuntimeError(f"❌ A daemon is already listening on {path}")
+    finally:
+        probe.close()
+
+
+def _warm_up():
+    # Pay the one-off costs before the first client does: connection, pragmas, optional numpy
+    with db_config.db_session() as conn:
+        conn.execute("SELECT COUNT(*) FROM Habit").fetchone()
+    try:
+        from analytics import numpy_backend  # noqa: F401
+    except ImportError:
+        pass
+
+
+def serve(path=None, workers=DAEMON_WORKERS, group_commit=False, on_ready=None):
+    """
+    Run the daemon in the foreground until interrupted (Ctrl+C or SIGTERM).
+    Parameters:
+        path (Optional[str]): Socket file to listen on. Defaults to socket_path().
+        workers (int): Client connections served concurrently.
+        group_commit (bool): Batch check-offs through write_buffer's group commit.
+        on_ready (Optional[Callable[[HabitDaemon], None]]): Called once the socket accepts connections.
+    Raises:
+        RuntimeError: If another daemon already listens on the socket.
+    """
+    _warm_up()
+    server = HabitDaemon(path, workers)
+    if group_commit:
+        from repository.write_buffer import start_checkoff_buffer
+        start_checkoff_buffer()
+    if threading.current_thread() is threading.main_thread():
+        # Signal handlers run on this thread, inside serve_forever, which shutdown() waits for
+        signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown).start())
+    if on_ready:
+        on_ready(server)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if group_commit:
+            from repository.write_buffer import stop_checkoff_buffer
+            stop_checkoff_buffer()
+        db_config.close_connections()
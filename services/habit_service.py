@@ -1,12 +1,37 @@
+import sys
+from datetime import date, timedelta
 from models.habits import Habit
+from analytics import sql_engine
+from analytics.analytics_module import summarize_logs
 from repository.storage_manager import (
     save_habit,
     delete_habit,
     load_all_habits,
+    habit_cache_stats,
     save_checkoff,
+    save_checkoffs_bulk,
     load_checkoffs_for_habit,
+    load_checkoffs_page,
+    iter_checkoffs,
+    iter_user_log_records,
+    delete_checkoff,
+    load_streak_summary,
+    load_data_version,
+    load_habit_version,
+    rebuild_streak_summaries,
+    record_missed_deadlines,
+    load_daily_rollup,
+    rebuild_daily_rollup,
+    BULK_CHUNK_SIZE,
 )
 
+# Where analytics are computed: 'python' streams the logs into analytics_module,
+# 'numpy' into the vectorized analytics.numpy_backend (optional dependency), and
+# 'sql' pushes the work into SQLite via analytics.sql_engine
+ANALYTICS_ENGINES = ("python", "numpy", "sql")
+# What a streak counts, by habit frequency; front ends fall back to 'periods'
+STREAK_UNITS = {"daily": "days", "weekly": "weeks"}
+
 
 def create_habit(user_id, name, frequency, description, deadline_time):
     """
@@ -38,8 +63,10 @@ def remove_habit(habit_id):
     Delete a habit from the database by its ID.
     Parameters:
         habit_id (int): The ID of the habit to delete.
+    Returns:
+        bool: True if the habit existed.
     """
-    delete_habit(habit_id)
+    return delete_habit(habit_id)
 
 
 def get_user_habits(user_id):
@@ -53,22 +80,205 @@ def get_user_habits(user_id):
     return load_all_habits(user_id)
 
 
+def get_habit_cache_stats():
+    """
+    Report how well the habit list cache behind get_user_habits is doing.
+    Returns:
+        Dict: size, maxsize, ttl, hits, misses, evictions, expirations, invalidations and hit_rate.
+    """
+    return habit_cache_stats()
+
+
 def checkoff_habit(habit_id, user_id):
     """
     Record a check-off entry for a specific habit and user.
     Parameters:
         habit_id (int): The ID of the habit to be checked off.
         user_id (int): The ID of the user performing the check-off.
+    Returns:
+        Optional[Future]: None when the check-off was committed right away. While group commit
+                          is on (write_buffer.start_checkoff_buffer), a Future that resolves
+                          once the check-off is durable.
+    Raises:
+        ValueError: If the habit does not exist or belongs to another user.
     """
+    owner = load_habit_version(habit_id)
+    if owner is None:
+        raise ValueError(f"❌ Habit {habit_id} not found")
+    if owner[0] != user_id:
+        raise ValueError(f"❌ Habit {habit_id} belongs to another user")
+    # Group commit can only be on if write_buffer was imported; not importing it keeps startup fast
+    write_buffer = sys.modules.get("repository.write_buffer")
+    buffer = write_buffer.get_checkoff_buffer() if write_buffer else None
+    if buffer is not None:
+        return buffer.submit(habit_id, user_id)
     save_checkoff(habit_id, user_id)
+    return None
 
 
-def get_checkoffs(habit_id):
+def checkoff_habits_bulk(records, chunk_size=BULK_CHUNK_SIZE, on_chunk=None):
     """
-    Retrieve all check-off logs for a given habit.
+    Record many check-off entries at once, e.g. when backfilling history.
+    Parameters:
+        records (Iterable[tuple]): (habit_id, user_id, completed_at, note, missed) tuples.
+        chunk_size (int): Number of rows written per transaction.
+        on_chunk (Optional[Callable[[int], None]]): Progress callback receiving the running total.
+    Returns:
+        int: The number of check-offs recorded.
+    """
+    return save_checkoffs_bulk(records, chunk_size=chunk_size, on_chunk=on_chunk)
+
+
+def remove_checkoff(log_id):
+    """
+    Delete a single check-off log; the habit's streak summary is corrected accordingly.
+    Parameters:
+        log_id (int): The ID of the log entry to delete.
+    Returns:
+        bool: True if the log existed and was deleted.
+    """
+    return delete_checkoff(log_id)
+
+
+def get_streak_summary(habit_id):
+    """
+    Retrieve the current and longest streak of a habit without scanning its logs.
+    Parameters:
+        habit_id (int): The ID of the habit.
+    Returns:
+        Dict: current_streak, longest_streak, last_completed_day and total_completions.
+    """
+    return load_streak_summary(habit_id)
+
+
+def get_data_version(user_id):
+    """
+    Retrieve a version number of a user's data, e.g. to tell whether cached analytics are stale.
+    Parameters:
+        user_id (int): The ID of the user.
+    Returns:
+        int: Grows with every committed change to the user's habits or check-offs.
+    """
+    return load_data_version(user_id)
+
+
+def get_habit_version(habit_id):
+    """
+    Retrieve the owner of a habit and the version of the owner's data.
+    Parameters:
+        habit_id (int): The ID of the habit.
+    Returns:
+        Optional[tuple[int, int]]: (user_id, version), or None for an unknown habit.
+    """
+    return load_habit_version(habit_id)
+
+
+def rebuild_streaks():
+    """
+    Recompute every habit's streak summary from the raw check-off logs.
+    Returns:
+        int: The number of habits summarized.
+    """
+    return rebuild_streak_summaries()
+
+
+def rebuild_rollup():
+    """
+    Recompute the per-day rollup of every habit from the raw check-off logs.
+    Returns:
+        int: The number of (habit, day) rows written.
+    """
+    return rebuild_daily_rollup()
+
+
+def get_calendar(user_id, days=365, end=None):
+    """
+    Collect per-day completion counts of each of a user's habits for a calendar view.
+    Parameters:
+        user_id (int): The ID of the user.
+        days (int): Number of days shown, ending with `end`.
+        end (Optional[date | str]): Last day shown. Defaults to today.
+    Returns:
+        Dict: 'start' and 'end' ('YYYY-MM-DD') and 'habits', a list with habit_id, name,
+              frequency and 'days' mapping 'YYYY-MM-DD' to [completions, missed] for
+              every day that has logs.
+    """
+    end = date.fromisoformat(end) if isinstance(end, str) else (end or date.today())
+    start = end - timedelta(days=days - 1)
+    habits = {habit["habit_id"]: {"habit_id": habit["habit_id"], "name": habit["name"],
+                                  "frequency": habit["frequency"], "days": {}}
+              for habit in get_user_habits(user_id)}
+    for habit_id, day, completions, missed in load_daily_rollup(user_id, start, end):
+        habits[habit_id]["days"][day] = [completions, missed]
+    return {"start": start.isoformat(), "end": end.isoformat(), "habits": list(habits.values())}
+
+
+def evaluate_deadlines(until=None):
+    """
+    Record every period whose deadline passed without a check-off as a missed log.
+    Each call only evaluates the deadlines since the previous call, so it is cheap to run often.
+    Parameters:
+        until (Optional[datetime | str]): Evaluate deadlines up to this time. Defaults to now.
+    Returns:
+        Dict: 'missed', 'since' and 'until', as returned by record_missed_deadlines.
+    """
+    return record_missed_deadlines(until)
+
+
+def get_checkoffs(habit_id, since=None, until=None):
+    """
+    Retrieve the check-off logs for a given habit, most recent first.
     Parameters:
         habit_id (int): The ID of the habit whose logs are requested.
+        since (Optional[datetime | date | str]): Only logs completed at or after this time.
+        until (Optional[datetime | date | str]): Only logs completed before this time.
     Returns:
         List[Dict]: A list of check-off log entries as dictionaries.
     """
-    return load_checkoffs_for_habit(habit_id)
\ No newline at end of file
+    if since is None and until is None:
+        return load_checkoffs_for_habit(habit_id)
+    return list(iter_checkoffs(habit_id, since=since, until=until, newest_first=True))
+
+
+def get_checkoffs_page(habit_id, limit=50, after=None, since=None, until=None):
+    """
+    Retrieve one page of a habit's check-off logs, most recent first.
+    Parameters:
+        habit_id (int): The ID of the habit whose logs are requested.
+        limit (int): Maximum number of logs on the page.
+        after (Optional[tuple]): Cursor returned with the previous page.
+        since (Optional[datetime | date | str]): Only logs completed at or after this time.
+        until (Optional[datetime | date | str]): Only logs completed before this time.
+    Returns:
+        Tuple[List[Dict], Optional[tuple]]: The logs and the cursor of the next page (or None).
+    """
+    return load_checkoffs_page(habit_id, limit=limit, after=after, since=since, until=until)
+
+
+def get_user_analytics(user_id, engine="python"):
+    """
+    Compute the longest streak and the most missed habits for a user.
+    Parameters:
+        user_id (int): The ID of the user whose habits are analyzed.
+        engine (str): 'python' to stream logs into analytics_module, 'numpy' to use the
+                      vectorized backend, or 'sql' to compute both results inside SQLite.
+                      All engines return the same values.
+    Returns:
+        tuple: (longest_streak, most_missed) where longest_streak is (habit_id, longest_streak_periods)
+               or None, counting days for daily habits and ISO weeks for weekly ones (see
+               STREAK_UNITS), and most_missed is a list of (habit_id, missed_count) tuples.
+    Raises:
+        ValueError: If the engine name is unknown.
+    """
+    if engine in ("python", "numpy"):
+        # Stream compact, pre-parsed records of every log of the user; habits without
+        # logs carry no log_id
+        logs = (log for log in iter_user_log_records(user_id) if log.log_id is not None)
+        if engine == "numpy":
+            # Imported lazily so numpy stays optional for the rest of the app
+            from analytics import numpy_backend
+            return numpy_backend.summarize_logs(logs)
+        return summarize_logs(logs)
+    if engine == "sql":
+        return sql_engine.get_longest_streak(user_id), sql_engine.get_most_missed_habits(user_id)
+    raise ValueError(f"❌ Unknown analytics engine '{engine}'. Choose from: {', '.join(ANALYTICS_ENGINES)}")
@@ -1,9 +1,14 @@
 import pytest
 from datetime import datetime, timedelta
+from models.log_record import LogRecord
 from analytics.analytics_module import (
+    calculate_streaks,
     get_longest_streak,
     get_most_missed_habits,
-    get_habits_by_period
+    get_habits_by_period,
+    get_streaks_by_habit,
+    period_streaks,
+    summarize_logs,
 )
 
 @pytest.fixture
@@ -78,4 +83,51 @@ def test_get_habits_by_period(sample_logs):
     daily = get_habits_by_period(sample_logs, "daily")
     weekly = get_habits_by_period(sample_logs, "weekly")
     assert all(h["frequency"] == "daily" for h in daily)
-    assert all(h["frequency"] == "weekly" for h in weekly)
\ No newline at end of file
+    assert all(h["frequency"] == "weekly" for h in weekly)
+
+
+def test_summarize_logs_matches_separate_functions(sample_logs):
+    """
+    Test that the single-pass summary equals the two separate analyses, even from a generator.
+    """
+    longest, missed = summarize_logs(log for log in sample_logs)
+    assert longest == get_longest_streak(sample_logs)
+    assert missed == get_most_missed_habits(sample_logs)
+
+
+def test_functions_accept_compact_log_records(sample_logs):
+    """
+    Test that LogRecords with pre-parsed datetimes give the same results as dict logs.
+    """
+    records = [
+        LogRecord(i, log["habit_id"], 1, datetime.fromisoformat(log["completed_at"]), None, log["missed"])
+        for i, log in enumerate(sample_logs, start=1)
+    ]
+    assert get_longest_streak(records) == get_longest_streak(sample_logs)
+    assert get_most_missed_habits(records) == get_most_missed_habits(sample_logs)
+    habit_one = [record for record in records if record.habit_id == 1]
+    assert calculate_streaks(habit_one) == 3
+
+
+def test_streaks_bucket_completions_into_each_habits_period():
+    """
+    Test that same-day completions count once, weekly habits count ISO weeks,
+    and out of order logs give the same streaks.
+    """
+    logs = [
+        {"habit_id": 1, "completed_at": "2025-03-01 23:30:00"},
+        {"habit_id": 1, "completed_at": "2025-03-02 06:00:00"},
+        {"habit_id": 1, "completed_at": "2025-03-02 21:00:00"},
+        {"habit_id": 1, "completed_at": "2025-03-03 07:00:00"},
+        {"habit_id": 2, "completed_at": "2025-03-03 07:00:00", "frequency": "weekly"},
+        {"habit_id": 2, "completed_at": "2025-03-16 07:00:00", "frequency": "weekly"},
+        {"habit_id": 2, "completed_at": "2025-03-17 07:00:00", "frequency": "weekly"},
+        {"habit_id": 2, "completed_at": "2025-03-31 07:00:00", "frequency": "weekly"},
+    ]
+    expected = {1: (3, 3), 2: (1, 3)}
+    assert get_streaks_by_habit(logs) == expected
+    assert get_streaks_by_habit(list(reversed(logs))) == expected
+    assert get_longest_streak(get_habits_by_period(logs, "weekly")) == (2, 3)
+    assert calculate_streaks(logs[:4]) == 3
+    assert calculate_streaks([{"completed_at": "2025-03-10"}, {"completed_at": "2025-03-03"}], "weekly") == 2
+    assert period_streaks([5, 5, 6, 8, 9, 10, 10]) == (3, 3)
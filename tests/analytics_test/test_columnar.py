@@ -0,0 +1,76 @@
+import pytest
+from click.testing import CliRunner
+
+from analytics import sql_engine
+from cli.commands import cli
+from models.habits import Habit
+from repository.storage_manager import save_checkoffs_bulk, save_habit
+
+columnar = pytest.importorskip("analytics.columnar")
+
+
+@pytest.fixture(autouse=True)
+def columnar_db(migrated_db):
+    """
+    Fixture with a migrated test database: two users, a daily and a weekly habit, some misses.
+    """
+    save_habit(Habit(None, 1, "Read", "daily", "", None))
+    save_habit(Habit(None, 1, "Walk", "weekly", "", None))
+    save_habit(Habit(None, 2, "Swim", "daily", "", None))
+    save_checkoffs_bulk(
+        [(1, 1, f"2025-03-{day:02d} 08:00:00", "", 0) for day in (1, 2, 3, 5)]
+        # Three consecutive ISO weeks, twice in the middle one
+        + [(2, 1, stamp, "", 0) for stamp in ("2025-03-03 07:00:00", "2025-03-10 07:00:00",
+                                              "2025-03-14 07:00:00", "2025-03-17 07:00:00")]
+        + [(1, 1, "2025-03-06 08:00:00", "", 1), (2, 1, "2025-03-24 07:00:00", "", 1)]
+        + [(3, 2, f"2025-03-{day:02d} 09:30:00", "", 0) for day in range(1, 6)]
+    )
+
+
+def test_export_is_incremental_and_matches_sql_engine(tmp_path):
+    """
+    Test that a second export only appends new logs and the memory-mapped analytics agree with SQL.
+    """
+    first = columnar.export_columnar(str(tmp_path), chunk_size=4)
+    assert first == {"exported": 15, "rows": 15, "last_log_id": 15}
+    columns = columnar.open_columnar(str(tmp_path))
+    assert columns["habit_id"].tolist()[:4] == [1, 1, 1, 1]
+    assert columns["completed_at"][0] == 1740816000
+    for user_id in (1, 2):
+        assert columnar.get_longest_streak(columns, user_id) == sql_engine.get_longest_streak(user_id)
+        assert columnar.get_most_missed_habits(columns, user_id) == sql_engine.get_most_missed_habits(user_id)
+
+    save_checkoffs_bulk([(1, 1, "2025-03-04 08:00:00", "", 0), (1, 1, "2025-03-05 20:00:00", "", 1)])
+    assert columnar.export_columnar(str(tmp_path)) == {"exported": 2, "rows": 17, "last_log_id": 17}
+    assert columnar.export_columnar(str(tmp_path))["exported"] == 0
+    columns = columnar.open_columnar(str(tmp_path))
+    assert columnar.get_longest_streak(columns, 1) == sql_engine.get_longest_streak(1) == (1, 5)
+    assert columnar.get_most_missed_habits(columns) == [(1, 2), (2, 1)]
+    # The files stay plain .npy files
+    assert columnar.np.load(str(tmp_path / "log_id.npy")).tolist() == list(range(1, 18))
+
+
+def test_export_columnar_command(tmp_path):
+    """
+    Test the CLI entry point and that reading a directory without an export fails clearly.
+    """
+    target = str(tmp_path / "logs")
+    result = CliRunner().invoke(cli, ["--no-daemon", "export-columnar", target, "--chunk-size", "10"])
+    assert result.exit_code == 0
+    assert f"Exported 15 new logs (15 total, up to log_id 15) to {target}" in result.output
+    assert len(columnar.open_columnar(target)["missed"]) == 15
+    with pytest.raises(FileNotFoundError):
+        columnar.open_columnar(str(tmp_path))
+
+
+def test_reads_stay_memory_mapped_unless_filtered_by_user(tmp_path):
+    """
+    Test that whole-export reads use the memory maps and per-user reads gather only that user's rows.
+    """
+    columnar.export_columnar(str(tmp_path))
+    columns = columnar.open_columnar(str(tmp_path))
+    (everything,) = columnar._select(columns, None, "habit_id")
+    assert everything is columns["habit_id"]
+    (habit_ids,) = columnar._select(columns, 2, "habit_id")
+    assert habit_ids.tolist() == [3] * 5
+    assert not columnar.np.shares_memory(habit_ids, columns["habit_id"])
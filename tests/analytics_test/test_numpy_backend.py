@@ -0,0 +1,51 @@
+import random
+import pytest
+from datetime import datetime, timedelta
+
+from analytics import analytics_module
+
+numpy_backend = pytest.importorskip("analytics.numpy_backend")
+
+
+def _random_logs(seed, habits=12, logs=600):
+    """
+    Build logs with the awkward cases mixed in: duplicates, 23h/25h/47h gaps, missed flags,
+    weekly habits, and habits appearing in random order.
+    """
+    rng = random.Random(seed)
+    start = datetime(2024, 6, 1, 8, 0, 0)
+    result = []
+    for _ in range(logs):
+        hours = rng.choice([0, 23, 24, 24, 24, 25, 47, 48, 72]) * rng.randint(0, 40)
+        when = start + timedelta(hours=hours, minutes=rng.choice([0, 0, 30]))
+        habit_id = rng.randint(1, habits)
+        result.append({
+            "habit_id": habit_id,
+            "completed_at": when.strftime("%Y-%m-%d %H:%M:%S"),
+            "missed": rng.random() < 0.2,
+            "frequency": "weekly" if habit_id % 3 == 0 else "daily",
+        })
+    return result
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_numpy_backend_matches_python_functions(seed):
+    """
+    Test that every vectorized function returns exactly what the pure Python version does.
+    """
+    logs = _random_logs(seed)
+    assert numpy_backend.get_longest_streak(logs) == analytics_module.get_longest_streak(logs)
+    assert numpy_backend.get_most_missed_habits(logs) == analytics_module.get_most_missed_habits(logs)
+    assert numpy_backend.summarize_logs(iter(logs)) == analytics_module.summarize_logs(logs)
+    for habit_id in range(1, 13):
+        habit_logs = [log for log in logs if log["habit_id"] == habit_id]
+        assert numpy_backend.calculate_streaks(habit_logs) == analytics_module.calculate_streaks(habit_logs)
+
+
+def test_numpy_backend_empty_input():
+    """
+    Test that empty inputs give the same empty results as the Python functions.
+    """
+    assert numpy_backend.get_longest_streak([]) is None
+    assert numpy_backend.get_most_missed_habits([]) == []
+    assert numpy_backend.calculate_streaks([]) == 0
@@ -0,0 +1,91 @@
+import pytest
+from datetime import datetime, timedelta
+
+from analytics import analytics_module, sql_engine
+from models.habits import Habit
+from repository.storage_manager import save_habit, save_checkoffs_bulk, iter_user_logs
+from services.habit_service import get_user_analytics
+
+START = datetime(2025, 1, 1, 8, 0, 0)
+
+
+@pytest.fixture(autouse=True)
+def analytics_db(migrated_db):
+    """
+    Fixture that fills a migrated test database with habits whose logs exercise
+    streak edge cases: exact days, times of day, same-day duplicates, gaps and ISO weeks.
+    """
+    for name in ("Steady", "Sloppy", "Duplicates", "Missed", "Lonely"):
+        save_habit(Habit(None, 1, name, "daily", "", None))
+    save_habit(Habit(None, 2, "Not mine", "daily", "", None))
+    save_habit(Habit(None, 1, "Weekly", "weekly", "", None))
+
+    offsets = {
+        # 4-day run, a 2-day gap, then a 2-day run
+        1: [0, 1, 2, 3, 6, 7],
+        # Calendar days count, not 24h gaps: 23h later is the next day, 47h later skips one
+        2: [0, 23 / 24, 2, 3 + 1 / 24, 5, 5 + 47 / 24],
+        # Two completions on the same day count once
+        3: [0, 1, 1, 2, 3, 4, 5],
+        4: [0, 2, 4],
+        5: [10],
+        6: [0, 1, 2, 3, 4, 5, 6, 7, 8, 9],
+        # START is a Wednesday: ISO weeks 1, 2 (twice), 3 and 4, then a skipped week
+        7: [0, 5, 6, 12, 20, 34],
+    }
+    records = []
+    for habit_id, days in offsets.items():
+        user_id = 2 if habit_id == 6 else 1
+        for index, day in enumerate(days):
+            when = START + timedelta(days=day)
+            missed = 1 if habit_id == 4 or (habit_id == 2 and index == 1) else 0
+            records.append((habit_id, user_id, when.strftime("%Y-%m-%d %H:%M:%S"), None, missed))
+    save_checkoffs_bulk(records)
+
+
+def _python_logs(user_id):
+    return [log for log in iter_user_logs(user_id) if log["log_id"] is not None]
+
+
+def test_sql_engine_matches_python_functions():
+    """
+    Test that the SQL engine returns exactly what the Python analytics compute from the raw logs.
+    """
+    logs = _python_logs(1)
+    assert sql_engine.get_longest_streak(1) == analytics_module.get_longest_streak(logs) == (3, 6)
+    assert sql_engine.get_most_missed_habits(1) == analytics_module.get_most_missed_habits(logs)
+    for habit_id in (1, 2, 3, 4, 5, 7):
+        habit_logs = [log for log in logs if log["habit_id"] == habit_id]
+        assert sql_engine.calculate_streaks(habit_id) == analytics_module.calculate_streaks(habit_logs)
+
+
+def test_streaks_count_each_habits_own_periods():
+    """
+    Test current and longest streaks per habit: days for daily habits, ISO weeks for weekly ones.
+    """
+    streaks = analytics_module.get_streaks_by_habit(_python_logs(1))
+    # Missed logs are gaps: habit 2 loses its second day, habit 4 has no completions at all
+    assert streaks == {1: (2, 4), 2: (1, 2), 3: (6, 6), 5: (1, 1), 7: (1, 4)}
+    weekly_logs = analytics_module.get_habits_by_period(_python_logs(1), "weekly")
+    assert analytics_module.get_longest_streak(weekly_logs) == (7, 4)
+    assert sql_engine.calculate_streaks(7) == 1
+
+
+def test_sql_engine_handles_users_and_habits_without_logs():
+    """
+    Test the empty cases: unknown users and habits without check-offs.
+    """
+    assert sql_engine.get_longest_streak(99) is None
+    assert sql_engine.get_most_missed_habits(99) == []
+    assert sql_engine.calculate_streaks(99) == 0
+
+
+def test_engine_is_selectable_per_call():
+    """
+    Test that the engines behind get_user_analytics agree, and unknown engines are rejected.
+    """
+    assert get_user_analytics(1, engine="sql") == get_user_analytics(1, engine="python")
+    pytest.importorskip("numpy")
+    assert get_user_analytics(1, engine="numpy") == get_user_analytics(1, engine="python")
+    with pytest.raises(ValueError):
+        get_user_analytics(1, engine="gpu")
@@ -0,0 +1,102 @@
+import pytest
+from falcon import testing
+
+from api.app import create_app
+from models.habits import Habit
+from repository.storage_manager import save_checkoffs_bulk, save_habit
+
+
+@pytest.fixture(autouse=True)
+def setup_and_teardown_db(migrated_db):
+    """
+    Migrated database with two habits of user 1 and a few check-offs of the first one.
+    """
+    save_habit(Habit(None, 1, "Read", "daily", "", None))
+    save_habit(Habit(None, 1, "Walk", "weekly", "", None))
+    save_checkoffs_bulk([(1, 1, f"2025-03-0{day} 08:00:00", "", 0) for day in range(1, 4)]
+                        + [(2, 1, "2025-03-01 08:00:00", "", 1)])
+
+
+@pytest.fixture
+def client():
+    """
+    Falcon test client around a fresh app.
+    """
+    return testing.TestClient(create_app())
+
+
+def test_habit_lifecycle(client):
+    """
+    Test creating, listing and deleting habits over HTTP.
+    """
+    result = client.simulate_post("/users/1/habits", json={"name": "Stretch", "frequency": "daily",
+                                                           "deadline_time": "2025-04-14 20:00:00"})
+    assert result.status_code == 201
+    habit_id = result.json["habit_id"]
+    assert result.headers["location"] == f"/habits/{habit_id}"
+    assert result.json["deadline_time"] == "2025-04-14 20:00:00"
+
+    names = [habit["name"] for habit in client.simulate_get("/users/1/habits").json]
+    assert names == ["Read", "Walk", "Stretch"]
+    assert client.simulate_delete(f"/habits/{habit_id}").status_code == 204
+    assert client.simulate_delete(f"/habits/{habit_id}").status_code == 404
+    assert client.simulate_post("/users/1/habits", json={"name": "X", "frequency": "hourly"}).status_code == 400
+
+
+def test_checkoff_pages_and_new_checkoffs(client):
+    """
+    Test paging through check-offs with the returned cursor and adding one.
+    """
+    first = client.simulate_get("/habits/1/checkoffs", params={"limit": 2}).json
+    assert [log["completed_at"] for log in first["checkoffs"]] == ["2025-03-03 08:00:00", "2025-03-02 08:00:00"]
+    rest = client.simulate_get("/habits/1/checkoffs", params={"limit": 2, "after": first["next"]}).json
+    assert len(rest["checkoffs"]) == 1 and rest["next"] is None
+    assert client.simulate_get("/habits/1/checkoffs", params={"after": "nonsense"}).status_code == 400
+
+    assert client.simulate_post("/habits/1/checkoffs", json={"user_id": 1}).status_code == 201
+    assert client.simulate_get("/habits/1/streak").json["total_completions"] == 4
+
+    # Check-offs for unknown habits, or for a habit of another user, are rejected and not stored
+    assert client.simulate_post("/habits/99/checkoffs", json={"user_id": 1}).status_code == 404
+    assert client.simulate_post("/habits/1/checkoffs", json={"user_id": 2}).status_code == 403
+    assert client.simulate_get("/habits/1/streak").json["total_completions"] == 4
+
+
+def test_analytics_etag_returns_304_until_the_data_changes(client):
+    """
+    Test conditional GETs: same data version means 304, any write by the user means a new ETag.
+    """
+    result = client.simulate_get("/users/1/analytics")
+    assert result.status_code == 200
+    assert result.json["longest_streak"] == {"habit_id": 1, "periods": 3, "unit": "days"}
+    assert result.json["most_missed"] == [{"habit_id": 2, "missed": 1}]
+    etag = result.headers["etag"]
+
+    repeat = client.simulate_get("/users/1/analytics", headers={"If-None-Match": etag})
+    assert repeat.status_code == 304 and repeat.text == ""
+    # Other users' writes do not invalidate user 1's analytics
+    save_habit(Habit(None, 2, "Other", "daily", "", None))
+    assert client.simulate_get("/users/1/analytics", headers={"If-None-Match": etag}).status_code == 304
+
+    client.simulate_post("/habits/2/checkoffs", json={"user_id": 1})
+    changed = client.simulate_get("/users/1/analytics", headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and changed.headers["etag"] != etag
+    assert client.simulate_get("/users/1/analytics", params={"engine": "fortran"}).status_code == 400
+
+
+def test_streak_of_unknown_habit_is_404(client):
+    """
+    Test that per-habit resources report unknown habits.
+    """
+    assert client.simulate_get("/habits/99/streak").status_code == 404
+
+
+def test_longest_weekly_streak_is_reported_in_weeks(client):
+    """
+    Test that a weekly habit's longest streak is labelled with its unit, not as days.
+    """
+    save_habit(Habit(None, 3, "Hike", "weekly", "", None))
+    save_checkoffs_bulk([(3, 3, stamp, "", 0) for stamp in ("2025-03-03 07:00:00", "2025-03-10 07:00:00",
+                                                            "2025-03-17 07:00:00")])
+    result = client.simulate_get("/users/3/analytics")
+    assert result.json["longest_streak"] == {"habit_id": 3, "periods": 3, "unit": "weeks"}
@@ -1,42 +1,13 @@
-import os
-import sqlite3
+import threading
 import pytest
-from services.auth import sign_up, log_in
-from config import db_config
-
-TEST_DB_PATH = "test_users.db"
-
-
-@pytest.fixture(autouse=True)
-def setup_and_teardown_user_db(monkeypatch):
-    """
-     Fixture that overrides the DB_PATH to use a test database.
-     Automatically sets up and tears down the User table for each test.
-     """
-    # Override DB path for testing
-    monkeypatch.setattr(db_config, "DB_PATH", TEST_DB_PATH)
-
-    # Set up test schema
-    conn = sqlite3.connect(TEST_DB_PATH)
-    cursor = conn.cursor()
-    cursor.executescript("""
-        CREATE TABLE IF NOT EXISTS User (
-            user_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            username TEXT NOT NULL UNIQUE,
-            email TEXT,
-            password TEXT,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-        );
-    """)
-    conn.commit()
-    conn.close()
+from datetime import timedelta
 
-    # Run the test
-    yield
+from services import auth
+from services.auth import sign_up, sign_up_many, log_in, log_in_with_session, validate_session, end_session, create_session
+from config import db_config
+from utils import passwords
 
-    # Clean up test db
-    if os.path.exists(TEST_DB_PATH):
-        os.remove(TEST_DB_PATH)
+pytestmark = pytest.mark.usefixtures("migrated_db")
 
 
 def test_successful_signup_and_login():
@@ -69,4 +40,143 @@ def test_login_with_incorrect_password():
     sign_up("wrongpass", "wrong@example.com", "abc123")
     user_id, msg = log_in("wrongpass", "wrongpassword")
     assert user_id is None
-    assert "incorrect password" in msg.lower()
\ No newline at end of file
+    assert "incorrect password" in msg.lower()
+
+
+def _stored_password(username):
+    with db_config.db_session() as conn:
+        return conn.execute("SELECT password FROM User WHERE username = ?", (username,)).fetchone()[0]
+
+
+def test_passwords_are_stored_as_salted_hashes():
+    """
+    Test that sign-up never stores the plaintext and equal passwords get different hashes.
+    """
+    sign_up("alice", "a@example.com", "secret")
+    sign_up("bob", "b@example.com", "secret")
+    alice, bob = _stored_password("alice"), _stored_password("bob")
+    assert alice.startswith(passwords.PASSWORD_KDF + "$") and "secret" not in alice
+    assert alice != bob
+    assert passwords.verify_password("secret", alice) == (True, False)
+    assert passwords.verify_password("Secret", alice)[0] is False
+
+
+def test_malformed_hashes_are_compared_as_plaintext():
+    """
+    Test that stored values that only look like hashes never make a login raise.
+    """
+    truncated = passwords.hash_password("secret").rsplit("$", 1)[0]
+    assert passwords.verify_password("secret", truncated) == (False, True)
+    assert passwords.verify_password("secret", "pbkdf2_sha256$many$c2FsdA==$ZGlnZXN0") == (False, True)
+    assert passwords.verify_password("scrypt$hunter2", "scrypt$hunter2") == (True, True)
+    with db_config.db_session() as conn:
+        conn.execute("INSERT INTO User (username, email, password) VALUES ('odd', '', 'scrypt$1$2$salt')")
+    assert log_in("odd", "secret")[0] is None
+    assert log_in("odd", "scrypt$1$2$salt")[0] is not None
+
+
+def test_legacy_and_outdated_hashes_are_upgraded_on_login(monkeypatch):
+    """
+    Test that plaintext passwords from older databases, and weaker hashes, are rehashed at login.
+    """
+    with db_config.db_session() as conn:
+        conn.execute("INSERT INTO User (username, email, password) VALUES ('legacy', '', 'hashedpassword')")
+    assert log_in("legacy", "wrong")[0] is None
+    assert _stored_password("legacy") == "hashedpassword"
+    assert log_in("legacy", "hashedpassword")[0] is not None
+    upgraded = _stored_password("legacy")
+    assert upgraded.startswith(passwords.PASSWORD_KDF + "$")
+
+    monkeypatch.setattr(passwords, "SCRYPT_N", passwords.SCRYPT_N * 2)
+    monkeypatch.setattr(passwords, "PBKDF2_ITERATIONS", passwords.PBKDF2_ITERATIONS + 1)
+    assert log_in("legacy", "hashedpassword")[0] is not None
+    assert _stored_password("legacy") != upgraded
+
+
+def test_sessions_validate_from_the_cache_until_ended():
+    """
+    Test the token lifecycle: issued at login, validated without hashing, unusable once ended.
+    """
+    sign_up("carol", "c@example.com", "pw")
+    user_id, token, message = log_in_with_session("carol", "pw")
+    assert user_id is not None and token and "successfully" in message.lower()
+    assert log_in_with_session("carol", "nope")[:2] == (None, None)
+
+    hits = auth.SESSION_CACHE.hits
+    assert validate_session(token) == user_id
+    assert validate_session(token) == user_id
+    assert auth.SESSION_CACHE.hits == hits + 1
+    with db_config.db_session() as conn:
+        assert token not in str(conn.execute("SELECT * FROM Sessions").fetchall())
+
+    assert end_session(token) is True
+    assert validate_session(token) is None
+    assert validate_session("made-up-token") is None
+
+
+def test_expired_sessions_are_rejected():
+    """
+    Test that a session past its lifetime no longer resolves to its user.
+    """
+    user_id, _ = sign_up("dave", "d@example.com", "pw")
+    token = create_session(user_id, ttl=timedelta(seconds=-1))
+    assert validate_session(token) is None
+
+
+def test_concurrent_logins_all_succeed():
+    """
+    Test that logins from many threads are all verified correctly through the KDF pool.
+    """
+    for n in range(4):
+        sign_up(f"user{n}", "", f"pw{n}")
+    results = {}
+
+    def login(n):
+        results[n] = log_in(f"user{n}", f"pw{n}")[0]
+
+    threads = [threading.Thread(target=login, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(results[n] is not None for n in range(4))
+
+
+def test_concurrent_signups_for_one_username_create_one_user():
+    """
+    Test that the UNIQUE constraint lets exactly one of several racing sign-ups win.
+    """
+    results = []
+    threads = [threading.Thread(target=lambda n=n: results.append(sign_up("erin", "", f"pw{n}")))
+               for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(user_id is not None for user_id, _ in results) == [False, False, False, True]
+    assert [msg for user_id, msg in results if user_id is None] == ["❌ Username already exists."] * 3
+
+
+def test_sign_up_many_reports_every_conflict():
+    """
+    Test bulk sign-up: existing names, repeats within the input and names taken mid-import
+    are reported by position, and everyone else can log in.
+    """
+    sign_up("alice", "", "pw")
+
+    def users():
+        yield "alice", "", "x"
+        yield "bob", "b@example.com", "pw-bob"
+        yield "bob", "", "again"
+        # Registered by someone else after sign_up_many loaded the taken usernames
+        sign_up("carol", "", "other")
+        yield "carol", "", "pw-carol"
+        yield "dave", "", "pw-dave"
+
+    conflicts = []
+    created = sign_up_many(users(), chunk_size=2, on_conflict=lambda *c: conflicts.append(c))
+    assert created == 2
+    assert conflicts == [(0, "alice"), (2, "bob"), (3, "carol")]
+    assert log_in("bob", "pw-bob")[0] is not None
+    assert log_in("dave", "pw-dave")[0] is not None
+    assert log_in("carol", "other")[0] is not None
@@ -0,0 +1,45 @@
+import sqlite3
+
+from benchmarks.datagen import generate
+from benchmarks.suite import compare, run_suite
+from config import db_config
+
+
+def _dump(path):
+    conn = sqlite3.connect(path)
+    rows = conn.execute("SELECT habit_id, user_id, completed_at, missed FROM Habit_Logs ORDER BY log_id").fetchall()
+    conn.close()
+    return rows
+
+
+def test_generator_is_seeded_and_scales_with_its_arguments(tmp_path):
+    """
+    Test that the same seed reproduces the same rows and that N x M x K shapes the data.
+    """
+    first, second = str(tmp_path / "a.db"), str(tmp_path / "b.db")
+    counts = generate(first, users=3, habits=2, days=30, seed=7)
+    generate(second, users=3, habits=2, days=30, seed=7)
+    db_config.close_connections()
+
+    assert counts["users"] == 3 and counts["habits"] == 6
+    assert counts["logs"] == len(_dump(first)) > 0
+    assert _dump(first) == _dump(second)
+    # Never more than one row per habit and day
+    assert len({(habit_id, stamp[:10]) for habit_id, _, stamp, _ in _dump(first)}) == counts["logs"]
+
+
+def test_suite_reports_time_and_memory_and_compare_flags_regressions(tmp_path):
+    """
+    Test a small suite run end to end and the regression check against a baseline.
+    """
+    report = run_suite(str(tmp_path / "bench.db"), users=2, habits=2, days=20, repeat=1, only="storage.load_*")
+    assert report["meta"]["users"] == 2
+    assert set(report["results"]) >= {"storage.load_all_habits", "storage.load_checkoffs_page"}
+    assert all(result["median_s"] > 0 and result["peak_kib"] >= 0 for result in report["results"].values())
+
+    assert compare(report, report) == []
+    slower = {"results": {name: dict(result, median_s=result["median_s"] * 10 + 1)
+                          for name, result in report["results"].items()}}
+    regressions = compare(slower, report, threshold=0.25)
+    assert {entry["scenario"] for entry in regressions} == set(report["results"])
+    assert all(entry["metric"] == "median_s" and entry["ratio"] > 1.25 for entry in regressions)
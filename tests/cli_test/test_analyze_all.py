@@ -0,0 +1,62 @@
+import csv
+import json
+import pytest
+from click.testing import CliRunner
+
+from benchmarks.datagen import generate
+from cli.commands import cli
+from config import db_config
+from services.habit_service import get_user_analytics
+
+
+@pytest.fixture
+def generated_db(isolated_db_path, tmp_path):
+    """
+    A seeded database with 12 users, analyzed by worker processes.
+    """
+    generate(isolated_db_path, users=12, habits=3, days=40, seed=3)
+    db_config.close_connections()
+    return tmp_path
+
+
+def _expected():
+    return {user_id: json.loads(json.dumps(get_user_analytics(user_id))) for user_id in range(1, 13)}
+
+
+def test_analyze_all_streams_every_user_once(generated_db):
+    """
+    Test that sharded, multi-process results match the single-user analytics.
+    """
+    output = generated_db / "results.ndjson"
+    result = CliRunner().invoke(cli, ["analyze-all", str(output), "--workers", "2", "--shard-size", "5"])
+    assert result.exit_code == 0, result.output
+    assert "✅ Analyzed 12 users" in result.output
+
+    rows = [json.loads(line) for line in output.read_text().splitlines()]
+    assert sorted(row["user_id"] for row in rows) == list(range(1, 13))
+    expected = _expected()
+    for row in rows:
+        assert [row["longest_streak"], row["most_missed"]] == expected[row["user_id"]]
+
+
+def test_analyze_all_resumes_after_an_interruption(generated_db):
+    """
+    Test that --resume keeps finished users, drops a half-written line and fills in the rest.
+    """
+    output = generated_db / "results.csv"
+    assert CliRunner().invoke(cli, ["analyze-all", str(output), "--workers", "1"]).exit_code == 0
+    lines = output.read_text().splitlines(keepends=True)
+    # Header plus four complete users, then a line cut off mid-write
+    output.write_text("".join(lines[:5]) + lines[5][:3])
+
+    result = CliRunner().invoke(cli, ["analyze-all", str(output), "--workers", "2", "--shard-size", "4", "--resume"])
+    assert result.exit_code == 0, result.output
+    assert "✅ Analyzed 8 users" in result.output
+
+    with open(output, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert sorted(int(row["user_id"]) for row in rows) == list(range(1, 13))
+    expected = _expected()
+    for row in rows:
+        longest = expected[int(row["user_id"])][0]
+        assert int(row["longest_streak"]) == longest[1]
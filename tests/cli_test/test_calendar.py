@@ -0,0 +1,30 @@
+import pytest
+from click.testing import CliRunner
+
+from cli.commands import cli
+from models.habits import Habit
+from repository.storage_manager import save_checkoffs_bulk, save_habit
+
+
+@pytest.fixture(autouse=True)
+def calendar_db(migrated_db):
+    """
+    Fixture with a migrated test database: one habit with a few check-offs in March 2025.
+    """
+    save_habit(Habit(None, 1, "Read", "daily", "", None))
+    save_checkoffs_bulk([(1, 1, "2025-03-03 08:00:00", None, 0), (1, 1, "2025-03-03 20:00:00", None, 0),
+                         (1, 1, "2025-03-04 08:00:00", None, 0), (1, 1, "2025-03-05 08:00:00", None, 1)])
+
+
+def test_calendar_renders_a_week_column_per_iso_week():
+    """
+    Test the heatmap layout: weekday rows, one column per week, shades by check-offs per day.
+    """
+    result = CliRunner().invoke(cli, ["--no-daemon", "calendar", "--user-id", "1",
+                                      "--end", "2025-03-09", "--days", "14"])
+    assert result.exit_code == 0
+    lines = result.output.splitlines()
+    assert "📅 Habits for user 1, 2025-02-24 to 2025-03-09:" in lines
+    assert "[1] Read (daily): 2 days done, 1 missed" in lines
+    heatmap = lines[lines.index("[1] Read (daily): 2 days done, 1 missed") + 1:][:8]
+    assert heatmap == ["     Feb", "Mon  ·▒", "     ·░", "Wed  ·x", "     ··", "Fri  ··", "     ··", "Sun  ··"]
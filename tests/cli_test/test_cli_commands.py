@@ -1,11 +1,13 @@
 import pytest
 from click.testing import CliRunner
 from cli.commands import cli
+from models.habits import Habit
+from repository.storage_manager import load_checkoffs_for_habit, save_checkoffs_bulk, save_habit
 
 @pytest.fixture
-def runner():
+def runner(migrated_db):
     """
-    Provides a Click CLI runner for simulating command-line execution.
+    Provides a Click CLI runner for simulating command-line execution against a migrated test database.
     """
     return CliRunner()
 
@@ -21,9 +23,15 @@ def test_delete_command(runner):
     """
     Test the 'delete' CLI command to remove a habit.
     """
+    save_habit(Habit(None, 1, "Stretch", "daily", "", None))
     result = runner.invoke(cli, ["delete"], input="1\n")
     assert result.exit_code == 0
-    assert "🗑️ Habit" in result.output or "❌ Habit not found" in result.output
+    assert "🗑️ Habit 1 deleted." in result.output
+
+    # Deleting it again fails visibly
+    result = runner.invoke(cli, ["delete", "--habit-id", "1"])
+    assert result.exit_code == 1
+    assert "❌ Habit 1 not found." in result.output and "deleted" not in result.output
 
 def test_list_command(runner):
     """
@@ -37,6 +45,48 @@ def test_checkoff_command(runner):
     """
     Test the 'checkoff' CLI command to mark a habit as completed.
     """
+    save_habit(Habit(None, 1, "Stretch", "daily", "", None))
     result = runner.invoke(cli, ["checkoff", "--user-id", "1"], input="1\n")
     assert result.exit_code == 0
-    assert "✅ Habit" in result.output or "❌ Habit not found" in result.output
\ No newline at end of file
+    assert "✅ Habit 1 checked off for user 1." in result.output
+
+    # Unknown habits and other users' habits are rejected by the service, whatever the front end
+    result = runner.invoke(cli, ["--no-daemon", "checkoff", "--habit-id", "2", "--user-id", "1"])
+    assert result.exit_code == 1 and "❌ Habit 2 not found" in result.output
+    result = runner.invoke(cli, ["--no-daemon", "checkoff", "--habit-id", "1", "--user-id", "2"])
+    assert result.exit_code == 1 and "❌ Habit 1 belongs to another user" in result.output
+    assert len(load_checkoffs_for_habit(1)) == 1
+
+def test_analyze_command(runner):
+    """
+    Test the 'analyze' CLI command to summarize streaks and missed habits for a user.
+    """
+    result = runner.invoke(cli, ["analyze", "--user-id", "1"])
+    assert result.exit_code == 0
+    assert "📊 Analytics Summary:" in result.output
+
+def test_analyze_reports_streaks_in_the_habits_periods(runner):
+    """
+    Test that the longest streak of a weekly habit is reported in weeks, not days.
+    """
+    save_habit(Habit(None, 1, "Hike", "weekly", "", None))
+    save_checkoffs_bulk([(1, 1, stamp, "", 0) for stamp in ("2025-03-03 07:00:00", "2025-03-10 07:00:00")])
+    result = runner.invoke(cli, ["--no-daemon", "analyze", "--user-id", "1"])
+    assert result.exit_code == 0
+    assert "🔥 Longest streak: Habit 1 → 2 weeks" in result.output
+
+def test_logs_command(runner):
+    """
+    Test the 'logs' CLI command to page through a habit's check-offs.
+    """
+    result = runner.invoke(cli, ["logs", "--habit-id", "1", "--limit", "5"])
+    assert result.exit_code == 0
+    assert "📋 Check-offs for habit 1:" in result.output or "No check-offs found" in result.output
+
+def test_seed_command(runner):
+    """
+    Test the 'seed' CLI command that loads the demo fixtures on request.
+    """
+    result = runner.invoke(cli, ["seed"])
+    assert result.exit_code == 0
+    assert "Fixtures" in result.output
@@ -0,0 +1,154 @@
+import os
+import shutil
+import socket
+import stat
+import tempfile
+import threading
+import time
+import pytest
+from click.testing import CliRunner
+
+from cli import client
+from cli.commands import cli
+from config import db_config
+from models.habits import Habit
+from repository import storage_manager
+from services.daemon import HabitDaemon
+from services.habit_service import get_user_habits
+from utils.daemon_protocol import socket_path
+
+
+@pytest.fixture(autouse=True)
+def setup_and_teardown_db(migrated_db, monkeypatch):
+    """
+    Migrated database with one habit and one check-off for user 1. The socket lives in a short
+    temporary directory: Unix socket paths are limited to about 100 bytes.
+    """
+    directory = tempfile.mkdtemp(prefix="habitd-")
+    monkeypatch.setenv("HABIT_DAEMON_SOCKET", os.path.join(directory, "daemon.sock"))
+    storage_manager.save_habit(Habit(None, 1, "Read", "daily", "", None))
+    storage_manager.save_checkoff(1, 1)
+    yield
+    client.disconnect()
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+@pytest.fixture
+def daemon():
+    """
+    A daemon for the test database, serving from a background thread.
+    """
+    server = HabitDaemon(socket_path(), workers=2)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    client.disconnect()
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def test_calls_are_forwarded_and_match_in_process_results(daemon):
+    """
+    Test that the client reaches the daemon and gets the same data as a local call.
+    """
+    assert client.daemon_info()["db_path"] == db_config.DB_PATH
+    assert client.call("get_user_habits", 1) == get_user_habits(1)
+    logs, cursor = client.call("get_checkoffs_page", 1, limit=5)
+    assert len(logs) == 1 and cursor is None
+    assert daemon.requests_served == 3
+
+
+def test_errors_are_raised_in_the_client(daemon):
+    """
+    Test that a failing service call surfaces as the same exception type in the CLI process.
+    """
+    with pytest.raises(ValueError, match="engine"):
+        client.call("get_user_analytics", 1, engine="fortran")
+    with pytest.raises(ValueError, match="Unknown daemon operation"):
+        client.call("__import__", "os")
+
+
+def test_cli_commands_use_the_daemon_unless_told_not_to(daemon):
+    """
+    Test that commands forward while the daemon runs, and --no-daemon keeps them in-process.
+    """
+    runner = CliRunner()
+    result = runner.invoke(cli, ["checkoff", "--habit-id", "1", "--user-id", "1"])
+    assert result.exit_code == 0, result.output
+    served = daemon.requests_served
+    assert served == 1
+
+    result = runner.invoke(cli, ["--no-daemon", "list", "--user-id", "1", "--recent", "5"])
+    assert result.exit_code == 0 and "[1] Read (daily)" in result.output
+    assert daemon.requests_served == served
+    assert len(storage_manager.load_checkoffs_for_habit(1)) == 2
+
+    # The service's ownership check reaches the CLI through the daemon as well
+    result = runner.invoke(cli, ["checkoff", "--habit-id", "1", "--user-id", "2"])
+    assert result.exit_code == 1 and "❌ Habit 1 belongs to another user" in result.output
+    assert daemon.requests_served == served + 1
+
+
+def test_stale_socket_falls_back_to_in_process():
+    """
+    Test that a socket file without a daemon behind it is ignored by clients and replaced by a new daemon.
+    """
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(socket_path())
+    stale.close()
+    assert client.daemon_info() is None
+    result = CliRunner().invoke(cli, ["list", "--user-id", "1"])
+    assert result.exit_code == 0 and "[1] Read (daily)" in result.output
+
+    server = HabitDaemon(socket_path(), workers=1)
+    server.server_close()
+    assert not os.path.exists(socket_path())
+
+
+def test_client_reconnects_after_the_daemon_drops_an_idle_connection(daemon, monkeypatch):
+    """
+    Test that a long-lived client (like the interactive menu) survives the daemon's idle timeout.
+    """
+    assert client.call("get_user_habits", 1) == get_user_habits(1)
+    first = client._connection[1]
+    monkeypatch.setattr("services.daemon.IDLE_TIMEOUT", 0.05)
+    # Wait until the poller has dropped the connection
+    for _ in range(100):
+        if client._is_closed(first):
+            break
+        time.sleep(0.05)
+    assert client._is_closed(first)
+    assert client.call("get_user_habits", 1) == get_user_habits(1)
+    assert client._connection[1] is not first
+
+
+def test_idle_connections_do_not_hold_workers(monkeypatch):
+    """
+    Test that a one-worker daemon still answers while more clients than workers sit idle.
+    """
+    server = HabitDaemon(socket_path(), workers=1)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    idle = []
+    try:
+        for _ in range(4):
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.connect(socket_path())
+            idle.append(sock)
+        assert client.daemon_info()["requests_served"] == 1
+        assert client.call("get_user_habits", 1) == get_user_habits(1)
+    finally:
+        for sock in idle:
+            sock.close()
+        client.disconnect()
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+def test_socket_is_only_accessible_to_its_owner(daemon):
+    """
+    Test that the socket file is created with owner-only permissions.
+    """
+    assert stat.S_IMODE(os.stat(socket_path()).st_mode) == 0o600
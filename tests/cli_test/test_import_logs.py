@@ -0,0 +1,42 @@
+import pytest
+from click.testing import CliRunner
+
+from cli.commands import cli
+from repository.storage_manager import iter_checkoffs
+
+pytestmark = pytest.mark.usefixtures("migrated_db")
+
+
+def test_import_logs_from_csv_stdin_skips_invalid_rows():
+    """
+    Test that CSV rows streamed from stdin are imported and bad rows are reported, not fatal.
+    """
+    data = (
+        "habit_id,user_id,completed_at,note,missed\n"
+        "1,1,2025-03-01 07:30:00,early run,0\n"
+        "1,1,not-a-date,,0\n"
+        "1,1,2025-03-02 07:30,,1\n"
+    )
+    result = CliRunner().invoke(cli, ["import-logs", "-"], input=data)
+    assert result.exit_code == 0
+    assert "Imported 2 logs (1 rejected)" in result.output
+    assert "rows/s" in result.output
+    logs = iter_checkoffs(1, newest_first=True)
+    assert [log["completed_at"] for log in logs] == ["2025-03-02 07:30:00", "2025-03-01 07:30:00"]
+
+
+def test_import_logs_from_jsonl_file(tmp_path):
+    """
+    Test that a JSONL file is detected by extension and imported.
+    """
+    source = tmp_path / "logs.jsonl"
+    source.write_text(
+        '{"habit_id": 2, "user_id": 1, "completed_at": "2025-03-01 21:00:00"}\n'
+        '\n'
+        '{"habit_id": 2, "user_id": 1, "completed_at": "2025-03-02 21:00:00", "missed": true}\n'
+        '[1, 2, 3]\n'
+    )
+    result = CliRunner().invoke(cli, ["import-logs", str(source), "--chunk-size", "1"])
+    assert result.exit_code == 0
+    assert "Imported 2 logs (1 rejected)" in result.output
+    assert len(list(iter_checkoffs(2))) == 2
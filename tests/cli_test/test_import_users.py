@@ -0,0 +1,31 @@
+import pytest
+from click.testing import CliRunner
+
+from cli.commands import cli
+from services.auth import log_in, sign_up
+
+pytestmark = pytest.mark.usefixtures("migrated_db")
+
+
+def test_import_users_reports_conflicts_and_invalid_rows_by_line():
+    """
+    Test that users streamed from stdin are created and skipped rows are reported with their line.
+    """
+    sign_up("alice", "", "pw")
+    data = (
+        "username,email,password\n"
+        "alice,a@example.com,x\n"
+        "bob,b@example.com,pw-bob\n"
+        ",nobody@example.com,pw\n"
+        "carol,not-an-email,pw\n"
+        "dave,,pw-dave\n"
+        "bob,,again\n"
+    )
+    result = CliRunner().invoke(cli, ["--no-daemon", "import-users", "-", "--chunk-size", "2"], input=data)
+    assert result.exit_code == 0
+    assert "Created 2 users (2 taken, 2 rejected)" in result.output
+    assert "Line 2 skipped: ❌ Username 'alice' already exists" in result.output
+    assert "Line 4 skipped: ❌ Missing username" in result.output
+    assert "Line 5 skipped" in result.output
+    assert "Line 7 skipped: ❌ Username 'bob' already exists" in result.output
+    assert log_in("dave", "pw-dave")[0] is not None
@@ -0,0 +1,38 @@
+import os
+import pytest
+from click.testing import CliRunner
+
+from cli import commands
+from cli.commands import cli
+from services.auth import sign_up
+
+
+@pytest.fixture(autouse=True)
+def setup_and_teardown_db(migrated_db, monkeypatch, tmp_path):
+    """
+    Migrated database with one registered user, and a session file in a temporary directory.
+    """
+    monkeypatch.setattr(commands, "SESSION_FILE", str(tmp_path / "session"))
+    sign_up("erin", "e@example.com", "pw")
+
+
+def test_login_session_supplies_the_user_id():
+    """
+    Test that after 'login' commands default --user-id to the session user, until 'logout'.
+    """
+    runner = CliRunner()
+    assert "Not logged in" in runner.invoke(cli, ["whoami"]).output
+    assert "Incorrect password" in runner.invoke(cli, ["login", "--username", "erin", "--password", "x"]).output
+    assert not os.path.exists(commands.SESSION_FILE)
+
+    result = runner.invoke(cli, ["login", "--username", "erin", "--password", "pw"])
+    assert result.exit_code == 0 and "Session started for user 1" in result.output
+    assert os.stat(commands.SESSION_FILE).st_mode & 0o077 == 0
+    assert "Logged in as user 1" in runner.invoke(cli, ["whoami"]).output
+    # Accept the prompt's default, which is the logged-in user
+    result = runner.invoke(cli, ["list"], input="\n")
+    assert "📭 No habits found." in result.output and "User ID [1]" in result.output
+
+    runner.invoke(cli, ["logout"])
+    assert not os.path.exists(commands.SESSION_FILE)
+    assert "Not logged in" in runner.invoke(cli, ["whoami"]).output
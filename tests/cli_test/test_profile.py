@@ -0,0 +1,53 @@
+import json
+import sqlite3
+import pytest
+from click.testing import CliRunner
+
+from cli.commands import cli
+from config import db_config
+from models.habits import Habit
+from repository import storage_manager
+from services import habit_service
+
+
+@pytest.fixture(autouse=True)
+def setup_and_teardown_db(migrated_db):
+    """
+    Migrated database with one habit and one check-off for user 1.
+    """
+    storage_manager.save_habit(Habit(None, 1, "Read", "daily", "", None))
+    storage_manager.save_checkoff(1, 1)
+
+
+def test_profile_reports_calls_statements_and_slow_query_plans(tmp_path):
+    """
+    Test that --profile times storage calls and statements, and explains slow ones.
+    """
+    report_path = tmp_path / "profile.json"
+    result = CliRunner().invoke(cli, ["--profile-json", str(report_path), "--slow-ms", "0",
+                                      "list", "--user-id", "1", "--recent", "5"])
+    assert result.exit_code == 0, result.output
+    assert "📋 Habits for user 1:" in result.output
+    assert "⏱️ Profile of 'list'" in result.output
+
+    report = json.loads(report_path.read_text())
+    assert report["command"] == "list"
+    assert report["connections_opened"] == 1
+    calls = {entry["name"]: entry["calls"] for entry in report["functions"]}
+    assert calls["storage_manager.load_all_habits"] == 1
+    assert calls["storage_manager.load_checkoffs_page"] == 1
+    assert report["statements_run"] >= len(report["statements"]) > 0
+    plans = {entry["sql"]: entry["plan"] for entry in report["slow_queries"]}
+    habit_query = next(sql for sql in plans if sql.startswith("SELECT * FROM Habit"))
+    assert any("idx_habit_user" in step for step in plans[habit_query])
+
+
+def test_profile_leaves_no_instrumentation_behind():
+    """
+    Test that functions and the connection class are restored once the command finishes.
+    """
+    original = storage_manager.load_all_habits
+    assert CliRunner().invoke(cli, ["--profile", "list", "--user-id", "1"]).exit_code == 0
+    assert storage_manager.load_all_habits is original
+    assert habit_service.load_all_habits is original
+    assert db_config.CONNECTION_FACTORY is sqlite3.Connection
@@ -0,0 +1,30 @@
+import pytest
+from click.testing import CliRunner
+from datetime import datetime
+
+from cli.commands import cli
+from models.habits import Habit
+from repository.storage_manager import save_habit
+from services.habit_service import get_user_analytics
+
+
+@pytest.fixture(autouse=True)
+def deadline_db(migrated_db):
+    """
+    Fixture with a migrated test database holding one daily habit with a deadline.
+    """
+    save_habit(Habit(None, 1, "Stretch", "daily", "", datetime(2025, 3, 1, 20, 0), datetime(2025, 3, 1)))
+
+
+def test_record_missed_command_feeds_most_missed_analytics():
+    """
+    Test the cron entry point: missed periods are recorded once and show up in the analytics.
+    """
+    runner = CliRunner()
+    result = runner.invoke(cli, ["--no-daemon", "record-missed", "--until", "2025-03-04 12:00"])
+    assert result.exit_code == 0
+    assert "Recorded 3 missed periods (deadlines up to 2025-03-04 12:00:00)" in result.output
+
+    again = runner.invoke(cli, ["--no-daemon", "record-missed", "--until", "2025-03-05 12:00"])
+    assert "Recorded 1 missed periods (deadlines after 2025-03-04 12:00:00 up to 2025-03-05 12:00:00)" in again.output
+    assert get_user_analytics(1, engine="sql") == (None, [(1, 4)])
@@ -0,0 +1,49 @@
+import os
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Cumulative import time allowed for the CLI entry points, as a multiple of the time the same
+# interpreter took to import click (which they all need). Relative, so slow CI runners scale
+# both sides; generous on purpose, it catches new eager imports, not noise.
+STARTUP_BUDGET_FACTOR = 2.5
+# Modules only specific commands need; importing them at startup would slow every launch
+LAZY_MODULES = {"numpy", "multiprocessing", "concurrent.futures", "dotenv", "load_fixtures", "cProfile"}
+
+
+def _import_times(module):
+    """
+    Import a module in a fresh interpreter with -X importtime.
+    Returns a dict of every imported module to its cumulative import time in microseconds.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_cli_commands_import_within_budget_and_lazily():
+    """
+    Test that loading the command module stays under budget and defers command-specific imports.
+    """
+    _import_times("cli.commands")  # first run may have to build the .env cache
+    times = _import_times("cli.commands")
+    assert times["cli.commands"] < STARTUP_BUDGET_FACTOR * times["click"]
+    assert not LAZY_MODULES & set(times)
+
+
+def test_interactive_entry_point_does_not_load_commands_or_fixtures():
+    """
+    Test that main.py reaches its first prompt without importing the command module or fixtures.
+    """
+    times = _import_times("main")
+    assert times["main"] < STARTUP_BUDGET_FACTOR * times["click"]
+    assert "cli.commands" not in times
+    assert not LAZY_MODULES & set(times)
@@ -0,0 +1,82 @@
+import threading
+import pytest
+from config import db_config
+
+
+@pytest.fixture(autouse=True)
+def default_profile(monkeypatch):
+    """
+    Fixture that selects the default PRAGMA profile; conftest points DB_PATH at a throwaway
+    database and closes every pooled connection afterwards.
+    """
+    monkeypatch.setattr(db_config, "DB_PROFILE", "default")
+
+
+def test_connection_is_reused_within_a_thread():
+    """
+    Test that repeated sessions on one thread share a single connection,
+    while another thread gets its own.
+    """
+    with db_config.db_session() as first:
+        pass
+    with db_config.db_session() as second:
+        pass
+    assert first is second
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(db_config.acquire_connection()))
+    thread.start()
+    thread.join()
+    assert other[0] is not first
+
+
+def test_default_profile_pragmas_are_applied():
+    """
+    Test that pooled connections are configured with the selected PRAGMA profile.
+    """
+    with db_config.db_session() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+
+
+def test_session_rolls_back_on_error_and_commits_on_success():
+    """
+    Test that db_session() commits on success and rolls back when an error escapes.
+    """
+    with db_config.db_session() as conn:
+        conn.execute("CREATE TABLE t (x INTEGER)")
+    with pytest.raises(RuntimeError):
+        with db_config.db_session() as conn:
+            conn.execute("INSERT INTO t VALUES (1)")
+            raise RuntimeError("boom")
+    with db_config.db_session() as conn:
+        conn.execute("INSERT INTO t VALUES (2)")
+    with db_config.db_session() as conn:
+        assert [row[0] for row in conn.execute("SELECT x FROM t")] == [2]
+
+
+def test_unknown_profile_is_rejected(monkeypatch):
+    """
+    Test that selecting an unknown PRAGMA profile fails loudly.
+    """
+    monkeypatch.setattr(db_config, "DB_PROFILE", "turbo")
+    with pytest.raises(ValueError):
+        db_config.acquire_connection()
+
+
+def test_dotenv_is_parsed_in_memory_like_python_dotenv(tmp_path):
+    """
+    Test that simple .env files are read without python-dotenv and give the same values, that
+    anything else falls back to it, and that the parsed values (secrets) never reach the disk.
+    """
+    dotenv = pytest.importorskip("dotenv")
+    simple = tmp_path / "simple.env"
+    simple.write_text("# settings\nexport DB_PATH=./db/habits.db\nAPI_SECRET='hunter2'\nEMPTY=\n")
+    complex_ = tmp_path / "complex.env"
+    complex_.write_text('GREETING="hello world" # inline comment\nHOME_DB=${DB_PATH}\n')
+    assert db_config._parse_simple_dotenv(simple.read_text()) is not None
+    assert db_config._parse_simple_dotenv(complex_.read_text()) is None
+    for env in (simple, complex_):
+        assert db_config._dotenv_values(str(env)) == dict(dotenv.dotenv_values(str(env)))
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["complex.env", "simple.env"]
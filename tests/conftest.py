@@ -0,0 +1,25 @@
+import pytest
+
+from config import db_config
+from init_db import initialize_schema
+
+
+@pytest.fixture(autouse=True)
+def isolated_db_path(tmp_path, monkeypatch):
+    """
+    Point every test at its own database file under tmp_path, so the bundled db/habits.db
+    is never opened (let alone migrated or written) by the test suite.
+    """
+    path = str(tmp_path / "habits.db")
+    monkeypatch.setattr(db_config, "DB_PATH", path)
+    yield path
+    db_config.close_connections()
+
+
+@pytest.fixture
+def migrated_db(isolated_db_path):
+    """
+    The test's database with every migration applied.
+    """
+    initialize_schema()
+    return isolated_db_path
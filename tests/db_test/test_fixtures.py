@@ -0,0 +1,105 @@
+import io
+import json
+import pytest
+
+from config import db_config
+from load_fixtures import FIXTURE_FILE, iter_fixture_records, load_fixtures
+from repository.storage_manager import load_streak_summary
+
+pytestmark = pytest.mark.usefixtures("migrated_db")
+
+
+@pytest.fixture
+def fixture_path(tmp_path):
+    """
+    Where _write_fixture writes the generated fixture file.
+    """
+    return str(tmp_path / "fixtures.json")
+
+
+def _write_fixture(path, users=3, habits_per_user=2, logs_per_habit=40):
+    """
+    Write a multi-user fixture file: consecutive daily logs, so every habit ends on a full streak.
+    """
+    data = {"__doc__": {"description": "generated"}, "users": [], "habits": [], "habit_logs": []}
+    for user_id in range(1, users + 1):
+        data["users"].append({"user_id": user_id, "username": f"user{user_id}",
+                              "email": f"user{user_id}@example.com", "password": "secret"})
+        for n in range(habits_per_user):
+            habit_id = (user_id - 1) * habits_per_user + n + 1
+            data["habits"].append({"habit_id": habit_id, "user_id": user_id, "name": f"Habit {habit_id}",
+                                   "frequency": "daily", "description": "", "deadline_time": None})
+            for day in range(logs_per_habit):
+                data["habit_logs"].append({"habit_id": habit_id, "user_id": user_id,
+                                           "completed_at": f"2025-01-{1 + day % 28:02d} 08:{day // 28:02d}:00",
+                                           "note": "", "missed": 0})
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+    return data
+
+
+def _counts():
+    with db_config.db_session() as conn:
+        return tuple(conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                     for table in ("User", "Habit", "Habit_Logs"))
+
+
+@pytest.mark.parametrize("read_size", [1, 7, 4096])
+def test_stream_parser_matches_json_load(read_size):
+    """
+    Test that incremental parsing yields every array element, whatever the read boundaries.
+    """
+    text = json.dumps({"a": [1, 22.5, {"b": "x,]}"}, [3]], "n": 12345, "empty": [], "user": {"user_id": 7}})
+    records = list(iter_fixture_records(io.StringIO(text), read_size=read_size))
+    assert records == [("a", 1), ("a", 22.5), ("a", {"b": "x,]}"}), ("a", [3]), ("n", 12345), ("user", {"user_id": 7})]
+
+
+def test_multi_user_file_is_loaded_in_chunks_and_recorded(fixture_path):
+    """
+    Test a chunked load of a multi-user file, and that loading it again is a no-op.
+    """
+    data = _write_fixture(fixture_path)
+    commits = []
+    loaded = load_fixtures(fixture_path, chunk_size=50, on_chunk=lambda section, total: commits.append(section))
+
+    assert loaded == {"users": 3, "habits": 6, "habit_logs": 240}
+    assert _counts() == (3, 6, 240)
+    assert commits.count("habit_logs") == 5
+    assert load_streak_summary(1)["total_completions"] == 40
+    assert load_fixtures(fixture_path) == {"users": 0, "habits": 0, "habit_logs": 0}
+    assert _counts() == (3, 6, len(data["habit_logs"]))
+
+
+def test_interrupted_load_resumes_after_the_last_committed_chunk(fixture_path):
+    """
+    Test that a load failing mid-way continues without duplicating committed rows.
+    """
+    _write_fixture(fixture_path)
+
+    def fail_after_two_log_chunks(section, total):
+        if section == "habit_logs" and total == 100:
+            raise RuntimeError("simulated crash")
+
+    with pytest.raises(RuntimeError):
+        load_fixtures(fixture_path, chunk_size=50, on_chunk=fail_after_two_log_chunks)
+    assert _counts() == (3, 6, 100)
+
+    assert load_fixtures(fixture_path, chunk_size=50) == {"users": 0, "habits": 0, "habit_logs": 140}
+    assert _counts() == (3, 6, 240)
+    assert load_streak_summary(6)["total_completions"] == 40
+
+
+def test_legacy_single_user_fixture_and_previously_seeded_database():
+    """
+    Test the bundled single-user file, and that a database seeded by the old loader is left alone.
+    """
+    load_fixtures(FIXTURE_FILE)
+    before = _counts()
+    assert before[0] == 1 and before[2] > 0
+
+    with db_config.db_session() as conn:
+        conn.execute("DELETE FROM Fixture_Loads")
+    assert load_fixtures(FIXTURE_FILE) == {"users": 0, "habits": 0, "habit_logs": 0}
+    assert _counts() == before
+    with db_config.db_session() as conn:
+        assert conn.execute("SELECT status FROM Fixture_Loads").fetchone()[0] == "complete"
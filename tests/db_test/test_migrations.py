@@ -0,0 +1,87 @@
+import sqlite3
+import pytest
+from datetime import datetime
+
+from config import db_config
+from init_db import apply_migrations, get_schema_version, list_migrations
+from models.habits import Habit
+from repository.storage_manager import (
+    save_habit,
+    load_all_habits,
+    load_checkoffs_for_habit,
+    check_if_missed,
+    iter_user_logs,
+    iter_checkoffs,
+    load_checkoffs_page,
+)
+
+pytestmark = pytest.mark.usefixtures("migrated_db")
+
+
+def _query_plans(action):
+    """
+    Run a storage call while tracing its SQL, then EXPLAIN QUERY PLAN every SELECT it issued.
+    """
+    conn = db_config.acquire_connection()
+    statements = []
+    conn.set_trace_callback(statements.append)
+    try:
+        action()
+    finally:
+        conn.set_trace_callback(None)
+    plans = {}
+    for sql in statements:
+        if sql.lstrip().upper().startswith("SELECT"):
+            rows = conn.execute("EXPLAIN QUERY PLAN " + sql).fetchall()
+            plans[sql] = " | ".join(row[-1] for row in rows)
+    assert plans, "expected the storage call to run at least one SELECT"
+    return plans
+
+
+def test_migrations_are_versioned_and_idempotent():
+    """
+    Test that every migration is recorded once and re-running applies nothing.
+    """
+    conn = sqlite3.connect(db_config.DB_PATH)
+    latest = list_migrations()[-1][0]
+    assert get_schema_version(conn) == latest
+    assert apply_migrations(conn) == []
+    conn.close()
+
+
+def test_migrations_upgrade_an_existing_database_in_place(tmp_path):
+    """
+    Test that a database created before migrations existed keeps its data and gains the indexes.
+    """
+    legacy = tmp_path / "legacy.db"
+    conn = sqlite3.connect(legacy)
+    with open("db/habits.sql") as f:
+        conn.executescript(f.read())
+    conn.execute("INSERT INTO Habit (user_id, name, frequency) VALUES (1, 'Run', 'daily')")
+    conn.commit()
+
+    assert apply_migrations(conn) == [version for version, _, _ in list_migrations()]
+    indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {"idx_habit_logs_habit_completed_id", "idx_habit_user"} <= indexes
+    assert conn.execute("SELECT COUNT(*) FROM Habit").fetchone()[0] == 1
+    conn.close()
+
+
+@pytest.mark.parametrize("action", [
+    lambda: load_all_habits(1),
+    lambda: load_checkoffs_for_habit(1),
+    lambda: check_if_missed(1, datetime.now()),
+    lambda: list(iter_user_logs(1)),
+    lambda: list(iter_checkoffs(1, since="2025-01-01", until="2025-02-01", after=("2025-01-10", 5))),
+    lambda: load_checkoffs_page(1, limit=10, after=("2025-01-10 08:00:00", 5)),
+])
+
+
+def test_storage_reads_use_indexes(action):
+    """
+    Test that the storage read paths are served by an index (or a rowid lookup), never a full table scan.
+    """
+    save_habit(Habit(None, 1, "Read", "daily", "", None))
+    for sql, plan in _query_plans(action).items():
+        assert "USING" in plan and ("INDEX" in plan or "PRIMARY KEY" in plan), f"{sql!r} -> {plan}"
+        assert "SCAN" not in plan and "TEMP B-TREE" not in plan, f"{sql!r} -> {plan}"
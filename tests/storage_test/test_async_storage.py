@@ -0,0 +1,90 @@
+import asyncio
+import threading
+import pytest
+
+from repository import async_storage, write_buffer
+from repository.storage_manager import load_streak_summary
+from services import async_habit_service
+
+
+@pytest.fixture(autouse=True)
+def setup_and_teardown_db(migrated_db):
+    """
+    Fresh migrated database per test; reader/writer threads and their connections are
+    shut down before the file is removed.
+    """
+    yield
+    async_storage.shutdown()
+
+
+async def _simulated_user(user_id):
+    # A typical session: create two habits, check both off, browse and analyze
+    for name in ("Read", "Walk"):
+        await async_habit_service.create_habit(user_id, name, "daily", "", None)
+    habits = await async_habit_service.get_user_habits(user_id)
+    await asyncio.gather(*(async_habit_service.checkoff_habit(habit["habit_id"], user_id) for habit in habits))
+    logs = []
+    for habit in habits:
+        logs += [log async for log in async_storage.iter_checkoffs(habit["habit_id"], page_size=1)]
+    longest, missed = await async_habit_service.get_user_analytics(user_id, engine="sql")
+    return len(habits), len(logs), longest, missed
+
+
+def test_hundreds_of_concurrent_users():
+    """
+    Test that 300 simulated users running at once all see exactly their own data.
+    """
+    async def main():
+        return await asyncio.gather(*(_simulated_user(user_id) for user_id in range(1, 301)))
+
+    results = asyncio.run(main())
+
+    assert len(results) == 300
+    for habit_count, log_count, longest, missed in results:
+        assert (habit_count, log_count) == (2, 2)
+        assert longest[1] == 1 and missed == []
+
+
+def test_writes_are_serialized_on_one_thread_while_reads_fan_out():
+    """
+    Test that every write runs on the single writer thread and reads use the bounded pool.
+    """
+    def thread_name():
+        return threading.current_thread().name
+
+    async def main():
+        writers = await asyncio.gather(*(async_storage.run_write(thread_name) for _ in range(50)))
+        readers = await asyncio.gather(*(async_storage.run_read(thread_name) for _ in range(50)))
+        return set(writers), set(readers)
+
+    writers, readers = asyncio.run(main())
+    assert len(writers) == 1 and next(iter(writers)).startswith("habit-db-write")
+    assert 1 <= len(readers) <= async_storage.READ_WORKERS
+    assert all(name.startswith("habit-db-read") for name in readers)
+
+
+def test_async_checkoff_waits_for_the_group_commit(monkeypatch):
+    """
+    Test that under group commit the coroutine returns only once the check-off is durable,
+    and that a failed flush reaches the caller.
+    """
+    async def main():
+        habit = await async_habit_service.create_habit(1, "Read", "daily", "", None)
+        await async_habit_service.checkoff_habit(habit.habit_id, 1)
+        return habit.habit_id
+
+    # With a long max_delay, only the size threshold (one check-off) flushes in time
+    buffer = write_buffer.start_checkoff_buffer(max_batch=1, max_delay=60)
+    try:
+        habit_id = asyncio.run(main())
+        assert buffer.written == 1
+        assert load_streak_summary(habit_id)["total_completions"] == 1
+
+        def fail(checkoffs):
+            raise RuntimeError("disk full")
+
+        monkeypatch.setattr(write_buffer, "save_checkoff_batch", fail)
+        with pytest.raises(RuntimeError, match="disk full"):
+            asyncio.run(async_habit_service.checkoff_habit(habit_id, 1))
+    finally:
+        write_buffer.stop_checkoff_buffer()
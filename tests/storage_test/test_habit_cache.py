@@ -0,0 +1,91 @@
+import sqlite3
+import pytest
+
+from config import db_config
+from models.habits import Habit
+from repository.cache import TTLCache
+from repository.storage_manager import HABIT_CACHE, save_habit, delete_habit, load_all_habits
+
+
+@pytest.fixture(autouse=True)
+def setup_and_teardown_db(migrated_db, monkeypatch):
+    """
+    Fresh migrated database and an empty cache with zeroed counters for every test.
+    """
+    HABIT_CACHE.clear()
+    for counter in ("hits", "misses", "evictions", "expirations", "invalidations"):
+        monkeypatch.setattr(HABIT_CACHE, counter, 0)
+
+
+def test_ttl_cache_evicts_least_recently_used_and_expires():
+    """
+    Test LRU eviction order, TTL expiry and the counters used for sizing.
+    """
+    now = [0.0]
+    cache = TTLCache(maxsize=2, ttl=10, clock=lambda: now[0])
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == (True, 1)   # 'a' is now the most recently used
+    cache.put("c", 3)                    # so 'b' is evicted
+    assert cache.get("b") == (False, None)
+    now[0] = 11.0
+    assert cache.get("a") == (False, None)
+    assert cache.stats() == {
+        "size": 1, "maxsize": 2, "ttl": 10, "hits": 1, "misses": 2, "evictions": 1,
+        "expirations": 1, "invalidations": 0, "hit_rate": 1 / 3,
+    }
+
+
+def test_writes_invalidate_and_reads_are_served_from_the_cache():
+    """
+    Test that repeated reads hit the cache and save_habit/delete_habit invalidate their user only.
+    """
+    save_habit(Habit(None, 1, "Read", "daily", "", None))
+    save_habit(Habit(None, 2, "Walk", "daily", "", None))
+    assert len(load_all_habits(1)) == 1
+    load_all_habits(2)
+    habits = load_all_habits(1)
+    habits[0]["name"] = "changed by the caller"
+    assert load_all_habits(1)[0]["name"] == "Read"
+    assert (HABIT_CACHE.hits, HABIT_CACHE.misses) == (2, 2)
+
+    save_habit(Habit(None, 1, "Write", "daily", "", None))
+    assert [habit["name"] for habit in load_all_habits(1)] == ["Read", "Write"]
+    delete_habit(1)
+    assert [habit["name"] for habit in load_all_habits(1)] == ["Write"]
+    load_all_habits(2)
+    assert (HABIT_CACHE.hits, HABIT_CACHE.misses) == (3, 4)
+
+
+def test_changes_from_another_connection_are_detected_via_data_version():
+    """
+    Test that a commit made outside the storage layer (e.g. another process) is never hidden.
+    """
+    save_habit(Habit(None, 1, "Read", "daily", "", None))
+    assert len(load_all_habits(1)) == 1
+    other = sqlite3.connect(db_config.DB_PATH)
+    other.execute("INSERT INTO Habit (user_id, name, frequency) VALUES (1, 'Sneaky', 'daily')")
+    other.commit()
+    other.close()
+    assert [habit["name"] for habit in load_all_habits(1)] == ["Read", "Sneaky"]
+
+
+def test_other_users_writes_keep_entries_and_stale_puts_are_never_served():
+    """
+    Test per-user versioning: commits for user 2 (check-offs included) leave user 1's entry valid,
+    and a list stored with an outdated version (a reader racing a writer) is not served.
+    """
+    save_habit(Habit(None, 1, "Read", "daily", "", None))
+    save_habit(Habit(None, 2, "Walk", "daily", "", None))
+    load_all_habits(1)
+    other = sqlite3.connect(db_config.DB_PATH)
+    other.execute("INSERT INTO Habit_Logs (habit_id, user_id) VALUES (2, 2)")
+    other.commit()
+    other.close()
+    load_all_habits(1)
+    assert (HABIT_CACHE.hits, HABIT_CACHE.misses) == (1, 1)
+
+    stale_version, stale_habits = HABIT_CACHE.get((db_config.DB_PATH, 1))[1]
+    save_habit(Habit(None, 1, "Write", "daily", "", None))
+    HABIT_CACHE.put((db_config.DB_PATH, 1), (stale_version, stale_habits))
+    assert [habit["name"] for habit in load_all_habits(1)] == ["Read", "Write"]
@@ -1,66 +1,33 @@
-import sqlite3
-import os
 import pytest
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from repository.storage_manager import (
     save_habit,
     delete_habit,
     load_all_habits,
     save_checkoff,
+    save_checkoff_batch,
+    save_checkoffs_bulk,
     load_checkoffs_for_habit,
+    iter_user_logs,
+    delete_checkoff,
+    load_streak_summary,
+    rebuild_streak_summaries,
+    iter_user_log_records,
+    load_checkoff_records,
+    load_user_log_columns,
+    check_if_missed,
+    iter_checkoffs,
+    load_checkoffs_page,
+    record_missed_deadlines,
+    load_daily_rollup,
+    rebuild_daily_rollup,
 )
 from config import db_config
+from repository import storage_manager
 from models.habits import Habit
 
-TEST_DB_PATH = "test_habits.db"
-
-
-@pytest.fixture(autouse=True)
-def setup_and_teardown_db(monkeypatch):
-    """
-   Pytest fixture that automatically runs before and after each test.
-
-   - Overrides the application's DB path to a test-specific SQLite DB
-   - Creates the necessary Habit and Habit_Logs tables
-   - Deletes the test DB after the test is finished to ensure isolation
-   """
-    # Redirect the real DB_PATH to use a temporary file for testing
-    monkeypatch.setattr(db_config, "DB_PATH", TEST_DB_PATH)
-
-    # Create test DB schema
-    conn = sqlite3.connect(TEST_DB_PATH)
-    cursor = conn.cursor()
-
-    cursor.executescript("""
-    CREATE TABLE IF NOT EXISTS Habit (
-        habit_id INTEGER PRIMARY KEY AUTOINCREMENT,
-        user_id INTEGER NOT NULL,
-        name TEXT NOT NULL,
-        frequency TEXT NOT NULL,
-        description TEXT,
-        deadline_time DATETIME,
-        created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-    );
-
-    CREATE TABLE IF NOT EXISTS Habit_Logs (
-        log_id INTEGER PRIMARY KEY AUTOINCREMENT,
-        habit_id INTEGER NOT NULL,
-        user_id INTEGER NOT NULL,
-        completed_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-        note TEXT,
-        missed BOOLEAN DEFAULT 0
-    );
-    """)
-
-    conn.commit()
-    conn.close()
-
-    # Test runs here
-    yield
-
-    if os.path.exists(TEST_DB_PATH):
-        os.remove(TEST_DB_PATH)
+pytestmark = pytest.mark.usefixtures("migrated_db")
 
 
 def test_save_and_load_habit():
@@ -128,4 +95,244 @@ def test_save_and_load_checkoff():
     # Step 4: Load logs and validate
     logs = load_checkoffs_for_habit(habit_id)
     assert len(logs) == 1
-    assert logs[0]["missed"] == 0
\ No newline at end of file
+    assert logs[0]["missed"] == 0
+
+
+def test_bulk_checkoffs_are_committed_in_chunks():
+    """
+    Test that bulk check-offs from a generator are all stored, one transaction per chunk.
+    """
+    records = (
+        (1, 1, f"2025-01-{day:02d} 08:00:00", None, day % 2)
+        for day in range(1, 26)
+    )
+    progress = []
+    inserted = save_checkoffs_bulk(records, chunk_size=10, on_chunk=progress.append)
+    assert inserted == 25
+    assert progress == [10, 20, 25]
+    logs = list(iter_checkoffs(1))
+    assert len(logs) == 25
+    assert sum(log["missed"] for log in logs) == 13
+    # Missed markers are not check-offs
+    assert len(load_checkoffs_for_habit(1)) == 12
+
+
+def test_bulk_checkoffs_rebuild_each_touched_habit_once(monkeypatch):
+    """
+    Test that a habit spread over many chunks gets its streak summary rebuilt once, at the end.
+    """
+    save_habit(Habit(None, 1, "Read", "daily", "", None))
+    save_habit(Habit(None, 1, "Walk", "daily", "", None))
+    rebuilt = []
+    rebuild = storage_manager._rebuild_streaks
+    monkeypatch.setattr(storage_manager, "_rebuild_streaks",
+                        lambda conn, habit_id=None: rebuilt.append(habit_id) or rebuild(conn, habit_id))
+    records = [(1 + day % 2, 1, f"2025-01-{day:02d} 08:00:00", None, 0) for day in range(1, 31)]
+    assert save_checkoffs_bulk(records, chunk_size=4) == 30
+    assert sorted(rebuilt) == [1, 2]
+    assert load_streak_summary(1)["total_completions"] == 15
+
+
+def test_iter_user_logs_streams_habits_and_logs_in_one_ordered_query():
+    """
+    Test that a user's habits and logs come back joined, ordered by (habit_id, completed_at),
+    including habits that have no logs yet.
+    """
+    for name in ("First", "Second", "Empty"):
+        save_habit(Habit(None, 1, name, "daily", "", None))
+    save_habit(Habit(None, 2, "Other user", "daily", "", None))
+    save_checkoffs_bulk([
+        (2, 1, "2025-01-02 08:00:00", None, 0),
+        (1, 1, "2025-01-03 08:00:00", None, 1),
+        (1, 1, "2025-01-01 08:00:00", None, 0),
+        (4, 2, "2025-01-01 08:00:00", None, 0),
+    ])
+    rows = list(iter_user_logs(1, chunk_size=2))
+    assert [(r["habit_id"], r["completed_at"]) for r in rows] == [
+        (1, "2025-01-01 08:00:00"),
+        (1, "2025-01-03 08:00:00"),
+        (2, "2025-01-02 08:00:00"),
+        (3, None),
+    ]
+    assert rows[1]["missed"] == 1 and rows[0]["name"] == "First"
+
+
+def test_streak_summary_is_maintained_on_checkoff_backfill_and_delete():
+    """
+    Test that Habit_Streaks follows new, same-day, backfilled and deleted check-offs.
+    """
+    save_habit(Habit(None, 1, "Streaky", "daily", "", None))
+    today = datetime.now().date()
+
+    def day(offset):
+        return (today - timedelta(days=offset)).strftime("%Y-%m-%d 07:00:00")
+
+    save_checkoffs_bulk([(1, 1, day(2), None, 0), (1, 1, day(1), None, 0), (1, 1, day(5), None, 1)])
+    summary = load_streak_summary(1)
+    assert (summary["current_streak"], summary["longest_streak"], summary["total_completions"]) == (2, 2, 2)
+
+    # Today extends the streak in O(1); a second check-off today only bumps the total
+    save_checkoff(1, 1)
+    save_checkoff(1, 1)
+    summary = load_streak_summary(1)
+    assert (summary["current_streak"], summary["longest_streak"], summary["total_completions"]) == (3, 3, 4)
+    assert summary["last_completed_day"] == today.isoformat()
+
+    # Backfilling an older run keeps the current streak but can raise the longest one
+    save_checkoffs_bulk([(1, 1, day(offset), None, 0) for offset in range(10, 14)])
+    assert load_streak_summary(1)["longest_streak"] == 4
+
+    # Deleting yesterday's log splits the current streak
+    yesterday_log = next(log for log in load_checkoffs_for_habit(1) if log["completed_at"] == day(1))
+    assert delete_checkoff(yesterday_log["log_id"]) is True
+    summary = load_streak_summary(1)
+    assert (summary["current_streak"], summary["longest_streak"], summary["total_completions"]) == (1, 4, 7)
+
+
+def test_weekly_streak_summary_counts_iso_weeks():
+    """
+    Test that a weekly habit's summary counts ISO weeks, incrementally and after a rebuild.
+    """
+    save_habit(Habit(None, 1, "Long run", "weekly", "", None))
+    # Monday and Sunday of one week, the next Monday, then a week skipped
+    save_checkoff_batch([(1, 1, datetime(2025, 3, day, 9, 0)) for day in (3, 9, 10)])
+    summary = load_streak_summary(1)
+    assert (summary["current_streak"], summary["longest_streak"], summary["total_completions"]) == (2, 2, 3)
+    save_checkoff_batch([(1, 1, datetime(2025, 3, 26, 9, 0))])
+    incremental = load_streak_summary(1)
+    assert (incremental["current_streak"], incremental["longest_streak"]) == (1, 2)
+    rebuild_streak_summaries()
+    assert load_streak_summary(1) == incremental
+
+
+def test_rebuild_matches_incremental_summary():
+    """
+    Test that a full rebuild from Habit_Logs reproduces the incrementally maintained rows.
+    """
+    for name in ("A", "B"):
+        save_habit(Habit(None, 1, name, "daily", "", None))
+    save_checkoffs_bulk([(1, 1, f"2025-02-{d:02d} 09:00:00", None, 0) for d in (1, 2, 3, 7)])
+    save_checkoff(2, 1)
+    before = [load_streak_summary(habit_id) for habit_id in (1, 2)]
+    assert rebuild_streak_summaries() == 2
+    assert [load_streak_summary(habit_id) for habit_id in (1, 2)] == before
+    assert before[0]["longest_streak"] == 3 and before[0]["current_streak"] == 1
+
+
+def test_compact_log_records_are_parsed_once_and_interned():
+    """
+    Test that record readers return LogRecords with datetimes, interned habit strings,
+    dict-style access, and an equivalent columnar form.
+    """
+    save_habit(Habit(None, 1, "Compact", "daily", "", None))
+    save_checkoffs_bulk([(1, 1, "2025-01-01 08:00:00", None, 0), (1, 1, "2025-01-02 08:00:00", "ok", 1)])
+    save_checkoff(1, 1)  # stored with microseconds
+
+    records = list(iter_user_log_records(1))
+    assert [r.completed_at.date().isoformat() for r in records[:2]] == ["2025-01-01", "2025-01-02"]
+    assert isinstance(records[-1].completed_at, datetime)
+    assert records[0].name is records[1].name and records[0].frequency is records[2].frequency
+    assert records[1]["note"] == "ok" and records[1].get("missed") == 1
+
+    assert [r.log_id for r in load_checkoff_records(1)] == [3, 2, 1]
+    columns = load_user_log_columns(1)
+    assert list(columns.habit_ids) == [1, 1, 1]
+    assert list(columns.days[:2]) == [20089, 20090]  # days since 1970-01-01
+    assert list(columns.missed) == [0, 1, 0]
+    # Timestamps with microseconds no longer trip up the deadline check
+    assert check_if_missed(1, datetime(2000, 1, 1)) is True
+
+
+def test_keyset_pages_walk_a_date_range_without_gaps_or_repeats():
+    """
+    Test that keyset pages cover a date range exactly once, including logs sharing a timestamp.
+    """
+    save_habit(Habit(None, 1, "Read", "daily", "", None))
+    start = datetime(2025, 1, 1, 8, 0)
+    # Two logs per day with the same timestamp, so the log_id tie-breaker matters
+    save_checkoffs_bulk((1, 1, start + timedelta(days=day), None, False) for day in range(20) for _ in range(2))
+
+    in_range = list(iter_checkoffs(1, since=datetime(2025, 1, 5), until=datetime(2025, 1, 15)))
+    assert len(in_range) == 20
+    assert in_range[0]["completed_at"].startswith("2025-01-05")
+    assert in_range[-1]["completed_at"].startswith("2025-01-14")
+    assert in_range == sorted(in_range, key=lambda log: (log["completed_at"], log["log_id"]))
+
+    seen, cursor = [], None
+    while True:
+        page, cursor = load_checkoffs_page(1, limit=7, after=cursor,
+                                           since=datetime(2025, 1, 5), until=datetime(2025, 1, 15))
+        seen.extend(log["log_id"] for log in page)
+        if cursor is None:
+            break
+    assert seen == [log["log_id"] for log in reversed(in_range)]
+
+    # A full last page does not hand out a cursor to an empty page
+    page, cursor = load_checkoffs_page(1, limit=40)
+    assert len(page) == 40 and cursor is None
+
+
+def test_missed_deadlines_are_recorded_once_per_period():
+    """
+    Test that every period whose deadline passed without a check-off gets one missed log,
+    that the watermark limits each run to new deadlines, and that re-evaluating is a no-op.
+    """
+    created = datetime(2025, 3, 1)
+    save_habit(Habit(None, 1, "Daily", "daily", "", datetime(2025, 3, 1, 20, 0), created))
+    save_habit(Habit(None, 1, "Weekly", "weekly", "", datetime(2025, 3, 3, 18, 0), created))
+    save_habit(Habit(None, 1, "No deadline", "daily", "", None, created))
+    # Inside the period due on 03-02 20:00, and after the 03-03 deadline (so in the 03-04 period)
+    save_checkoffs_bulk([(1, 1, "2025-03-02 10:00:00", None, 0), (1, 1, "2025-03-03 21:00:00", None, 0)])
+
+    first = record_missed_deadlines(datetime(2025, 3, 5, 12, 0))
+    assert first == {"missed": 3, "since": None, "until": "2025-03-05 12:00:00"}
+    missed = [(log["habit_id"], log["completed_at"]) for log in iter_user_logs(1) if log["missed"]]
+    assert missed == [(1, "2025-03-01 20:00:00"), (1, "2025-03-03 20:00:00"), (2, "2025-03-03 18:00:00")]
+
+    assert record_missed_deadlines(datetime(2025, 3, 5, 12, 0))["missed"] == 0
+    # 03-05 to 03-10 for the daily habit, 03-10 for the weekly one
+    assert record_missed_deadlines(datetime(2025, 3, 11, 12, 0))["missed"] == 7
+
+    # Without the watermark every period is evaluated again, but none is recorded twice
+    with db_config.db_session() as conn:
+        conn.execute("DELETE FROM Job_Watermarks")
+    assert record_missed_deadlines(datetime(2025, 3, 11, 12, 0))["missed"] == 0
+
+
+def test_daily_rollup_follows_every_write_path():
+    """
+    Test that Habit_Daily_Rollup tracks bulk, live, missed and deleted logs, and that a
+    rebuild from Habit_Logs gives the same rows.
+    """
+    save_habit(Habit(None, 1, "Read", "daily", "", datetime(2025, 3, 2, 20, 0), datetime(2025, 3, 1)))
+    save_habit(Habit(None, 2, "Other user", "daily", "", None))
+    save_checkoffs_bulk([(1, 1, "2025-03-01 07:00:00", None, 0), (1, 1, "2025-03-01 19:00:00", None, 0),
+                         (2, 2, "2025-03-01 07:00:00", None, 0)])
+    save_checkoff_batch([(1, 1, datetime(2025, 3, 3, 9, 0))])
+    record_missed_deadlines(datetime(2025, 3, 3, 12, 0))
+    assert load_daily_rollup(1, "2025-03-01", "2025-03-31") == [
+        (1, "2025-03-01", 2, 0), (1, "2025-03-02", 0, 1), (1, "2025-03-03", 1, 0),
+    ]
+    assert load_daily_rollup(1, "2025-03-02", "2025-03-02") == [(1, "2025-03-02", 0, 1)]
+
+    log_id = next(log["log_id"] for log in load_checkoffs_for_habit(1) if log["completed_at"].startswith("2025-03-03"))
+    delete_checkoff(log_id)
+    incremental = load_daily_rollup(1, "2025-03-01", "2025-03-31")
+    assert incremental == [(1, "2025-03-01", 2, 0), (1, "2025-03-02", 0, 1)]
+    assert rebuild_daily_rollup() == 3
+    assert load_daily_rollup(1, "2025-03-01", "2025-03-31") == incremental
+
+
+def test_missed_markers_are_not_check_offs_and_runs_start_at_habit_creation():
+    """
+    Test that a missed marker never counts as the last check-off, and that a first run only
+    evaluates deadlines after each habit was created.
+    """
+    save_habit(Habit(None, 1, "Old deadline", "daily", "", datetime(2020, 1, 1, 20, 0), datetime(2025, 3, 4, 9, 0)))
+    save_checkoffs_bulk([(1, 1, "2025-03-04 10:00:00", None, 0)])
+    assert record_missed_deadlines(datetime(2025, 3, 6, 12, 0))["missed"] == 1
+    assert [log["missed"] for log in iter_checkoffs(1)] == [0, 1]
+
+    assert [log["completed_at"] for log in load_checkoffs_for_habit(1)] == ["2025-03-04 10:00:00"]
+    # The last check-off (03-04 10:00) was before this deadline, although the 03-05 marker is later
+    assert check_if_missed(1, datetime(2025, 3, 4, 20, 0)) is False
@@ -0,0 +1,106 @@
+import threading
+import pytest
+
+from config import db_config
+from models.habits import Habit
+from repository.storage_manager import save_habit, load_checkoffs_for_habit, load_streak_summary
+from repository.write_buffer import CheckoffBuffer, start_checkoff_buffer, stop_checkoff_buffer
+from services.habit_service import checkoff_habit
+
+
+@pytest.fixture(autouse=True)
+def setup_and_teardown_db(migrated_db):
+    """
+    Fresh migrated database with two habits for every test.
+    """
+    save_habit(Habit(None, 1, "Read", "daily", "", None))
+    save_habit(Habit(None, 1, "Walk", "daily", "", None))
+    yield
+    stop_checkoff_buffer()
+
+
+def test_concurrent_checkoffs_are_group_committed():
+    """
+    Test that check-offs from many threads land in far fewer transactions, all durable on return.
+    """
+    buffer = CheckoffBuffer(max_batch=50, max_delay=0.05)
+    futures = []
+    lock = threading.Lock()
+
+    def writer(habit_id):
+        for _ in range(40):
+            future = buffer.submit(habit_id, 1)
+            with lock:
+                futures.append(future)
+
+    threads = [threading.Thread(target=writer, args=(1 + n % 2,)) for n in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for future in futures:
+        assert future.result(timeout=5) is None
+    buffer.close()
+
+    assert buffer.written == 400
+    assert buffer.batches < 400 / 5
+    assert len(load_checkoffs_for_habit(1)) == len(load_checkoffs_for_habit(2)) == 200
+    assert load_streak_summary(1)["total_completions"] == 200
+
+
+def test_size_and_time_thresholds_trigger_flushes():
+    """
+    Test that a full batch flushes immediately and a lone check-off after max_delay.
+    """
+    by_size = CheckoffBuffer(max_batch=3, max_delay=60)
+    futures = [by_size.submit(1, 1) for _ in range(3)]
+    assert all(future.result(timeout=5) is None for future in futures)
+    by_size.close()
+
+    by_time = CheckoffBuffer(max_batch=1000, max_delay=0.02)
+    assert by_time.submit(2, 1).result(timeout=5) is None
+    by_time.close()
+    assert (by_size.batches, by_time.batches) == (1, 1)
+
+
+def test_close_flushes_pending_writes_and_rejects_new_ones():
+    """
+    Test that shutdown writes whatever is still queued before returning.
+    """
+    buffer = CheckoffBuffer(max_batch=1000, max_delay=60)
+    future = buffer.submit(1, 1)
+    assert not future.done()
+    buffer.close()
+    assert future.done() and future.exception() is None
+    assert len(load_checkoffs_for_habit(1)) == 1
+    with pytest.raises(RuntimeError):
+        buffer.submit(1, 1)
+
+
+def test_checkoff_habit_uses_the_buffer_only_when_enabled():
+    """
+    Test that the service commits directly by default and returns a Future under group commit.
+    """
+    assert checkoff_habit(1, 1) is None
+    start_checkoff_buffer(max_batch=10, max_delay=0.01)
+    checkoff_habit(1, 1).result(timeout=5)
+    stop_checkoff_buffer()
+    assert checkoff_habit(1, 1) is None
+    assert len(load_checkoffs_for_habit(1)) == 3
+
+
+def test_flush_inside_a_session_is_not_undone_by_its_rollback():
+    """
+    Test that a flush from inside a caller's transaction commits on its own, so the caller
+    rolling back cannot lose check-offs already reported as committed.
+    """
+    buffer = CheckoffBuffer(max_batch=1000, max_delay=60)
+    future = buffer.submit(1, 1)
+    with pytest.raises(RuntimeError, match="caller failed"):
+        with db_config.db_session():
+            assert buffer.flush() == 1
+            assert future.done() and future.exception() is None
+            raise RuntimeError("caller failed")
+    buffer.close()
+    assert buffer.flush() == 0
+    assert len(load_checkoffs_for_habit(1)) == 1
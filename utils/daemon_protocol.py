@@ -0,0 +1,82 @@
+import json
+import os
+import struct
+from datetime import date, datetime
+
+from config import db_config
+
+# Wire format between the CLI and the `serve` daemon. Every message is a 4-byte big-endian
+# length followed by that many bytes of UTF-8 JSON. A request is
+#     {"op": "<habit_service function>", "args": [...], "kwargs": {...}}
+# and is answered on the same connection with
+#     {"ok": true, "result": ...}   or   {"ok": false, "error": "<message>", "type": "<exception class>"}
+# A client may send any number of requests over one connection; the daemon closes connections
+# that stay idle too long, without answering anything.
+
+_HEADER = struct.Struct(">I")
+# Upper bound on a single message, so a corrupt header cannot make a peer allocate gigabytes
+MAX_MESSAGE_SIZE = 64 * 1024 * 1024
+
+
+def socket_path():
+    """
+    Return the Unix socket the daemon for the configured database listens on.
+    Returns:
+        str: HABIT_DAEMON_SOCKET if set, otherwise the database path with a '.sock' suffix,
+             so daemons (and their clients) of different databases never mix.
+    """
+    return os.getenv("HABIT_DAEMON_SOCKET") or f"{db_config.DB_PATH}.sock"
+
+
+def _encode(value):
+    # JSON fallback: timestamps as the text SQLite stores, model objects as their attributes
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, date):
+        return value.isoformat()
+    if hasattr(value, "__dict__"):
+        return vars(value)
+    raise TypeError(f"❌ {type(value).__name__} cannot be sent to the daemon")
+
+
+def _receive_exactly(sock, size):
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("❌ Connection closed mid-message")
+        data += chunk
+    return bytes(data)
+
+
+def send_message(sock, message):
+    """
+    Send one message over a connected socket.
+    Parameters:
+        sock (socket.socket): The connected Unix stream socket.
+        message (Any): JSON-serializable value (datetimes and model objects are converted).
+    """
+    body = json.dumps(message, default=_encode, separators=(",", ":")).encode()
+    sock.sendall(_HEADER.pack(len(body)) + body)
+
+
+def receive_message(sock):
+    """
+    Receive one message from a connected socket.
+    Parameters:
+        sock (socket.socket): The connected Unix stream socket.
+    Returns:
+        Any: The decoded message, or None if the peer closed the connection between messages.
+    Raises:
+        ConnectionError: If the connection closes in the middle of a message.
+        ValueError: If the announced message size exceeds MAX_MESSAGE_SIZE.
+    """
+    header = sock.recv(_HEADER.size)
+    if not header:
+        return None
+    if len(header) < _HEADER.size:
+        header += _receive_exactly(sock, _HEADER.size - len(header))
+    (size,) = _HEADER.unpack(header)
+    if size > MAX_MESSAGE_SIZE:
+        raise ValueError(f"❌ Message of {size} bytes exceeds the {MAX_MESSAGE_SIZE} byte limit")
+    return json.loads(_receive_exactly(sock, size))
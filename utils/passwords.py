@@ -0,0 +1,128 @@
+import base64
+import hashlib
+import hmac
+import os
+import threading
+
+# Password hashing for services/auth. Hashes are self-describing strings,
+#     scrypt$<n>$<r>$<p>$<salt>$<hash>     or     pbkdf2_sha256$<iterations>$<salt>$<hash>
+# (salt and hash base64-encoded), so the work factor can be raised later: hashes made with
+# weaker settings, and plaintext passwords from before hashing existed, still verify and are
+# reported as needing a rehash.
+#
+# The KDF runs on a bounded thread pool. hashlib releases the GIL while deriving, so up to
+# KDF_WORKERS logins hash in parallel, while the pool caps the memory scrypt uses at once
+# (128 * r * n bytes per hash, 16 MiB with the defaults).
+
+PASSWORD_KDF = os.getenv("PASSWORD_KDF", "scrypt" if hasattr(hashlib, "scrypt") else "pbkdf2_sha256")
+SCRYPT_N = int(os.getenv("SCRYPT_N", str(2 ** 14)))
+SCRYPT_R = int(os.getenv("SCRYPT_R", "8"))
+SCRYPT_P = int(os.getenv("SCRYPT_P", "1"))
+PBKDF2_ITERATIONS = int(os.getenv("PBKDF2_ITERATIONS", "600000"))
+KDF_WORKERS = int(os.getenv("KDF_WORKERS", str(os.cpu_count() or 1)))
+SALT_BYTES = 16
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _kdf_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Imported here: only logins and sign-ups need the pool
+            from concurrent.futures import ThreadPoolExecutor
+            _pool = ThreadPoolExecutor(KDF_WORKERS, thread_name_prefix="habit-kdf")
+        return _pool
+
+
+def _b64(data):
+    return base64.b64encode(data).decode()
+
+
+def _derive(password, salt, kdf, params):
+    if kdf == "scrypt":
+        n, r, p = params
+        return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p, maxmem=256 * r * n + 1024 * 1024)
+    if kdf == "pbkdf2_sha256":
+        (iterations,) = params
+        return hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations)
+    raise ValueError(f"❌ Unknown password KDF '{kdf}'")
+
+
+def _current_params(kdf):
+    return (SCRYPT_N, SCRYPT_R, SCRYPT_P) if kdf == "scrypt" else (PBKDF2_ITERATIONS,)
+
+
+def _hash(password):
+    salt = os.urandom(SALT_BYTES)
+    params = _current_params(PASSWORD_KDF)
+    digest = _derive(password, salt, PASSWORD_KDF, params)
+    return "$".join([PASSWORD_KDF, *map(str, params), _b64(salt), _b64(digest)])
+
+
+def _verify(password, stored):
+    if stored is None:
+        return False, False
+    kdf, _, rest = stored.partition("$")
+    if kdf in ("scrypt", "pbkdf2_sha256") and rest:
+        try:
+            *params, salt, digest = rest.split("$")
+            params = tuple(int(value) for value in params)
+            if len(params) != len(_current_params(kdf)):
+                raise ValueError(f"❌ Expected {len(_current_params(kdf))} {kdf} parameters")
+            derived = _derive(password, base64.b64decode(salt, validate=True), kdf, params)
+            ok = hmac.compare_digest(derived, base64.b64decode(digest, validate=True))
+            return ok, kdf != PASSWORD_KDF or params != _current_params(kdf)
+        except ValueError:
+            # Not a hash after all (truncated, or a plaintext password that looks like one);
+            # binascii.Error is a ValueError too
+            pass
+    # Stored before passwords were hashed: compare in constant time, then upgrade
+    return hmac.compare_digest(stored.encode(), password.encode()), True
+
+
+def hash_password(password):
+    """
+    Hash a password with the configured KDF and a random salt, on the KDF pool.
+    Parameters:
+        password (str): The plaintext password.
+    Returns:
+        str: The self-describing hash to store in User.password.
+    """
+    return _kdf_pool().submit(_hash, password).result()
+
+
+def hash_passwords(passwords):
+    """
+    Hash many passwords at once, spread over the whole KDF pool.
+    Parameters:
+        passwords (Iterable[str]): The plaintext passwords.
+    Returns:
+        list[str]: Their hashes, in the same order.
+    """
+    return list(_kdf_pool().map(_hash, passwords))
+
+
+def verify_password(password, stored):
+    """
+    Check a password against a stored hash (or a legacy plaintext password), on the KDF pool.
+    Parameters:
+        password (str): The plaintext password to check.
+        stored (str): The value of User.password.
+    Returns:
+        tuple[bool, bool]: (matches, needs_rehash). needs_rehash is True for plaintext passwords
+                           and for hashes made with a different KDF or work factor.
+    """
+    return _kdf_pool().submit(_verify, password, stored).result()
+
+
+def shutdown():
+    """
+    Stop the KDF pool; the next hash starts a new one.
+    """
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True)
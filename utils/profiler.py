@@ -0,0 +1,311 @@
+import cProfile
+import functools
+import inspect
+import re
+import sqlite3
+import sys
+import time
+
+from config import db_config
+
+# Profiling support for the CLI's --profile mode. While a QueryProfiler runs it
+#  - times every public function of the modules in PROFILED_MODULES, wherever they were imported,
+#  - opens connections through an instrumented Connection subclass that times each statement
+#    (execute plus the fetches that follow it) and counts what SQLite actually ran,
+#  - keeps statements slower than a threshold and explains their query plans afterwards.
+
+PROFILED_MODULES = ("repository.storage_manager", "services.auth", "analytics.sql_engine")
+
+# The profiler receiving measurements from instrumented connections, if any
+_active = None
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _normalize(sql):
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+class _ProfilingCursor(sqlite3.Cursor):
+    # Fetch time is added to the statement the cursor last executed
+    _sql = None
+
+    def _timed(self, method, *args):
+        started = time.perf_counter()
+        try:
+            return method(*args)
+        finally:
+            if _active is not None and self._sql is not None:
+                _active._add_fetch_time(self._sql, time.perf_counter() - started)
+
+    def execute(self, sql, parameters=()):
+        self._sql = _normalize(sql)
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            if _active is not None:
+                _active._record_statement(self._sql, parameters, time.perf_counter() - started)
+
+    def executemany(self, sql, seq_of_parameters):
+        self._sql = _normalize(sql)
+        seq_of_parameters = list(seq_of_parameters)
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            if _active is not None:
+                first = seq_of_parameters[0] if seq_of_parameters else ()
+                _active._record_statement(self._sql, first, time.perf_counter() - started)
+
+    def fetchone(self):
+        return self._timed(super().fetchone)
+
+    def fetchmany(self, size=None):
+        return self._timed(super().fetchmany, self.arraysize if size is None else size)
+
+    def fetchall(self):
+        return self._timed(super().fetchall)
+
+    def __next__(self):
+        return self._timed(super().__next__)
+
+
+class ProfilingConnection(sqlite3.Connection):
+    """
+    sqlite3.Connection that reports every statement to the active QueryProfiler.
+    Installed as db_config.CONNECTION_FACTORY while profiling.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if _active is not None:
+            _active.connections += 1
+        # Also sees statements run inside executescript() and by triggers
+        self.set_trace_callback(_count_statement)
+
+    def cursor(self, factory=_ProfilingCursor):
+        return super().cursor(factory)
+
+    # The C implementations would bypass cursor(), so route them through it
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, script):
+        started = time.perf_counter()
+        try:
+            return super().executescript(script)
+        finally:
+            if _active is not None:
+                _active._record_statement(_normalize(script)[:200], None, time.perf_counter() - started)
+
+
+def _count_statement(statement):
+    if _active is not None:
+        _active.statements_run += 1
+
+
+class QueryProfiler:
+    """
+    Collects function timings, SQL statement statistics and slow queries for one CLI command.
+    Attributes:
+        slow_ms (float): Statements taking longer than this many milliseconds are logged.
+        cprofile_path (Optional[str]): If set, a cProfile dump of the command is written there.
+        connections (int): Number of SQLite connections opened while profiling.
+        statements_run (int): Number of statements SQLite executed (trace callback count).
+    """
+
+    def __init__(self, slow_ms=50.0, cprofile_path=None):
+        self.slow_ms = slow_ms
+        self.cprofile_path = cprofile_path
+        self.connections = 0
+        self.statements_run = 0
+        # name -> [calls, total seconds, max seconds]
+        self._functions = {}
+        # normalized sql -> [executions, total seconds, max seconds]
+        self._statements = {}
+        # (sql, seconds, parameters) of statements over slow_ms
+        self._slow = []
+        self._plans = {}
+        self._patched = []
+        self._cprofile = None
+        self._started = None
+        self.wall_seconds = 0.0
+
+    def start(self):
+        """
+        Begin profiling: instrument functions and connections, optionally start cProfile.
+        Pooled connections are reopened so that every statement goes through the instrumentation.
+        """
+        global _active
+        _active = self
+        db_config.close_connections()
+        db_config.CONNECTION_FACTORY = ProfilingConnection
+        for module_name in PROFILED_MODULES:
+            self._instrument(sys.modules.get(module_name) or __import__(module_name, fromlist=["_"]))
+        if self.cprofile_path:
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        self._started = time.perf_counter()
+
+    def stop(self):
+        """
+        End profiling, undo all instrumentation and explain the slow statements.
+        """
+        global _active
+        self.wall_seconds = time.perf_counter() - self._started
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            self._cprofile.dump_stats(self.cprofile_path)
+        for module, name, original in reversed(self._patched):
+            setattr(module, name, original)
+        self._patched = []
+        _active = None
+        db_config.CONNECTION_FACTORY = sqlite3.Connection
+        db_config.close_connections()
+        self._explain_slow_statements()
+
+    def _instrument(self, module):
+        for name, func in list(vars(module).items()):
+            if name.startswith("_") or not inspect.isfunction(func) or func.__module__ != module.__name__:
+                continue
+            wrapper = self._wrap(f"{module.__name__.rsplit('.', 1)[-1]}.{name}", func)
+            # Patch every module that imported the function by name, e.g. services.habit_service
+            for holder in list(sys.modules.values()):
+                try:
+                    imported = getattr(holder, name, None)
+                except Exception:
+                    # Some modules compute attributes lazily and may fail on access
+                    continue
+                if imported is func:
+                    setattr(holder, name, wrapper)
+                    self._patched.append((holder, name, func))
+
+    def _wrap(self, label, func):
+        record = self._record_call
+        if inspect.isgeneratorfunction(func):
+            @functools.wraps(func)
+            def generator_wrapper(*args, **kwargs):
+                # Time spent producing items counts, time spent by the consumer does not
+                elapsed = 0.0
+                iterator = func(*args, **kwargs)
+                try:
+                    while True:
+                        started = time.perf_counter()
+                        try:
+                            item = next(iterator)
+                        except StopIteration:
+                            return
+                        finally:
+                            elapsed += time.perf_counter() - started
+                        yield item
+                finally:
+                    record(label, elapsed)
+            return generator_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(label, time.perf_counter() - started)
+        return wrapper
+
+    def _record_call(self, label, seconds):
+        entry = self._functions.setdefault(label, [0, 0.0, 0.0])
+        entry[0] += 1
+        entry[1] += seconds
+        entry[2] = max(entry[2], seconds)
+
+    def _record_statement(self, sql, parameters, seconds):
+        entry = self._statements.setdefault(sql, [0, 0.0, 0.0])
+        entry[0] += 1
+        entry[1] += seconds
+        entry[2] = max(entry[2], seconds)
+        if seconds * 1000 >= self.slow_ms:
+            self._slow.append((sql, seconds, parameters))
+
+    def _add_fetch_time(self, sql, seconds):
+        entry = self._statements.get(sql)
+        if entry is not None:
+            entry[1] += seconds
+            entry[2] = max(entry[2], seconds)
+            if seconds * 1000 >= self.slow_ms and not any(slow[0] == sql for slow in self._slow):
+                self._slow.append((sql, seconds, None))
+
+    def _explain_slow_statements(self):
+        # Run after the command on a plain connection, so explaining does not skew the timings
+        if not self._slow:
+            return
+        conn = sqlite3.connect(db_config.DB_PATH)
+        try:
+            for sql, _, parameters in self._slow:
+                if sql in self._plans:
+                    continue
+                try:
+                    rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}", parameters or ()).fetchall()
+                    self._plans[sql] = [row[3] for row in rows]
+                except sqlite3.Error as e:
+                    self._plans[sql] = [f"(no plan: {e})"]
+        finally:
+            conn.close()
+
+    def report(self, command=None):
+        """
+        Return the collected measurements as a JSON-serializable dict.
+        Parameters:
+            command (Optional[str]): Name of the profiled command, included as-is.
+        Returns:
+            dict: command, wall_ms, connections_opened, statements_run, functions, statements
+                  and slow_queries (each with its query plan). Lists are sorted by total time.
+        """
+        def ms(seconds):
+            return round(seconds * 1000, 3)
+
+        functions = sorted(self._functions.items(), key=lambda item: item[1][1], reverse=True)
+        statements = sorted(self._statements.items(), key=lambda item: item[1][1], reverse=True)
+        return {
+            "command": command,
+            "wall_ms": ms(self.wall_seconds),
+            "connections_opened": self.connections,
+            "statements_run": self.statements_run,
+            "functions": [{"name": name, "calls": calls, "total_ms": ms(total), "max_ms": ms(longest)}
+                          for name, (calls, total, longest) in functions],
+            "statements": [{"sql": sql, "executions": count, "total_ms": ms(total), "max_ms": ms(longest)}
+                           for sql, (count, total, longest) in statements],
+            "slow_queries": [{"sql": sql, "ms": ms(seconds), "plan": self._plans.get(sql, [])}
+                             for sql, seconds, _ in self._slow],
+            "slow_threshold_ms": self.slow_ms,
+            "cprofile": self.cprofile_path,
+        }
+
+    def format_summary(self, command=None, width=70):
+        """
+        Render the report as the plain-text table printed after a profiled command.
+        Parameters:
+            command (Optional[str]): Name of the profiled command.
+            width (int): Maximum width of SQL text in the table.
+        Returns:
+            str: The summary.
+        """
+        report = self.report(command)
+        lines = [
+            f"⏱️ Profile of '{command or 'cli'}': {report['wall_ms']:.1f} ms, "
+            f"{report['connections_opened']} connection(s), {report['statements_run']} statement(s)",
+            f"{'function':<40}{'calls':>7}{'total ms':>12}{'max ms':>10}",
+        ]
+        for entry in report["functions"]:
+            lines.append(f"{entry['name']:<40}{entry['calls']:>7}{entry['total_ms']:>12.2f}{entry['max_ms']:>10.2f}")
+        lines.append(f"{'statement':<{width}}{'runs':>7}{'total ms':>12}")
+        for entry in report["statements"]:
+            sql = entry["sql"] if len(entry["sql"]) <= width - 2 else entry["sql"][:width - 5] + "..."
+            lines.append(f"{sql:<{width}}{entry['executions']:>7}{entry['total_ms']:>12.2f}")
+        for entry in report["slow_queries"]:
+            lines.append(f"🐢 {entry['ms']:.1f} ms: {entry['sql'][:width * 2]}")
+            lines.extend(f"     {step}" for step in entry["plan"])
+        if report["cprofile"]:
+            lines.append(f"📄 cProfile dump written to {report['cprofile']}")
+        return "\n".join(lines)
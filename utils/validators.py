@@ -44,4 +44,64 @@ def is_valid_user_id(user_id):
     """
     if not isinstance(user_id, int) or user_id < 1:
         raise ValueError("❌ Invalid User ID. Must be a positive integer.")
-    return True
\ No newline at end of file
+    return True
+
+def validate_log_record(record):
+    """
+    Validates one check-off record from an import file and normalizes it for storage.
+    Parameters:
+        record (dict): Mapping with 'habit_id', 'user_id' and 'completed_at' keys, and
+                       optional 'note' and 'missed' keys. Values may be strings (CSV) or typed (JSON).
+    Returns:
+        tuple: (habit_id, user_id, completed_at, note, missed) with completed_at formatted
+               as 'YYYY-MM-DD HH:MM:SS' and missed as 0 or 1.
+    Raises:
+        ValueError: If a field is missing or malformed.
+    """
+    try:
+        habit_id = int(record["habit_id"])
+        user_id = int(record["user_id"])
+        completed_at = record["completed_at"]
+    except KeyError as e:
+        raise ValueError(f"❌ Missing field {e.args[0]!r}") from e
+    except (TypeError, ValueError) as e:
+        raise ValueError("❌ habit_id and user_id must be integers") from e
+    if habit_id < 1:
+        raise ValueError("❌ Invalid Habit ID. Must be a positive integer.")
+    is_valid_user_id(user_id)
+
+    try:
+        timestamp = datetime.fromisoformat(str(completed_at).strip())
+    except ValueError as e:
+        raise ValueError("❌ Invalid completed_at. Use 'YYYY-MM-DD HH:MM[:SS]'") from e
+
+    missed = record.get("missed") or 0
+    if isinstance(missed, str):
+        missed = missed.strip().lower()
+        if missed not in ("", "0", "1", "true", "false"):
+            raise ValueError("❌ missed must be 0/1 or true/false")
+        missed = missed in ("1", "true")
+    note = record.get("note") or None
+    return habit_id, user_id, timestamp.strftime("%Y-%m-%d %H:%M:%S"), note, int(bool(missed))
+
+
+def validate_user_record(record):
+    """
+    Validates one user from a provisioning file and normalizes it for sign-up.
+    Parameters:
+        record (dict): Mapping with 'username' and 'password' keys and an optional 'email' key.
+    Returns:
+        tuple: (username, email, password) with surrounding whitespace removed from username and email.
+    Raises:
+        ValueError: If the username or password is missing, or the email is malformed.
+    """
+    username = (record.get("username") or "").strip()
+    password = record.get("password") or ""
+    email = (record.get("email") or "").strip()
+    if not username:
+        raise ValueError("❌ Missing username")
+    if not password:
+        raise ValueError("❌ Missing password")
+    if email and "@" not in email:
+        raise ValueError(f"❌ Invalid email {email!r}")
+    return username, email, password